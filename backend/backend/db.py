@@ -0,0 +1,37 @@
+"""
+Transaction helpers for the SQLite databases
+"""
+from contextlib import contextmanager
+
+from django.db import connections, transaction
+
+
+@contextmanager
+def write_atomic(using='index'):
+    """
+    transaction.atomic() for blocks that are going to write.
+
+    The outermost block starts with BEGIN IMMEDIATE, so it waits for the
+    write lock (up to the busy timeout) before reading anything. A deferred
+    transaction that reads first fails at once with "database is locked"
+    when it later tries to write while another worker has committed.
+    Read-only atomic() blocks keep the default deferred BEGIN and never
+    take the write lock. Nested inside another atomic block this is an
+    ordinary savepoint.
+    """
+    connection = connections[using]
+    if connection.in_atomic_block or connection.vendor != 'sqlite':
+        with transaction.atomic(using=using):
+            yield
+        return
+
+    # Connect first: opening a connection resets transaction_mode from OPTIONS
+    connection.close_if_health_check_failed()
+    connection.ensure_connection()
+    previous = connection.transaction_mode
+    connection.transaction_mode = 'IMMEDIATE'
+    try:
+        with transaction.atomic(using=using):
+            yield
+    finally:
+        connection.transaction_mode = previous
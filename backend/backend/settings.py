@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -42,12 +43,29 @@ CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
 # Session configuration for PIN-based authentication (Phase 10)
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Sessions are read from a local cache and written through to db.sqlite3
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
 SESSION_COOKIE_NAME = 'nail_salon_session'
 SESSION_COOKIE_AGE = 60 * 60 * 24 * 365  # 1 year (local trusted environment)
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SAMESITE = 'Lax'
-SESSION_SAVE_EVERY_REQUEST = True  # Extend session on each request
+# Saving on every request rewrote the session row on every poll; instead
+# users.middleware.SessionRefreshMiddleware extends expiry at most this often
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_INTERVAL = 60 * 60  # seconds
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # File-based so every gunicorn worker on the host sees the same sessions
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'nail_salon_sessions'),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
 
 # For local development, disable CSRF for API endpoints
 CSRF_TRUSTED_ORIGINS = [
@@ -76,11 +94,13 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'users.middleware.SessionRefreshMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'services.middleware.CatalogMiddleware',
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -107,14 +127,40 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
 # Main application database
+# Applied to every new SQLite connection. WAL lets the gunicorn workers read
+# while another writes; synchronous=NORMAL is durable under WAL except for
+# the last commits on power loss. mmap/cache sizes are per connection.
+SQLITE_OPTIONS = {
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=134217728;'  # 128 MiB
+        'PRAGMA cache_size=-16000;'  # ~16 MiB
+        'PRAGMA temp_store=MEMORY;'
+    ),
+    # Seconds to wait for a lock (SQLite busy_timeout) before "database is locked".
+    # Kept well under gunicorn's 30s worker timeout: one request may wait on
+    # several transactions, and a lock error is better than a killed worker.
+    'timeout': 5,
+    # No transaction_mode here: IMMEDIATE for every connection would make
+    # read-only atomic() blocks take the write lock too. Blocks that write
+    # use backend.db.write_atomic, which begins IMMEDIATE just for them.
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     },
     'index': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'data' / 'index.db',
+        'OPTIONS': SQLITE_OPTIONS,
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -179,3 +225,9 @@ REST_FRAMEWORK = {
 
 # Database routers
 DATABASE_ROUTERS = ['backend.routers.IndexDBRouter']
+
+# Verify DayRow running aggregates against a full recompute after every change.
+# That is a full pass over the row per edit and turns any drift into an
+# AssertionError, so it is off unless asked for (tests, or
+# DAY_AGGREGATE_CHECKS=1 while debugging)
+DAY_AGGREGATE_CHECKS = os.environ.get('DAY_AGGREGATE_CHECKS') == '1'
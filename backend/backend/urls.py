@@ -22,8 +22,8 @@ from django.conf import settings
 from django.views.static import serve
 from rest_framework.routers import DefaultRouter
 from technicians.views import TechnicianViewSet
-from services.views import ServiceViewSet, TechSkillViewSet
-from days.views import DayViewSet, SettingsViewSet
+from services.views import CatalogImportView, ServiceViewSet, SkillMatrixView, TechSkillViewSet
+from days.views import DayViewSet, RenameJobViewSet, ReportViewSet, SettingsViewSet, export_seatings
 from users.views import AppUserViewSet, login_by_pin, logout, current_user, quick_switch
 
 # Create a router for DRF ViewSets
@@ -32,6 +32,8 @@ router.register(r'techs', TechnicianViewSet, basename='technician')
 router.register(r'services', ServiceViewSet, basename='service')
 router.register(r'tech-skills', TechSkillViewSet, basename='tech-skill')
 router.register(r'days', DayViewSet, basename='day')
+router.register(r'reports', ReportViewSet, basename='report')
+router.register(r'rename-jobs', RenameJobViewSet, basename='rename-job')
 router.register(r'settings', SettingsViewSet, basename='settings')
 router.register(r'users', AppUserViewSet, basename='appuser')
 
@@ -39,6 +41,9 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', views.home, name='home'),
     path('api/hello/', views.hello_world, name='hello_world'),
+    path('api/exports/seatings/', export_seatings, name='export-seatings'),
+    path('api/skill-matrix/', SkillMatrixView.as_view(), name='skill-matrix'),
+    path('api/imports/catalog/', CatalogImportView.as_view(), name='import-catalog'),
     path('api/', include(router.urls)),
     # Auth endpoints
     path('api/auth/login/', login_by_pin, name='auth-login'),
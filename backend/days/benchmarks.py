@@ -0,0 +1,66 @@
+"""
+Helpers shared by the benchmark management commands.
+Generates synthetic day files shaped like real salon days.
+"""
+import json
+import random
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+
+SERVICES = [
+    ('Manicure', 'Mani'), ('Pedicure', 'Pedi'), ('Gel Manicure', 'Gel'),
+    ('Full Set', 'FS'), ('Fill', 'Fill'), ('Dip Powder', 'Dip'),
+    ('Waxing', 'Wax'), ('Polish Change', 'PC'),
+]
+
+
+def generate_days(data_dir, days=365, techs=12, seatings_per_tech=8, start=None, seed=1):
+    """Write `days` closed day files into data_dir and return their dates"""
+    rng = random.Random(seed)
+    start = start or date(2025, 1, 1)
+    tz = timezone(timedelta(hours=-5))
+    dates = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        opening = datetime(day.year, day.month, day.day, 9, 30, tzinfo=tz)
+        rows = []
+        for row_number in range(1, techs + 1):
+            seatings = []
+            for n in range(seatings_per_tech):
+                service, short_name = rng.choice(SERVICES)
+                seatings.append({
+                    'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                    'is_requested': rng.random() < 0.3,
+                    'is_bonus': rng.random() < 0.2,
+                    'service': service,
+                    'short_name': short_name,
+                    'time': (opening + timedelta(minutes=45 * n + rng.randint(0, 30))).isoformat(),
+                    'time_needed': None,
+                    'value': rng.randint(20, 90),
+                    'has_value_penalty': rng.random() < 0.05,
+                })
+            rows.append({
+                'row_number': row_number,
+                'tech_alias': f'tech{row_number}',
+                'tech_name': f'Technician {row_number}',
+                'seatings': seatings,
+                'regular_turns': sum(1 for s in seatings if not s['is_bonus']),
+                'bonus_turns': sum(1 for s in seatings if s['is_bonus']),
+                'is_on_break': False,
+                'is_active': True,
+            })
+        date_str = day.strftime('%Y-%m-%d')
+        payload = {
+            'date': date_str,
+            'status': 'closed',
+            'day_rows': rows,
+            'new_day_checklist': [],
+            'end_day_checklist': [],
+            'created_at': opening.replace(tzinfo=None).isoformat(),
+            'closed_at': (opening + timedelta(hours=10)).replace(tzinfo=None).isoformat(),
+        }
+        with open(data_dir / f'{date_str}.json', 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        dates.append(date_str)
+    return dates
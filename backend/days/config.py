@@ -0,0 +1,146 @@
+"""
+Settings store for /app/data/config.json
+The parsed config is cached per worker and re-read only when the file's
+mtime/size changes. Updates re-read the file under a cross-process lock,
+apply the changes and swap in a complete new file (temp file + rename), so
+concurrent writers from several workers never leave a half-written config.
+"""
+import copy
+import json
+import os
+import threading
+from pathlib import Path
+
+from .persistence import day_file_lock
+
+
+class ConfigError(ValueError):
+    """A settings value does not match the config schema"""
+
+
+def _string_list(key, value):
+    if not isinstance(value, list):
+        raise ConfigError(f'{key} must be a list')
+    if not all(isinstance(item, str) for item in value):
+        raise ConfigError(f'All {key} items must be strings')
+
+
+def _day_table(key, value):
+    if not isinstance(value, dict):
+        raise ConfigError(f'{key} must be an object')
+    for field in ('display_name', 'display_turns'):
+        if field in value and not isinstance(value[field], bool):
+            raise ConfigError(f'{field} must be boolean')
+
+
+# key -> (validator, default); keys not listed here are kept as they are
+SCHEMA = {
+    'new_day_checklist': (_string_list, []),
+    'end_day_checklist': (_string_list, []),
+    'day_table': (_day_table, {'display_name': True, 'display_turns': False}),
+    'recommendation_widgets': (_string_list, []),
+}
+
+
+def validate(config):
+    """Raise ConfigError for the first schema violation in `config` (a full or partial config)"""
+    if not isinstance(config, dict):
+        raise ConfigError('config.json must contain an object')
+    for key, (validator, _) in SCHEMA.items():
+        if key in config:
+            validator(key, config[key])
+
+
+class ConfigStore:
+    """Cached, atomically written access to config.json"""
+
+    def __init__(self, path=None):
+        # In Docker, backend is at /app, so data is at /app/data
+        self.path = Path(path) if path is not None else Path('/app/data/config.json')
+        self._lock = threading.Lock()
+        self._version = None
+        self._config = None
+
+    def _version_of(self):
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load_file(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        if not isinstance(config, dict):
+            raise ConfigError('config.json must contain an object')
+        return config
+
+    def _checked(self, config):
+        """Drop keys that fail the schema (e.g. hand edits) so they read as defaults"""
+        for key, (validator, _) in SCHEMA.items():
+            if key not in config:
+                continue
+            try:
+                validator(key, config[key])
+            except ConfigError as e:
+                print(f"Warning: Ignoring invalid {key} in {self.path}: {e}")
+                del config[key]
+        return config
+
+    def _current(self):
+        """The cached config, re-read if the file changed. Raises FileNotFoundError"""
+        version = self._version_of()
+        with self._lock:
+            if self._config is None or self._version != version:
+                self._config = self._checked(self._load_file())
+                self._version = version
+            return self._config
+
+    def get(self, key, default=None):
+        """
+        One settings value (a copy, safe to modify). Schema keys fall back
+        to their default; `default` is used for other keys.
+        """
+        config = self._current()
+        if key in config:
+            return copy.deepcopy(config[key])
+        if key in SCHEMA:
+            return copy.deepcopy(SCHEMA[key][1])
+        return default
+
+    def update(self, changes):
+        """
+        Apply `changes` (top-level key -> value; dict values are merged into
+        the existing dict) and write the file. Returns the new config.
+        Raises ConfigError if the result does not match the schema.
+        """
+        with day_file_lock(self.path):
+            # Re-read under the lock: another worker may have written since
+            config = self._load_file()
+            if not changes:
+                return self._checked(config)
+            for key, value in changes.items():
+                if isinstance(value, dict) and isinstance(config.get(key), dict):
+                    config[key] = {**config[key], **value}
+                else:
+                    config[key] = value
+            validate({key: config[key] for key in changes})
+
+            tmp_path = self.path.with_suffix('.json.tmp')
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(config, f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                # The old file is untouched; do not leave the partial copy beside it
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+            config = self._checked(config)
+            with self._lock:
+                self._config = config
+                self._version = self._version_of()
+        return copy.deepcopy(config)
+
+
+# Global instance
+config_store = ConfigStore()
@@ -0,0 +1,93 @@
+"""
+Service demand by hour of day (service_hour_histogram table in index.db)
+
+Hours are the wall-clock hours the tablets recorded: a time with an offset
+keeps that offset (settings.TIME_ZONE is UTC, so converting would shift
+every seating by the salon's offset), naive times are taken as they are.
+"""
+from backend.db import write_atomic
+
+from .models import ServiceHourHistogram
+
+HOURS = 24
+
+
+def seating_hour(seating):
+    """Local hour (0-23) a seating started in, or None if its time is unreadable"""
+    started = seating.start_datetime
+    if started is None:
+        return None
+    return started.hour
+
+
+def day_histograms(day_data):
+    """{service_name: [24 counts]} for every seating of a day"""
+    histograms = {}
+    for row in day_data.day_rows:
+        for seating in row.seatings:
+            hour = seating_hour(seating)
+            if not seating.service or hour is None:
+                continue
+            histograms.setdefault(seating.service, [0] * HOURS)[hour] += 1
+    return histograms
+
+
+def seating_added(day_date, seating):
+    """Count a newly created seating in its service's bucket for the day"""
+    hour = seating_hour(seating)
+    if not seating.service or hour is None:
+        return
+    with write_atomic('index'):
+        histogram, _ = ServiceHourHistogram.objects.get_or_create(
+            date=day_date, service_name=seating.service,
+            defaults={'hours': [0] * HOURS},
+        )
+        hours = histogram.hours or [0] * HOURS
+        hours[hour] += 1
+        histogram.hours = hours
+        histogram.save(update_fields=['hours'])
+
+
+def record_day(day_data):
+    """
+    Replace a day's histograms with counts from its current seatings.
+    Reconciles deletions and service edits that seating_added cannot see.
+    """
+    with write_atomic('index'):
+        ServiceHourHistogram.objects.filter(date=day_data.date).delete()
+        ServiceHourHistogram.objects.bulk_create([
+            ServiceHourHistogram(date=day_data.date, service_name=service, hours=hours)
+            for service, hours in day_histograms(day_data).items()
+        ])
+
+
+def forget_day(day_date):
+    ServiceHourHistogram.objects.filter(date=day_date).delete()
+
+
+def heatmap(date_from, date_to, service_name=None):
+    """
+    Sum the histograms of a date range:
+    {service: {"total", "by_hour": [24], "by_weekday_hour": [[24] x 7, Monday first]}}
+    """
+    rows = ServiceHourHistogram.objects.filter(date__range=(date_from, date_to))
+    if service_name:
+        rows = rows.filter(service_name=service_name)
+
+    services = {}
+    for day, service, hours in rows.values_list('date', 'service_name', 'hours').iterator():
+        entry = services.get(service)
+        if entry is None:
+            entry = services[service] = {
+                'total': 0,
+                'by_hour': [0] * HOURS,
+                'by_weekday_hour': [[0] * HOURS for _ in range(7)],
+            }
+        weekday = entry['by_weekday_hour'][day.weekday()]
+        by_hour = entry['by_hour']
+        for hour, count in enumerate(hours):
+            if count:
+                by_hour[hour] += count
+                weekday[hour] += count
+                entry['total'] += count
+    return services
@@ -0,0 +1,80 @@
+"""
+Learned seating durations
+Records how long seatings actually take (start until a value is entered) and
+turns the statistics into expected durations for the recommendation engine.
+"""
+from datetime import datetime, timezone
+
+from backend.db import write_atomic
+
+from .models import ServiceDurationStats
+
+# Ignore closes that cannot be a real duration (clock skew, values entered next day)
+MAX_DURATION_MINUTES = 12 * 60
+# Samples needed before a learned estimate replaces the configured time
+MIN_SAMPLES = 5
+
+
+def record_duration(service_name, tech_alias, minutes):
+    """Add one duration to the (service, tech) and service-wide statistics"""
+    with write_atomic('index'):
+        for alias in (tech_alias, ''):
+            stats, _ = ServiceDurationStats.objects.get_or_create(
+                service_name=service_name, tech_alias=alias
+            )
+            stats.add(minutes)
+            stats.save()
+
+
+def seating_closed(row, seating, closed_at=None):
+    """
+    Record the duration of a seating that just got its value.
+    Returns the duration in minutes, or None if it was not recorded.
+    """
+    started_at = seating.timestamp
+    if not seating.service or started_at is None:
+        return None
+    if closed_at is None:
+        closed_at = datetime.now(timezone.utc).timestamp()
+    minutes = (closed_at - started_at) / 60
+    if minutes <= 0 or minutes > MAX_DURATION_MINUTES:
+        return None
+    record_duration(seating.service, row.tech_alias, minutes)
+    return minutes
+
+
+def rename(kind, old_name, new_name):
+    """Move learned durations to a renamed tech ('tech') or service ('service')"""
+    field = 'tech_alias' if kind == 'tech' else 'service_name'
+    with write_atomic('index'):
+        for stats in ServiceDurationStats.objects.filter(**{field: old_name}):
+            key = {'service_name': stats.service_name, 'tech_alias': stats.tech_alias, field: new_name}
+            target = ServiceDurationStats.objects.filter(**key).first()
+            if target is None:
+                setattr(stats, field, new_name)
+                stats.save()
+            else:
+                target.merge(stats)
+                target.save()
+                stats.delete()
+
+
+class DurationEstimates:
+    """Learned durations for a set of services, loaded with one query"""
+
+    def __init__(self, service_names):
+        self._stats = {
+            (stats.service_name, stats.tech_alias): stats
+            for stats in ServiceDurationStats.objects.filter(service_name__in=set(service_names))
+        }
+
+    def expected_minutes(self, service_name, tech_alias):
+        """
+        Learned mean duration for this tech, else for the service across techs.
+        Returns (minutes, source) or (None, None) while there are too few samples.
+        """
+        for alias, source in ((tech_alias, 'learned_tech'), ('', 'learned_service')):
+            stats = self._stats.get((service_name, alias))
+            if stats is not None and stats.count >= MIN_SAMPLES:
+                return stats.mean, source
+        return None, None
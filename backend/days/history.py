@@ -0,0 +1,85 @@
+"""
+Materialized history for closed days, stored in index.db.
+
+Closed days are immutable, so their per-tech totals and a search index of
+their seatings are written once when the day is closed; reports and
+searches then run in SQL. Weekly/monthly rollups (rollups.py) are adjusted
+by the difference between what was stored for the day and what is new. A day that is no longer
+closed (unfrozen, deleted) has its rows dropped; they are rebuilt from the
+day file the next time it closes.
+"""
+from backend.db import write_atomic
+
+from . import demand, rollups
+from .models import DayTechStats, SeatingIndexEntry
+from .reports import day_tech_totals
+
+
+def tech_stats_rows(day_data):
+    """DayTechStats instances (unsaved) for a day"""
+    return [
+        DayTechStats(
+            date=day_data.date,
+            tech_alias=alias,
+            tech_name=totals['tech_name'],
+            total_value=totals['total_value_without_penalty'],
+            total_value_with_penalty=totals['total_value_with_penalty'],
+            penalty_count=totals['penalty_count'],
+            regular_turns=totals['regular_turns'],
+            bonus_turns=totals['bonus_turns'],
+            seating_count=totals['seating_count'],
+        )
+        for alias, totals in day_tech_totals(day_data).items()
+    ]
+
+
+def seating_index_rows(day_data):
+    """SeatingIndexEntry instances (unsaved) for every seating of a day"""
+    entries = []
+    for row in day_data.day_rows:
+        for seating in row.seatings:
+            entries.append(SeatingIndexEntry(
+                date=day_data.date,
+                seating_id=seating.id,
+                tech_alias=row.tech_alias,
+                tech_name=row.tech_name,
+                service_name=seating.service or '',
+                time=seating.time or '',
+                value=seating.value,
+                has_value_penalty=seating.has_value_penalty,
+                is_bonus=seating.is_bonus,
+                is_requested=seating.is_requested,
+            ))
+    return entries
+
+
+def record_closed_day(day_data):
+    """Replace the materialized rows for a closed day in a single transaction"""
+    with write_atomic('index'):
+        rollups.apply(day_data.date, rollups.stored_contributions(day_data.date), sign=-1)
+        rollups.apply(day_data.date, rollups.day_contributions(day_data))
+        DayTechStats.objects.filter(date=day_data.date).delete()
+        DayTechStats.objects.bulk_create(tech_stats_rows(day_data))
+        SeatingIndexEntry.objects.filter(date=day_data.date).delete()
+        SeatingIndexEntry.objects.bulk_create(seating_index_rows(day_data), batch_size=500)
+
+
+def forget_day(day_date):
+    """Drop the materialized rows for a day"""
+    with write_atomic('index'):
+        rollups.apply(day_date, rollups.stored_contributions(day_date), sign=-1)
+        DayTechStats.objects.filter(date=day_date).delete()
+        SeatingIndexEntry.objects.filter(date=day_date).delete()
+
+
+def sync_day(day_data):
+    """Bring the materialized rows in line with the day's current status"""
+    if day_data.status == 'closed':
+        record_closed_day(day_data)
+    else:
+        forget_day(day_data.date)
+    # Demand counts every seating that happened, closed day or not
+    if day_data.status == 'deleted':
+        demand.forget_day(day_data.date)
+    else:
+        demand.record_day(day_data)
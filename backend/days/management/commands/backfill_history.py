@@ -0,0 +1,46 @@
+"""
+Rebuild the materialized history tables from the day files.
+Day files are loaded in parallel; rows are written from this thread because
+SQLite allows a single writer.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from days import history, presence
+from days.persistence import day_persistence
+from days.reports import iter_days, parse_date_range
+
+
+class Command(BaseCommand):
+    help = 'Rebuild materialized history (day_tech_stats, seating_index, tech_day_presence, service_hour_histogram) for every day file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', help='First date (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='date_to', help='Last date (YYYY-MM-DD)')
+        parser.add_argument('--workers', type=int, default=8, help='Parallel day file loaders')
+
+    def handle(self, *args, **options):
+        dates = sorted(day_persistence.list_days())
+        if options['date_from'] or options['date_to']:
+            try:
+                date_from, date_to = parse_date_range(
+                    options['date_from'] or '0001-01-01',
+                    options['date_to'] or '9999-12-31',
+                )
+            except ValueError as e:
+                raise CommandError(str(e))
+            dates = [d for d in dates if date_from <= d <= date_to]
+
+        closed = failed = 0
+        for day_date, day_data, error in iter_days(dates, workers=options['workers']):
+            if error is not None:
+                failed += 1
+                self.stderr.write(f'{day_date}: {error}')
+                continue
+            history.sync_day(day_data)
+            presence.sync_presence(day_data)
+            if day_data.status == 'closed':
+                closed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {len(dates)} day files: {closed} closed, {failed} unreadable'
+        ))
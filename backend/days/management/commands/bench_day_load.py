@@ -0,0 +1,65 @@
+"""
+Benchmark loading a year of day files at once (the reporting access pattern).
+Reports wall time and the memory retained by the loaded DayData objects.
+"""
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from days.benchmarks import generate_days
+from days.persistence import DayPersistence
+
+
+class Command(BaseCommand):
+    help = 'Measure load time and memory for a year of day files held in memory together'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--techs', type=int, default=12)
+        parser.add_argument('--seatings', type=int, default=8, help='Seatings per tech per day')
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--data-dir', help='Benchmark existing day files instead of generated ones')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp:
+            if options['data_dir']:
+                persistence = DayPersistence(data_dir=options['data_dir'])
+                dates = persistence.list_days()
+            else:
+                persistence = DayPersistence(data_dir=Path(tmp))
+                dates = generate_days(
+                    persistence.data_dir,
+                    days=options['days'],
+                    techs=options['techs'],
+                    seatings_per_tech=options['seatings'],
+                )
+
+            timings = []
+            for _ in range(options['repeat']):
+                gc.collect()
+                started = time.perf_counter()
+                days = [persistence.load(d) for d in dates]
+                timings.append(time.perf_counter() - started)
+                del days
+
+            gc.collect()
+            tracemalloc.start()
+            baseline = tracemalloc.take_snapshot()
+            days = [persistence.load(d) for d in dates]
+            gc.collect()
+            retained = sum(
+                stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, 'filename')
+            )
+            tracemalloc.stop()
+
+        seatings = sum(len(row.seatings) for day in days for row in day.day_rows)
+        best = min(timings)
+        self.stdout.write(f'days loaded:      {len(days)}')
+        self.stdout.write(f'seatings:         {seatings}')
+        self.stdout.write(f'load time (best): {best:.3f}s ({seatings / best:,.0f} seatings/s)')
+        self.stdout.write(f'retained memory:  {retained / 1024 / 1024:.1f} MiB '
+                          f'({retained / max(seatings, 1):.0f} B/seating)')
@@ -0,0 +1,60 @@
+"""
+Benchmark the streaming seating export (rows per second, peak memory).
+"""
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from days import exports, reports
+from days.benchmarks import generate_days
+from days.persistence import DayPersistence
+
+
+class Command(BaseCommand):
+    help = 'Measure seating export throughput (rows/s) for CSV and NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--techs', type=int, default=12)
+        parser.add_argument('--seatings', type=int, default=8, help='Seatings per tech per day')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp:
+            persistence = DayPersistence(data_dir=Path(tmp))
+            dates = generate_days(
+                persistence.data_dir,
+                days=options['days'],
+                techs=options['techs'],
+                seatings_per_tech=options['seatings'],
+            )
+            # Exports read through the module-level persistence instance
+            original = reports.day_persistence.data_dir
+            reports.day_persistence.data_dir = persistence.data_dir
+            try:
+                for export_format, (stream, _) in exports.EXPORT_FORMATS.items():
+                    rows, size, elapsed = self._run(stream, dates)
+                    # Separate pass: tracemalloc slows the export several times over
+                    tracemalloc.start()
+                    self._run(stream, dates)
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    self.stdout.write(
+                        f'{export_format:7} {rows} rows in {elapsed:.2f}s = {rows / elapsed:,.0f} rows/s, '
+                        f'{size / 1024 / 1024:.1f} MiB out, peak memory {peak / 1024 / 1024:.1f} MiB'
+                    )
+            finally:
+                reports.day_persistence.data_dir = original
+
+    def _run(self, stream, dates):
+        started = time.perf_counter()
+        rows = size = 0
+        for chunk in stream(exports.iter_seating_records(dates[0], dates[-1])):
+            rows += chunk.count('\n')
+            size += len(chunk)
+        elapsed = time.perf_counter() - started
+        if stream is exports.stream_csv:
+            rows -= 1  # header
+        return rows, size, elapsed
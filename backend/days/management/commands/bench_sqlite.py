@@ -0,0 +1,135 @@
+"""
+Lock-contention benchmark for the SQLite connection profile.
+
+Two processes stand in for the two gunicorn workers and hit one scratch
+database at the same time with a request mix like the app's: mostly reads
+(day list style queries), some read-then-write transactions (seating saves
+updating per-day stats). It runs once with SQLite defaults and a connection
+per request (the old setup), then with settings.SQLITE_OPTIONS and
+persistent connections, and reports throughput, latency and lock errors.
+"""
+import multiprocessing
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+ROWS = 5000
+
+
+def _profiles():
+    options = settings.DATABASES['index'].get('OPTIONS', {})
+    tuned = {
+        'init': [sql.strip() for sql in options.get('init_command', '').split(';') if sql.strip()],
+        'timeout': options.get('timeout', 5.0),
+        # Write transactions go through backend.db.write_atomic
+        'begin': 'BEGIN IMMEDIATE',
+        'persistent': bool(settings.DATABASES['index'].get('CONN_MAX_AGE')),
+    }
+    # Python's sqlite3 defaults, which is what Django used without OPTIONS
+    default = {'init': [], 'timeout': 5.0, 'begin': 'BEGIN', 'persistent': False}
+    return [('defaults, connection per request', default), ('SQLITE_OPTIONS, persistent', tuned)]
+
+
+def _prepare(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        'CREATE TABLE day_stats (id INTEGER PRIMARY KEY, day TEXT, tech TEXT, total INTEGER);'
+        'CREATE INDEX day_stats_day ON day_stats (day);'
+        'CREATE TABLE seatings (id INTEGER PRIMARY KEY, stats_id INTEGER, value INTEGER);'
+    )
+    conn.executemany(
+        'INSERT INTO day_stats (day, tech, total) VALUES (?, ?, 0)',
+        [(f'2025-{1 + i % 12:02d}-{1 + i % 28:02d}', f'tech{i % 20}') for i in range(ROWS)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _connect(path, profile):
+    # isolation_level=None: transactions are issued explicitly, as Django does
+    conn = sqlite3.connect(path, timeout=profile['timeout'], isolation_level=None)
+    for sql in profile['init']:
+        conn.execute(sql)
+    return conn
+
+
+def _worker(path, profile, duration, write_share, seed, results):
+    rng = random.Random(seed)
+    conn = _connect(path, profile) if profile['persistent'] else None
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        began = time.perf_counter()
+        db = conn or _connect(path, profile)
+        try:
+            if rng.random() < write_share:
+                db.execute(profile['begin'])
+                try:
+                    stats_id = rng.randrange(1, ROWS + 1)
+                    total = db.execute('SELECT total FROM day_stats WHERE id = ?', (stats_id,)).fetchone()[0]
+                    db.execute('INSERT INTO seatings (stats_id, value) VALUES (?, ?)', (stats_id, 1))
+                    db.execute('UPDATE day_stats SET total = ? WHERE id = ?', (total + 1, stats_id))
+                    db.execute('COMMIT')
+                except Exception:
+                    db.execute('ROLLBACK')
+                    raise
+            else:
+                db.execute(
+                    'SELECT day, tech, total FROM day_stats WHERE day >= ? ORDER BY day DESC LIMIT 50',
+                    (f'2025-{rng.randint(1, 12):02d}-01',),
+                ).fetchall()
+                db.execute('SELECT tech, SUM(total) FROM day_stats GROUP BY tech').fetchall()
+        except sqlite3.OperationalError:
+            # "database is locked"
+            errors += 1
+        finally:
+            if conn is None:
+                db.close()
+        latencies.append(time.perf_counter() - began)
+    if conn is not None:
+        conn.close()
+    results.put((latencies, errors))
+
+
+class Command(BaseCommand):
+    help = 'Compare SQLite lock contention between two workers with default and tuned connection settings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Concurrent processes (gunicorn workers)')
+        parser.add_argument('--seconds', type=float, default=5.0, help='Duration of each run')
+        parser.add_argument('--write-share', type=float, default=0.2, help='Fraction of requests that write')
+
+    def handle(self, *args, **options):
+        context = multiprocessing.get_context('spawn')
+        with tempfile.TemporaryDirectory() as tmp:
+            for run, (label, profile) in enumerate(_profiles()):
+                path = str(Path(tmp) / f'bench-{run}.db')
+                _prepare(path)
+                results = context.Queue()
+                processes = [
+                    context.Process(
+                        target=_worker,
+                        args=(path, profile, options['seconds'], options['write_share'], seed, results),
+                    )
+                    for seed in range(options['workers'])
+                ]
+                for process in processes:
+                    process.start()
+                collected = [results.get() for _ in processes]
+                for process in processes:
+                    process.join()
+
+                latencies = sorted(t for timings, _ in collected for t in timings)
+                errors = sum(e for _, e in collected)
+                rate = len(latencies) / options['seconds']
+                p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0
+                self.stdout.write(
+                    f'{label:36} {rate:8.0f} req/s  p95 {p95:6.2f} ms  '
+                    f'max {latencies[-1] * 1000 if latencies else 0:7.1f} ms  locked errors {errors}'
+                )
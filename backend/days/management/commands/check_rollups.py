@@ -0,0 +1,52 @@
+"""
+Compare the weekly/monthly rollups with totals recomputed from the day files.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from days import rollups
+from days.persistence import day_persistence
+from days.reports import iter_days
+
+
+class Command(BaseCommand):
+    help = 'Check period_rollup against the closed day files (optionally rebuild it)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Replace rollups with the recomputed totals')
+        parser.add_argument('--workers', type=int, default=8, help='Parallel day file loaders')
+
+    def handle(self, *args, **options):
+        failed = []
+
+        def closed_days():
+            for day_date, day_data, error in iter_days(
+                sorted(day_persistence.list_days()), workers=options['workers']
+            ):
+                if error is not None:
+                    failed.append(day_date)
+                    self.stderr.write(f'{day_date}: {error}')
+                elif day_data.status == 'closed':
+                    yield day_date, rollups.day_contributions(day_data)
+
+        expected = rollups.bucket_totals(closed_days())
+        stored = rollups.stored_buckets()
+
+        mismatches = 0
+        for bucket in sorted(expected.keys() | stored.keys(), key=str):
+            if expected.get(bucket) != stored.get(bucket):
+                mismatches += 1
+                period, start, dimension, key = bucket
+                self.stdout.write(
+                    f'{period} {start} {dimension} {key}: '
+                    f'stored {stored.get(bucket)} != files {expected.get(bucket)}'
+                )
+
+        if options['rebuild']:
+            if failed:
+                raise CommandError(f'Not rebuilding: {len(failed)} day files could not be read')
+            rollups.replace_all(expected)
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(expected)} rollup buckets'))
+        elif mismatches:
+            raise CommandError(f'{mismatches} of {len(expected)} rollup buckets differ from the day files')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'All {len(expected)} rollup buckets match the day files'))
@@ -0,0 +1,43 @@
+"""
+Run (or resume) rename propagation jobs in the foreground.
+Use after a restart interrupted a job, or to retry a failed one.
+A job still marked running is only picked up once its progress is older
+than renames.STALE_AFTER, unless --take-over says no other runner has it.
+"""
+from django.core.management.base import BaseCommand
+
+from days.models import RenameJob
+from days.renames import RENAME_WORKERS, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Rewrite day files for pending or interrupted tech/service renames'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=RENAME_WORKERS, help='Worker processes')
+        parser.add_argument('--retry-failed', action='store_true', help='Also rerun failed jobs')
+        parser.add_argument(
+            '--take-over', action='store_true',
+            help='Resume running jobs now (only when no server process is running them)',
+        )
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            # Days that failed may lie before the cursor, so start those jobs over
+            RenameJob.objects.filter(status='failed').update(status='pending', cursor='', changed_days=0)
+        if options['take_over']:
+            # Keeps the cursor, so they resume where they stopped
+            RenameJob.objects.filter(status='running').update(status='pending')
+
+        jobs = run_pending_jobs(workers=options['workers'])
+        if not jobs:
+            self.stdout.write('No pending rename jobs')
+        for job in jobs:
+            line = (
+                f'#{job.id} {job.kind} {job.old_name} -> {job.new_name}: {job.status}, '
+                f'{job.changed_days}/{job.processed_days} days changed'
+            )
+            if job.status == 'done':
+                self.stdout.write(self.style.SUCCESS(line))
+            else:
+                self.stdout.write(self.style.ERROR(f'{line}\n{job.error}'))
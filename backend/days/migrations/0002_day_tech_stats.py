@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('days', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DayTechStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('tech_alias', models.CharField(max_length=50)),
+                ('tech_name', models.CharField(blank=True, default='', max_length=200)),
+                ('total_value', models.IntegerField(default=0)),
+                ('total_value_with_penalty', models.IntegerField(default=0)),
+                ('penalty_count', models.IntegerField(default=0)),
+                ('regular_turns', models.IntegerField(default=0)),
+                ('bonus_turns', models.IntegerField(default=0)),
+                ('seating_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'day_tech_stats',
+                'ordering': ['date', 'tech_alias'],
+                'indexes': [models.Index(fields=['tech_alias', 'date'], name='day_tech_stats_tech_date')],
+                'unique_together': {('date', 'tech_alias')},
+            },
+        ),
+    ]
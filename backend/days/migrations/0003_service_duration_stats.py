@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('days', '0002_day_tech_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceDurationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service_name', models.CharField(max_length=200)),
+                ('tech_alias', models.CharField(blank=True, default='', max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('mean', models.FloatField(default=0.0)),
+                ('variance', models.FloatField(default=0.0)),
+                ('histogram', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'service_duration_stats',
+                'ordering': ['service_name', 'tech_alias'],
+                'unique_together': {('service_name', 'tech_alias')},
+            },
+        ),
+    ]
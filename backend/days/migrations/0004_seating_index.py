@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('days', '0003_service_duration_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeatingIndexEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('seating_id', models.CharField(max_length=64)),
+                ('tech_alias', models.CharField(max_length=50)),
+                ('tech_name', models.CharField(blank=True, default='', max_length=200)),
+                ('service_name', models.CharField(blank=True, default='', max_length=200)),
+                ('time', models.CharField(blank=True, default='', max_length=40)),
+                ('value', models.IntegerField(default=0)),
+                ('has_value_penalty', models.BooleanField(default=False)),
+                ('is_bonus', models.BooleanField(default=False)),
+                ('is_requested', models.BooleanField(default=False)),
+            ],
+            options={
+                'db_table': 'seating_index',
+                'ordering': ['-date', 'time'],
+                'indexes': [models.Index(fields=['tech_alias', 'date'], name='seating_index_tech_date'), models.Index(fields=['service_name', 'date'], name='seating_index_service_date'), models.Index(fields=['value', 'date'], name='seating_index_value_date')],
+                'unique_together': {('date', 'seating_id')},
+            },
+        ),
+    ]
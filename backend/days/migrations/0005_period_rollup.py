@@ -0,0 +1,119 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:43
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+# Frozen copy of the days.rollups logic as of this migration, so later
+# changes to that module cannot alter what this seed produces
+PERIODS = ('week', 'month')
+FIELDS = (
+    'total_value', 'total_value_with_penalty', 'penalty_count',
+    'regular_turns', 'bonus_turns', 'seating_count', 'day_count',
+)
+
+
+def period_start(day, period):
+    """First day of the week (Monday) or month containing `day`"""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def tech_contributions(tech_rows):
+    contributions = {}
+    for alias, value, with_penalty, penalties, regular, bonus, seatings in tech_rows:
+        totals = contributions.setdefault(('tech', alias), dict.fromkeys(FIELDS, 0))
+        totals['total_value'] += value
+        totals['total_value_with_penalty'] += with_penalty
+        totals['penalty_count'] += penalties
+        totals['regular_turns'] += regular
+        totals['bonus_turns'] += bonus
+        totals['seating_count'] += seatings
+        totals['day_count'] = 1
+    return contributions
+
+
+def service_contributions(seatings):
+    contributions = {}
+    for service, value, has_penalty, is_bonus in seatings:
+        if not service:
+            continue
+        totals = contributions.setdefault(('service', service), dict.fromkeys(FIELDS, 0))
+        totals['total_value'] += value
+        totals['total_value_with_penalty'] += max(0, value - 3) if has_penalty else value
+        totals['penalty_count'] += 1 if has_penalty else 0
+        totals['bonus_turns' if is_bonus else 'regular_turns'] += 1
+        totals['seating_count'] += 1
+        totals['day_count'] = 1
+    return contributions
+
+
+def build_rollups(apps, schema_editor):
+    """Seed rollups from days already recorded in day_tech_stats / seating_index"""
+    db_alias = schema_editor.connection.alias
+    DayTechStats = apps.get_model('days', 'DayTechStats')
+    SeatingIndexEntry = apps.get_model('days', 'SeatingIndexEntry')
+    PeriodRollup = apps.get_model('days', 'PeriodRollup')
+
+    tech_rows, seating_rows = {}, {}
+    for day, *row in DayTechStats.objects.using(db_alias).values_list(
+        'date', 'tech_alias', 'total_value', 'total_value_with_penalty', 'penalty_count',
+        'regular_turns', 'bonus_turns', 'seating_count',
+    ):
+        tech_rows.setdefault(day, []).append(row)
+    for day, *row in SeatingIndexEntry.objects.using(db_alias).values_list(
+        'date', 'service_name', 'value', 'has_value_penalty', 'is_bonus',
+    ):
+        seating_rows.setdefault(day, []).append(row)
+
+    buckets = {}
+    for day in tech_rows.keys() | seating_rows.keys():
+        contributions = tech_contributions(tech_rows.get(day, ()))
+        contributions.update(service_contributions(seating_rows.get(day, ())))
+        for period in PERIODS:
+            start = period_start(day, period)
+            for (dimension, key), totals in contributions.items():
+                bucket = buckets.setdefault((period, start, dimension, key), dict.fromkeys(FIELDS, 0))
+                for field in FIELDS:
+                    bucket[field] += totals[field]
+
+    PeriodRollup.objects.using(db_alias).bulk_create([
+        PeriodRollup(period=period, period_start=start, dimension=dimension, key=key, **totals)
+        for (period, start, dimension, key), totals in buckets.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('days', '0004_seating_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('week', 'Week'), ('month', 'Month')], max_length=10)),
+                ('period_start', models.DateField()),
+                ('dimension', models.CharField(choices=[('tech', 'Tech'), ('service', 'Service')], max_length=10)),
+                ('key', models.CharField(max_length=200)),
+                ('total_value', models.IntegerField(default=0)),
+                ('total_value_with_penalty', models.IntegerField(default=0)),
+                ('penalty_count', models.IntegerField(default=0)),
+                ('regular_turns', models.IntegerField(default=0)),
+                ('bonus_turns', models.IntegerField(default=0)),
+                ('seating_count', models.IntegerField(default=0)),
+                ('day_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'period_rollup',
+                'ordering': ['dimension', 'key', 'period', 'period_start'],
+                'indexes': [models.Index(fields=['dimension', 'key', 'period', 'period_start'], name='period_rollup_lookup')],
+                'unique_together': {('period', 'period_start', 'dimension', 'key')},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('days', '0005_period_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='daymetadata',
+            index=models.Index(fields=['status', 'date'], name='day_metadata_status_date'),
+        ),
+    ]
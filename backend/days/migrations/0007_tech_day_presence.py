@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('days', '0006_day_metadata_status_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TechDayPresence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('tech_alias', models.CharField(max_length=50)),
+                ('row_number', models.IntegerField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('is_on_break', models.BooleanField(default=False)),
+                ('seating_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'tech_day_presence',
+                'ordering': ['date', 'row_number'],
+                'indexes': [models.Index(fields=['tech_alias', 'date'], name='tech_day_presence_tech_date')],
+                'unique_together': {('date', 'row_number')},
+            },
+        ),
+    ]
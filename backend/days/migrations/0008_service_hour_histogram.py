@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('days', '0007_tech_day_presence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceHourHistogram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('service_name', models.CharField(max_length=200)),
+                ('hours', models.JSONField(default=list)),
+            ],
+            options={
+                'db_table': 'service_hour_histogram',
+                'ordering': ['date', 'service_name'],
+                'unique_together': {('date', 'service_name')},
+            },
+        ),
+    ]
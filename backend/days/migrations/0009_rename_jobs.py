@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('days', '0008_service_hour_histogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenameJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('tech', 'Technician'), ('service', 'Service')], max_length=10)),
+                ('old_name', models.CharField(max_length=200)),
+                ('new_name', models.CharField(max_length=200)),
+                ('new_tech_name', models.CharField(blank=True, default='', max_length=200)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('total_days', models.IntegerField(default=0)),
+                ('processed_days', models.IntegerField(default=0)),
+                ('changed_days', models.IntegerField(default=0)),
+                ('cursor', models.CharField(blank=True, default='', max_length=10)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'rename_jobs',
+                'ordering': ['-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('days', '0009_rename_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='renamejob',
+            name='live_days',
+            field=models.JSONField(default=list),
+        ),
+    ]
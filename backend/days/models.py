@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.db import models
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+import sys
 import uuid
 
 
@@ -23,32 +25,503 @@ class DayMetadata(models.Model):
     class Meta:
         db_table = 'day_metadata'
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['status', 'date'], name='day_metadata_status_date'),
+        ]
 
     def __str__(self):
         return f"{self.date} - {self.status}"
 
 
+class RenameJob(models.Model):
+    """
+    Rewrite of a renamed tech alias or service name across all day files.
+    Days are processed in date order and `cursor` records the last finished
+    date, so an interrupted job resumes where it stopped (see renames.py).
+    `updated_at` doubles as the runner's heartbeat while a job is running.
+    """
+    KIND_CHOICES = [('tech', 'Technician'), ('service', 'Service')]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    old_name = models.CharField(max_length=200)
+    new_name = models.CharField(max_length=200)
+    # New display name written to day rows on tech renames (blank keeps theirs)
+    new_tech_name = models.CharField(max_length=200, blank=True, default='')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    total_days = models.IntegerField(default=0)
+    processed_days = models.IntegerField(default=0)
+    changed_days = models.IntegerField(default=0)
+    cursor = models.CharField(max_length=10, blank=True, default='')
+    # Open/ended days already rewritten when the job was created; the background pass skips them
+    live_days = models.JSONField(default=list)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'rename_jobs'
+        ordering = ['-id']
+
+    def __str__(self):
+        return f"{self.kind} {self.old_name} -> {self.new_name} ({self.status})"
+
+
+class DayTechStats(models.Model):
+    """
+    Per-day, per-tech totals for closed days, stored in index.db so history
+    reports can aggregate in SQL instead of re-reading day files.
+    Written when a day is closed (see history.py).
+    """
+    date = models.DateField()
+    tech_alias = models.CharField(max_length=50)
+    tech_name = models.CharField(max_length=200, blank=True, default='')
+    total_value = models.IntegerField(default=0)
+    total_value_with_penalty = models.IntegerField(default=0)
+    penalty_count = models.IntegerField(default=0)
+    regular_turns = models.IntegerField(default=0)
+    bonus_turns = models.IntegerField(default=0)
+    seating_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'day_tech_stats'
+        ordering = ['date', 'tech_alias']
+        unique_together = ['date', 'tech_alias']
+        indexes = [
+            models.Index(fields=['tech_alias', 'date'], name='day_tech_stats_tech_date'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.tech_alias}"
+
+
+class TechDayPresence(models.Model):
+    """
+    One row per day row (tech clocked in on a date), stored in index.db so
+    attendance questions do not need the day files. Rewritten on every save
+    of the day (see presence.py); open days are included.
+    """
+    date = models.DateField()
+    tech_alias = models.CharField(max_length=50)
+    row_number = models.IntegerField()
+    is_active = models.BooleanField(default=True)
+    is_on_break = models.BooleanField(default=False)
+    seating_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'tech_day_presence'
+        ordering = ['date', 'row_number']
+        unique_together = ['date', 'row_number']
+        indexes = [
+            models.Index(fields=['tech_alias', 'date'], name='tech_day_presence_tech_date'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.tech_alias} (row {self.row_number})"
+
+
+class SeatingIndexEntry(models.Model):
+    """
+    One row per seating of a closed day, stored in index.db so history
+    can be searched by date, tech, service and value without opening day
+    files. Written alongside DayTechStats (see history.py).
+    """
+    date = models.DateField()
+    seating_id = models.CharField(max_length=64)
+    tech_alias = models.CharField(max_length=50)
+    tech_name = models.CharField(max_length=200, blank=True, default='')
+    service_name = models.CharField(max_length=200, blank=True, default='')
+    time = models.CharField(max_length=40, blank=True, default='')
+    value = models.IntegerField(default=0)
+    has_value_penalty = models.BooleanField(default=False)
+    is_bonus = models.BooleanField(default=False)
+    is_requested = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = 'seating_index'
+        ordering = ['-date', 'time']
+        unique_together = ['date', 'seating_id']
+        indexes = [
+            models.Index(fields=['tech_alias', 'date'], name='seating_index_tech_date'),
+            models.Index(fields=['service_name', 'date'], name='seating_index_service_date'),
+            models.Index(fields=['value', 'date'], name='seating_index_value_date'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.tech_alias} - {self.service_name}"
+
+    def to_dict(self):
+        return {
+            'date': self.date.isoformat(),
+            'seating_id': self.seating_id,
+            'tech_alias': self.tech_alias,
+            'tech_name': self.tech_name,
+            'service': self.service_name,
+            'time': self.time,
+            'value': self.value,
+            'has_value_penalty': self.has_value_penalty,
+            'is_bonus': self.is_bonus,
+            'is_requested': self.is_requested,
+        }
+
+
+class ServiceHourHistogram(models.Model):
+    """
+    Seatings started per hour of day for one service on one date, stored
+    in index.db as a 24-integer array so demand heatmaps can sum buckets
+    instead of parsing seating times. Incremented as seatings are created
+    and rebuilt from the day file when the day is closed (see demand.py).
+    """
+    date = models.DateField()
+    service_name = models.CharField(max_length=200)
+    hours = models.JSONField(default=list)
+
+    class Meta:
+        db_table = 'service_hour_histogram'
+        ordering = ['date', 'service_name']
+        unique_together = ['date', 'service_name']
+
+    def __str__(self):
+        return f"{self.date} - {self.service_name}"
+
+
+class PeriodRollup(models.Model):
+    """
+    Weekly and monthly totals of closed days, per tech and per service, kept
+    in index.db for trend queries. Maintained incrementally whenever a day is
+    closed or stops being closed (see rollups.py).
+    Weeks start on Monday; months on the 1st.
+    """
+    period = models.CharField(max_length=10, choices=[('week', 'Week'), ('month', 'Month')])
+    period_start = models.DateField()
+    dimension = models.CharField(max_length=10, choices=[('tech', 'Tech'), ('service', 'Service')])
+    key = models.CharField(max_length=200)
+    total_value = models.IntegerField(default=0)
+    total_value_with_penalty = models.IntegerField(default=0)
+    penalty_count = models.IntegerField(default=0)
+    regular_turns = models.IntegerField(default=0)
+    bonus_turns = models.IntegerField(default=0)
+    seating_count = models.IntegerField(default=0)
+    day_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'period_rollup'
+        ordering = ['dimension', 'key', 'period', 'period_start']
+        unique_together = ['period', 'period_start', 'dimension', 'key']
+        indexes = [
+            models.Index(fields=['dimension', 'key', 'period', 'period_start'], name='period_rollup_lookup'),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.period_start} - {self.dimension} {self.key}"
+
+
+def _round_or_none(value):
+    return None if value is None else round(value, 1)
+
+
+class ServiceDurationStats(models.Model):
+    """
+    Streaming statistics of real seating durations (minutes from start until
+    a value is entered), per service and tech. The row with an empty
+    tech_alias aggregates every tech for the service.
+    Mean and variance are exponentially weighted so they follow recent
+    behaviour; quantiles come from a fixed-width histogram.
+    Updated in constant time per closed seating (see durations.py).
+    """
+    BUCKET_MINUTES = 5
+    BUCKET_COUNT = 48  # last bucket also holds everything above 4 hours
+    ALPHA = 0.2  # EWMA weight of a new sample once there are 1/ALPHA samples
+
+    service_name = models.CharField(max_length=200)
+    tech_alias = models.CharField(max_length=50, blank=True, default='')
+    count = models.IntegerField(default=0)
+    mean = models.FloatField(default=0.0)
+    variance = models.FloatField(default=0.0)
+    histogram = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'service_duration_stats'
+        ordering = ['service_name', 'tech_alias']
+        unique_together = ['service_name', 'tech_alias']
+
+    def __str__(self):
+        return f"{self.service_name} - {self.tech_alias or '*'}"
+
+    def add(self, minutes):
+        """Fold one observed duration into the statistics"""
+        self.count += 1
+        # Plain running mean until the EWMA window is filled, then a fixed weight
+        weight = max(self.ALPHA, 1 / self.count)
+        diff = minutes - self.mean
+        increment = weight * diff
+        self.mean += increment
+        self.variance = (1 - weight) * (self.variance + diff * increment)
+
+        histogram = self.histogram or [0] * self.BUCKET_COUNT
+        bucket = min(int(minutes // self.BUCKET_MINUTES), self.BUCKET_COUNT - 1)
+        histogram[bucket] += 1
+        self.histogram = histogram
+
+    def merge(self, other):
+        """Fold another row's statistics into this one (used when a tech/service is renamed)"""
+        count = self.count + other.count
+        if not count:
+            return
+        mean = (self.mean * self.count + other.mean * other.count) / count
+        self.variance = (
+            self.count * (self.variance + (self.mean - mean) ** 2)
+            + other.count * (other.variance + (other.mean - mean) ** 2)
+        ) / count
+        self.mean = mean
+        self.count = count
+        histogram = self.histogram or [0] * self.BUCKET_COUNT
+        for bucket, bucket_count in enumerate(other.histogram or []):
+            histogram[bucket] += bucket_count
+        self.histogram = histogram
+
+    def quantile(self, q):
+        """Approximate q-quantile in minutes (linear within a bucket), or None"""
+        total = sum(self.histogram)
+        if not total:
+            return None
+        target = q * total
+        seen = 0
+        for bucket, bucket_count in enumerate(self.histogram):
+            if bucket_count and seen + bucket_count >= target:
+                fraction = (target - seen) / bucket_count
+                return (bucket + fraction) * self.BUCKET_MINUTES
+            seen += bucket_count
+        return self.BUCKET_COUNT * self.BUCKET_MINUTES
+
+    def to_dict(self):
+        return {
+            'service_name': self.service_name,
+            'tech_alias': self.tech_alias,
+            'count': self.count,
+            'mean_minutes': round(self.mean, 1),
+            'stddev_minutes': round(self.variance ** 0.5, 1),
+            'p50_minutes': _round_or_none(self.quantile(0.5)),
+            'p90_minutes': _round_or_none(self.quantile(0.9)),
+        }
+
+
 # The following classes are NOT Django models - they're data structures
-# for file-based persistence and will be serialized to/from JSON
+# for file-based persistence and will be serialized to/from JSON.
+# They use __slots__ and compact field encodings because reporting code may
+# hold a whole archive of days in memory at once; the JSON format is unchanged.
+
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def seating_key(seating_id):
+    """Return the compact in-memory key for a seating ID.
+
+    Canonical (lowercase, hyphenated) UUID strings are stored as 128-bit ints;
+    anything else is kept as-is so to_dict() reproduces the original text.
+    """
+    if (isinstance(seating_id, str) and len(seating_id) == 36
+            and seating_id[8] == seating_id[13] == seating_id[18] == seating_id[23] == '-'):
+        hex_digits = seating_id.replace('-', '')
+        if len(hex_digits) == 32 and hex_digits == hex_digits.lower():
+            try:
+                return int(hex_digits, 16)
+            except ValueError:
+                pass
+    return seating_id
+
+
+# Lengths of datetime.isoformat() output: naive / naive+micro / aware / aware+micro
+_ISO_LENGTHS = {19: (False, False), 26: (False, True), 25: (True, False), 32: (True, True)}
+
+
+def _parse_time(value):
+    """Parse an ISO timestamp into (epoch_microseconds, utc_offset_seconds).
+
+    Returns None unless the text is in the exact shape isoformat() produces,
+    so callers can keep any other spelling verbatim.
+    """
+    shape = _ISO_LENGTHS.get(len(value)) if isinstance(value, str) else None
+    if shape is None or value[10] != 'T':
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    aware, fractional = shape
+    offset = dt.utcoffset()
+    if (offset is not None) != aware or (dt.microsecond != 0) != fractional:
+        return None
+    if offset is None:
+        return (dt - _EPOCH_NAIVE) // _MICROSECOND, None
+    if offset % timedelta(minutes=1):
+        return None
+    return (dt - _EPOCH_UTC) // _MICROSECOND, int(offset.total_seconds())
+
+
+def _format_time(time_us, tz_offset):
+    if tz_offset is None:
+        return (_EPOCH_NAIVE + timedelta(microseconds=time_us)).isoformat()
+    tz = timezone(timedelta(seconds=tz_offset))
+    return (_EPOCH_UTC + timedelta(microseconds=time_us)).astimezone(tz).isoformat()
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
 
 class Seating:
     """Seating data structure (not a Django model, used for JSON persistence)"""
+    __slots__ = (
+        '_key', 'is_requested', 'is_bonus', 'service', 'short_name', 'time_needed',
+        '_time_us', '_tz_offset', '_time_raw', '_value', '_has_value_penalty', '_row',
+    )
+
     def __init__(self, id=None, is_requested=False, is_bonus=False, service='', 
                  time=None, value=0, has_value_penalty=False, short_name='', time_needed=None):
-        self.id = id or str(uuid.uuid4())
+        # Row holding this seating; value/penalty edits update its aggregates
+        self._row = None
+        self._key = seating_key(id) if id else uuid.uuid4().int
         self.is_requested = is_requested
         self.is_bonus = is_bonus
-        self.service = service
-        self.short_name = short_name
+        self.service = _intern(service)
+        self.short_name = _intern(short_name)
         self.time_needed = time_needed
-        # Use timezone-aware ISO format so clients parse times correctly across zones
+        parsed = _parse_time(time) if time else None
+        if parsed is not None:
+            (self._time_us, self._tz_offset), self._time_raw = parsed, None
+        elif time:
+            self._time_us, self._tz_offset, self._time_raw = None, None, time
+        else:
+            # Use timezone-aware time so clients parse times correctly across zones
+            try:
+                now = datetime.now().astimezone()
+            except Exception:
+                now = datetime.now()
+            self._set_datetime(now)
+        # Not attached to a row yet, so skip the aggregate-updating setters
+        self._value = value
+        self._has_value_penalty = has_value_penalty
+
+    @property
+    def id(self):
+        if isinstance(self._key, int):
+            return str(uuid.UUID(int=self._key))
+        return self._key
+
+    @id.setter
+    def id(self, value):
+        self._key = seating_key(value)
+
+    @property
+    def key(self):
+        """Compact ID used for index lookups (see seating_key)"""
+        return self._key
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        row = self._row
+        if row is not None:
+            row._account(self, -1)
+        self._value = value
+        if row is not None:
+            row._account(self, 1)
+            row._check_aggregates()
+
+    @property
+    def has_value_penalty(self):
+        return self._has_value_penalty
+
+    @has_value_penalty.setter
+    def has_value_penalty(self, value):
+        row = self._row
+        if row is not None:
+            row._account(self, -1)
+        self._has_value_penalty = value
+        if row is not None:
+            row._account(self, 1)
+            row._check_aggregates()
+
+    @property
+    def is_open(self):
+        """A seating stays open until a value is entered"""
+        return self._value == 0
+
+    @property
+    def value_with_penalty(self):
+        """Value after the value penalty (-3, floored at 0) is applied"""
+        if self._has_value_penalty:
+            return max(0, self._value - 3)
+        return self._value
+
+    @property
+    def time(self):
+        if self._time_raw is not None:
+            return self._time_raw
+        return _format_time(self._time_us, self._tz_offset)
+
+    @time.setter
+    def time(self, value):
+        row = getattr(self, '_row', None)
+        if row is not None:
+            row._account(self, -1)
+        parsed = _parse_time(value)
+        if parsed is None:
+            self._time_us, self._tz_offset, self._time_raw = None, None, value
+        else:
+            self._time_us, self._tz_offset = parsed
+            self._time_raw = None
+        if row is not None:
+            row._account(self, 1)
+            row._check_aggregates()
+
+    def _set_datetime(self, dt):
+        offset = dt.utcoffset()
+        if offset is None:
+            self._time_us, self._tz_offset = (dt - _EPOCH_NAIVE) // _MICROSECOND, None
+        else:
+            self._time_us = (dt - _EPOCH_UTC) // _MICROSECOND
+            self._tz_offset = int(offset.total_seconds())
+        self._time_raw = None
+
+    @property
+    def timestamp(self):
+        """Start time as POSIX seconds (naive times are treated as UTC), or None"""
+        if self._time_us is not None:
+            return self._time_us / 1_000_000
         try:
-            default_time = datetime.now().astimezone().isoformat()
-        except Exception:
-            default_time = datetime.now().isoformat()
-        self.time = time or default_time
-        self.value = value
-        self.has_value_penalty = has_value_penalty
+            dt = datetime.fromisoformat(self._time_raw)
+        except (TypeError, ValueError):
+            return None
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+
+    @property
+    def start_datetime(self):
+        """Start time as a datetime (aware when the stored time has an offset), or None"""
+        if self._time_us is not None:
+            if self._tz_offset is None:
+                return _EPOCH_NAIVE + timedelta(microseconds=self._time_us)
+            tz = timezone(timedelta(seconds=self._tz_offset))
+            return (_EPOCH_UTC + timedelta(microseconds=self._time_us)).astimezone(tz)
+        try:
+            return datetime.fromisoformat(self._time_raw)
+        except (TypeError, ValueError):
+            return None
 
     def to_dict(self):
         return {
@@ -80,16 +553,27 @@ class Seating:
 
 class DayRow:
     """DayRow data structure (not a Django model, used for JSON persistence)"""
+    __slots__ = (
+        'row_number', 'tech_alias', 'tech_name', '_seatings', 'regular_turns',
+        'bonus_turns', 'is_on_break', 'is_active', '_day',
+        # Running aggregates over seatings, kept current by add/remove/edit
+        'open_count', 'total_value', 'total_with_penalty', 'penalty_count',
+        '_earliest_open', '_earliest_open_stale',
+    )
+
     def __init__(self, row_number=1, tech_alias='', tech_name='', seatings=None,
                  regular_turns=0, bonus_turns=0, is_on_break=False, is_active=True):
         self.row_number = row_number
-        self.tech_alias = tech_alias
-        self.tech_name = tech_name
+        self.tech_alias = _intern(tech_alias)
+        self.tech_name = _intern(tech_name)
         self.seatings = seatings or []
         self.regular_turns = regular_turns
         self.bonus_turns = bonus_turns
         self.is_on_break = is_on_break
         self.is_active = is_active
+        # Owning DayData, set once the row is indexed so seating changes can
+        # keep the day's seating index in sync
+        self._day = None
 
     def to_dict(self):
         return {
@@ -118,33 +602,172 @@ class DayRow:
             is_active=data.get('is_active', True),
         )
 
+    @property
+    def seatings(self):
+        return self._seatings
+
+    @seatings.setter
+    def seatings(self, seatings):
+        """Replacing the seating list recomputes every aggregate"""
+        self._seatings = seatings
+        open_count = total_value = total_with_penalty = penalty_count = 0
+        earliest_open = None
+        # Inlined version of _account(); this runs for every row of every loaded day
+        for seating in seatings:
+            seating._row = self
+            value = seating._value
+            total_value += value
+            if seating._has_value_penalty:
+                penalty_count += 1
+                total_with_penalty += max(0, value - 3)
+            else:
+                total_with_penalty += value
+            if value == 0:
+                open_count += 1
+                started_at = seating.timestamp
+                if started_at is not None and (earliest_open is None or started_at < earliest_open):
+                    earliest_open = started_at
+        self.open_count = open_count
+        self.total_value = total_value
+        self.total_with_penalty = total_with_penalty
+        self.penalty_count = penalty_count
+        self._earliest_open = earliest_open
+        self._earliest_open_stale = False
+
+    def _account(self, seating, sign):
+        """Add (sign=1) or remove (sign=-1) a seating's share of the aggregates"""
+        value = seating.value
+        self.total_value += sign * value
+        self.total_with_penalty += sign * seating.value_with_penalty
+        if seating.has_value_penalty:
+            self.penalty_count += sign
+        if value == 0:
+            self.open_count += sign
+            started_at = seating.timestamp
+            if sign > 0:
+                if not self._earliest_open_stale and started_at is not None and (
+                        self._earliest_open is None or started_at < self._earliest_open):
+                    self._earliest_open = started_at
+            elif started_at is None or started_at == self._earliest_open:
+                # The minimum left the set; find the next one on demand
+                self._earliest_open_stale = True
+
+    @property
+    def earliest_open_start(self):
+        """Start (epoch seconds) of the oldest open seating, or None"""
+        if self._earliest_open_stale:
+            starts = [s.timestamp for s in self._seatings if s.is_open and s.timestamp is not None]
+            self._earliest_open = min(starts) if starts else None
+            self._earliest_open_stale = False
+        return self._earliest_open
+
+    def compute_aggregates(self):
+        """Recompute the aggregates from scratch (used to verify the running ones)"""
+        open_starts = [s.timestamp for s in self._seatings if s.is_open and s.timestamp is not None]
+        return {
+            'open_count': sum(1 for s in self._seatings if s.is_open),
+            'earliest_open_start': min(open_starts) if open_starts else None,
+            'total_value': sum(s.value for s in self._seatings),
+            'total_with_penalty': sum(s.value_with_penalty for s in self._seatings),
+            'penalty_count': sum(1 for s in self._seatings if s.has_value_penalty),
+        }
+
+    def _check_aggregates(self):
+        if not getattr(settings, 'DAY_AGGREGATE_CHECKS', False):
+            return
+        expected = self.compute_aggregates()
+        actual = {key: getattr(self, key) for key in expected}
+        assert actual == expected, (
+            f'Row aggregates for {self.tech_alias} drifted: {actual} != {expected}'
+        )
+
+    def reclassify_turns(self, start, service_is_bonus=None):
+        """
+        Update `is_bonus` flags and turn counts after the seating at `start` changed.
+
+        Rules:
+        - Requested seatings alternate: 1st requested = regular, 2nd = bonus, etc.
+        - Walk-ins use their service's is_bonus flag.
+
+        Only seatings from `start` onward are touched: the alternation resumes
+        from the nearest requested seating before `start`, and walk-ins after
+        `start` keep their flags. The walk-in at `start` itself is reclassified
+        with `service_is_bonus(service_name)` when that callable is given
+        (pass None after a removal, when the seating at `start` is unchanged).
+        """
+        seatings = self._seatings
+        next_requested_bonus = False
+        for i in range(min(start, len(seatings)) - 1, -1, -1):
+            if seatings[i].is_requested:
+                next_requested_bonus = not seatings[i].is_bonus
+                break
+
+        for i in range(start, len(seatings)):
+            seating = seatings[i]
+            if seating.is_requested:
+                is_bonus = next_requested_bonus
+                next_requested_bonus = not next_requested_bonus
+            elif i == start and service_is_bonus is not None:
+                is_bonus = bool(service_is_bonus(seating.service))
+            else:
+                continue
+
+            if is_bonus != seating.is_bonus:
+                seating.is_bonus = is_bonus
+                if is_bonus:
+                    self.bonus_turns += 1
+                    self.regular_turns = max(0, self.regular_turns - 1)
+                else:
+                    self.regular_turns += 1
+                    self.bonus_turns = max(0, self.bonus_turns - 1)
+
     def add_seating(self, seating):
-        """Add a seating and update turn counts"""
+        """Add a seating and update turn counts and aggregates"""
         self.seatings.append(seating)
+        seating._row = self
+        self._account(seating, 1)
+        self._check_aggregates()
         if seating.is_bonus:
             self.bonus_turns += 1
         else:
             self.regular_turns += 1
+        if self._day is not None:
+            self._day._seating_added(self, seating)
 
     def remove_seating(self, seating_id):
-        """Remove a seating by ID and update turn counts"""
+        """Remove a seating by ID and update turn counts and aggregates"""
+        key = seating_key(seating_id)
         for i, seating in enumerate(self.seatings):
-            if seating.id == seating_id:
+            if seating.key == key:
                 removed = self.seatings.pop(i)
+                self._account(removed, -1)
+                removed._row = None
+                self._check_aggregates()
                 if removed.is_bonus:
                     self.bonus_turns = max(0, self.bonus_turns - 1)
                 else:
                     self.regular_turns = max(0, self.regular_turns - 1)
+                if self._day is not None:
+                    self._day._seating_removed(removed)
                 return removed
         return None
 
 
 class DayData:
     """DayData data structure (not a Django model, used for JSON persistence)"""
+    __slots__ = (
+        'date', 'status', '_day_rows', 'new_day_checklist', 'end_day_checklist',
+        'created_at', 'closed_at', '_tech_index', '_row_number_index', '_seating_index',
+    )
+
     def __init__(self, date='', status='open', day_rows=None, new_day_checklist=None,
                  end_day_checklist=None, created_at=None, closed_at=None):
         self.date = date
         self.status = status
+        # Lookup indexes are built lazily on first use (see _rows_by_tech etc.)
+        self._tech_index = None
+        self._row_number_index = None
+        self._seating_index = None
         self.day_rows = day_rows or []
         self.new_day_checklist = new_day_checklist or []
         self.end_day_checklist = end_day_checklist or []
@@ -176,12 +799,104 @@ class DayData:
             closed_at=data.get('closed_at'),
         )
 
+    @property
+    def day_rows(self):
+        return self._day_rows
+
+    @day_rows.setter
+    def day_rows(self, rows):
+        """Replacing the row list invalidates every lookup index"""
+        self._day_rows = rows
+        self.invalidate_indexes()
+
+    def invalidate_indexes(self):
+        """Drop the lookup indexes; call after mutating day_rows directly"""
+        self._tech_index = None
+        self._row_number_index = None
+        self._seating_index = None
+
+    def _rows_by_tech(self):
+        if self._tech_index is None:
+            index = {}
+            for row in self.day_rows:
+                # First row wins, matching the old linear scan
+                index.setdefault(row.tech_alias, row)
+            self._tech_index = index
+        return self._tech_index
+
+    def _rows_by_number(self):
+        if self._row_number_index is None:
+            index = {}
+            for row in self.day_rows:
+                index.setdefault(row.row_number, row)
+            self._row_number_index = index
+        return self._row_number_index
+
+    def _seatings_by_id(self):
+        if self._seating_index is None:
+            index = {}
+            for row in self.day_rows:
+                row._day = self
+                for seating in row.seatings:
+                    index.setdefault(seating.key, (row, seating))
+            self._seating_index = index
+        return self._seating_index
+
+    def _seating_added(self, row, seating):
+        if self._seating_index is not None:
+            self._seating_index.setdefault(seating.key, (row, seating))
+
+    def _seating_removed(self, seating):
+        if self._seating_index is not None:
+            entry = self._seating_index.get(seating.key)
+            if entry is not None and entry[1] is seating:
+                del self._seating_index[seating.key]
+
     def get_row_by_tech(self, tech_alias):
         """Get a DayRow by tech alias"""
-        for row in self.day_rows:
-            if row.tech_alias == tech_alias:
-                return row
-        return None
+        return self._rows_by_tech().get(tech_alias)
+
+    def get_row_by_number(self, row_number):
+        """Get a DayRow by its row number"""
+        return self._rows_by_number().get(row_number)
+
+    def find_seating(self, seating_id):
+        """Return (row, seating) for a seating ID, or (None, None) if not found"""
+        return self._seatings_by_id().get(seating_key(seating_id), (None, None))
+
+    def remove_seating(self, seating_id):
+        """Remove a seating by ID from whichever row holds it.
+
+        Returns (row, removed_seating), or (None, None) if not found.
+        """
+        row, seating = self.find_seating(seating_id)
+        if row is None:
+            return None, None
+        return row, row.remove_seating(seating_id)
+
+    def resequence_rows(self):
+        """Renumber rows sequentially (no gaps) following list order"""
+        for idx, row in enumerate(self.day_rows, start=1):
+            row.row_number = idx
+        self._row_number_index = None
+
+    def remove_row(self, row):
+        """Remove a row and resequence the remaining rows"""
+        self.day_rows.remove(row)
+        if self._tech_index is not None and self._tech_index.get(row.tech_alias) is row:
+            # Another row may share the alias; let the index rebuild
+            self._tech_index = None
+        if self._seating_index is not None:
+            for seating in row.seatings:
+                self._seating_removed(seating)
+        row._day = None
+        self.resequence_rows()
+
+    def move_row(self, row, new_row_number):
+        """Move a row to a new 1-based position and resequence all rows"""
+        self.day_rows.remove(row)
+        self.day_rows.insert(new_row_number - 1, row)
+        self.resequence_rows()
 
     def add_row(self, tech_alias, tech_name=''):
         """Add a new row for a tech (clock-in).
@@ -207,5 +922,10 @@ class DayData:
         row_number = len(self.day_rows) + 1
         new_row = DayRow(row_number=row_number, tech_alias=tech_alias, tech_name=tech_name)
         self.day_rows.append(new_row)
+        new_row._day = self
+        if self._tech_index is not None:
+            self._tech_index.setdefault(tech_alias, new_row)
+        if self._row_number_index is not None:
+            self._row_number_index.setdefault(row_number, new_row)
         return new_row
 
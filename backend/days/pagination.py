@@ -0,0 +1,12 @@
+"""
+Pagination for the day list
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class DayCursorPagination(CursorPagination):
+    """Newest day first; the cursor stays stable while new days are added"""
+    ordering = '-date'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -4,9 +4,46 @@ Handles loading and saving DayData to/from JSON files
 """
 import json
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, date
 from .models import DayData, DayMetadata
+from . import presence
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no cross-process locking
+    fcntl = None
+
+
+# Lock files held by the current thread, so nested day_file_lock() calls
+# (a view holding the lock calls save()) do not deadlock on flock
+_held_locks = threading.local()
+
+
+@contextmanager
+def day_file_lock(file_path):
+    """
+    Exclusive lock for one day file, held on a sidecar `.lock` file so it
+    works across processes (web workers, rename job workers).
+    Re-entrant within a thread.
+    """
+    lock_path = Path(file_path).with_suffix('.lock')
+    held = _held_locks.__dict__.setdefault('paths', set())
+    if lock_path in held:
+        yield
+        return
+    with open(lock_path, 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        held.add(lock_path)
+        try:
+            yield
+        finally:
+            held.discard(lock_path)
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
 
 
 class DayPersistence:
@@ -36,6 +73,10 @@ class DayPersistence:
         
         return self.data_dir / f"{date_str}.json"
     
+    def lock(self, day_date):
+        """Exclusive per-day lock; hold it around read-modify-write of a day file"""
+        return day_file_lock(self.get_file_path(day_date))
+
     def exists(self, day_date):
         """Check if a day file exists"""
         file_path = self.get_file_path(day_date)
@@ -67,12 +108,17 @@ class DayPersistence:
         try:
             # Convert to dict and save as JSON
             data_dict = day_data.to_dict()
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data_dict, f, indent=2, ensure_ascii=False)
+            with day_file_lock(file_path):
+                # Write beside the file then swap, so readers never see half a day
+                tmp_path = file_path.with_suffix('.json.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data_dict, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, file_path)
             
             # Update metadata in index.db if requested
             if update_metadata:
                 self._update_metadata(day_data, file_path)
+                self._update_presence(day_data)
             
             return file_path
         except Exception as e:
@@ -99,6 +145,7 @@ class DayPersistence:
                     f.write(random_data)
             
             # Delete the file
+            # The .lock sidecar stays: another process may be waiting on it
             file_path.unlink()
             
             # Update metadata
@@ -108,6 +155,10 @@ class DayPersistence:
                 metadata.save()
             except DayMetadata.DoesNotExist:
                 pass
+            try:
+                presence.forget_presence(day_date)
+            except Exception as e:
+                print(f"Warning: Could not clear presence: {e}")
             
             return True
         except Exception as e:
@@ -142,6 +193,14 @@ class DayPersistence:
             # Log error but don't fail the save operation
             print(f"Warning: Could not update metadata: {e}")
 
+    def _update_presence(self, day_data):
+        """Rewrite the day's rows in tech_day_presence (index.db)"""
+        try:
+            presence.sync_presence(day_data)
+        except Exception as e:
+            # Log error but don't fail the save operation
+            print(f"Warning: Could not update presence: {e}")
+
 
 # Global instance
 day_persistence = DayPersistence()
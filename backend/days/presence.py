@@ -0,0 +1,73 @@
+"""
+Tech-by-date presence (tech_day_presence table in index.db)
+Kept in step with the day files by DayPersistence.save/delete.
+"""
+from django.db.models import Count, Max, Sum
+
+from backend.db import write_atomic
+
+from .models import TechDayPresence
+
+
+def presence_rows(day_data):
+    """TechDayPresence instances (unsaved) for every row of a day"""
+    return [
+        TechDayPresence(
+            date=day_data.date,
+            tech_alias=row.tech_alias,
+            row_number=row.row_number,
+            is_active=getattr(row, 'is_active', True),
+            is_on_break=row.is_on_break,
+            seating_count=len(row.seatings),
+        )
+        for row in day_data.day_rows
+    ]
+
+
+def sync_presence(day_data):
+    """Replace a day's presence rows with its current rows"""
+    with write_atomic('index'):
+        TechDayPresence.objects.filter(date=day_data.date).delete()
+        TechDayPresence.objects.bulk_create(presence_rows(day_data))
+
+
+def forget_presence(day_date):
+    TechDayPresence.objects.filter(date=day_date).delete()
+
+
+def attendance(date_from, date_to, tech_alias=None):
+    """
+    Per-tech attendance between two dates (inclusive), from one grouped query:
+    [{"tech_alias", "days_worked", "seating_count", "last_worked"}]
+    """
+    rows = TechDayPresence.objects.filter(date__range=(date_from, date_to))
+    if tech_alias:
+        rows = rows.filter(tech_alias=tech_alias)
+    rows = rows.values('tech_alias').annotate(
+        days_worked=Count('date', distinct=True),
+        seatings=Sum('seating_count'),
+        last=Max('date'),
+    ).order_by('tech_alias')
+    return [
+        {
+            'tech_alias': row['tech_alias'],
+            'days_worked': row['days_worked'],
+            'seating_count': row['seatings'] or 0,
+            'last_worked': row['last'].isoformat(),
+        }
+        for row in rows
+    ]
+
+
+def tech_history(tech_alias, recent=10):
+    """Last date worked, number of days worked and the most recent dates for one tech"""
+    dates = TechDayPresence.objects.filter(tech_alias=tech_alias).order_by('-date').values_list(
+        'date', flat=True
+    ).distinct()
+    recent_dates = [d.isoformat() for d in dates[:recent]]
+    return {
+        'alias': tech_alias,
+        'last_worked': recent_dates[0] if recent_dates else None,
+        'days_worked': dates.count(),
+        'recent_dates': recent_dates,
+    }
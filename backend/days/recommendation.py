@@ -4,7 +4,7 @@ Implements 4-priority scheduling algorithm
 """
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
-from services.models import Service, TechSkill
+from services.catalog import get_catalog
 
 
 class TechRecommendation:
@@ -35,14 +35,13 @@ def calculate_time_passed_percentage(seating, service_time_needed: int) -> float
     Returns 0.0 to 1.0 (or > 1.0 if overtime)
     """
     try:
-        # Parse the seating time
-        seating_time = datetime.fromisoformat(seating.time)
-        # Make sure we're comparing timezone-aware datetimes
-        if seating_time.tzinfo is None:
-            seating_time = seating_time.replace(tzinfo=timezone.utc)
+        # Seatings keep their start time as epoch seconds (naive times count as UTC)
+        started_at = seating.timestamp
+        if started_at is None:
+            return 0.0
         
-        now = datetime.now(timezone.utc)
-        elapsed_minutes = (now - seating_time).total_seconds() / 60
+        now = datetime.now(timezone.utc).timestamp()
+        elapsed_minutes = (now - started_at) / 60
         
         if service_time_needed <= 0:
             return 0.0
@@ -53,7 +52,8 @@ def calculate_time_passed_percentage(seating, service_time_needed: int) -> float
 
 
 def get_tech_recommendations(day_data, service_name: Optional[str] = None,
-                            turn_type: str = 'regular', skip_skill_check: bool = False) -> List[TechRecommendation]:
+                            turn_type: str = 'regular', skip_skill_check: bool = False,
+                            use_learned_durations: bool = False) -> List[TechRecommendation]:
     """
     Get recommended technicians based on 4-priority algorithm
     
@@ -62,23 +62,34 @@ def get_tech_recommendations(day_data, service_name: Optional[str] = None,
     - service_name: Optional service name for skill filtering
     - turn_type: 'regular' or 'bonus' - determines which turn count to prioritize
     - skip_skill_check: If True, skip priority #2 (skill check)
+    - use_learned_durations: If True, judge open seatings against the learned
+      duration for the tech/service (see durations.py) when enough samples exist
     
     Priority Logic:
     1. Tech availability (no open seating OR open seating with >70% time passed)
+       Expected duration: seating's own time_needed, else learned (if enabled),
+       else the service's time_needed
     2. Tech skill (must have service in skill list) - SKIPPED if skip_skill_check=True
     3. Turn balance (prefer techs with fewer turns of the appropriate type)
     4. Row number (lower row number = higher priority)
     """
     recommendations = []
+    catalog = get_catalog()
     
     # Get service info if provided
     service_time_needed = 0
     if service_name:
-        try:
-            service = Service.objects.get(name=service_name)
+        service = catalog.get(service_name)
+        if service is not None:
             service_time_needed = service.time_needed
-        except Service.DoesNotExist:
-            pass
+
+    estimates = None
+    if use_learned_durations:
+        from .durations import DurationEstimates
+        estimates = DurationEstimates(
+            seating.service for row in day_data.day_rows for seating in row.seatings
+            if seating.is_open and seating.service
+        )
     
     for row in day_data.day_rows:
         # Skip disabled rows
@@ -96,30 +107,43 @@ def get_tech_recommendations(day_data, service_name: Optional[str] = None,
             'time_passed_percentages': []
         }
         
-        open_seatings = [s for s in row.seatings if s.value == 0]
-        availability_check['open_seatings'] = len(open_seatings)
+        availability_check['open_seatings'] = row.open_count
         
-        if len(open_seatings) == 0:
+        if row.open_count == 0:
             # No open seatings - tech is available
             availability_check['passed'] = True
             availability_check['reason'] = 'No open seatings'
         else:
             # Has open seatings - check if more than 70% time passed
             all_past_70_percent = True
+            open_seatings = [s for s in row.seatings if s.is_open]
             for seating in open_seatings:
-                # Get the service time for this seating
+                # Get the expected time for this seating
                 seating_service_time = service_time_needed
-                if seating.service:
-                    try:
-                        seating_service = Service.objects.get(name=seating.service)
-                        seating_service_time = seating_service.time_needed
-                    except Service.DoesNotExist:
-                        pass
+                time_source = 'service'
+                learned_minutes = None
+                if seating.time_needed:
+                    seating_service_time = seating.time_needed
+                    time_source = 'seating'
+                elif seating.service:
+                    if estimates is not None:
+                        learned_minutes, learned_source = estimates.expected_minutes(
+                            seating.service, row.tech_alias
+                        )
+                    if learned_minutes is not None:
+                        seating_service_time = learned_minutes
+                        time_source = learned_source
+                    else:
+                        seating_service = catalog.get(seating.service)
+                        if seating_service is not None:
+                            seating_service_time = seating_service.time_needed
                 
                 time_passed_pct = calculate_time_passed_percentage(seating, seating_service_time)
                 availability_check['time_passed_percentages'].append({
                     'seating_id': seating.id,
-                    'percentage': round(time_passed_pct * 100, 1)
+                    'percentage': round(time_passed_pct * 100, 1),
+                    'expected_minutes': round(seating_service_time, 1),
+                    'time_source': time_source,
                 })
                 
                 if time_passed_pct < 0.70:
@@ -139,10 +163,7 @@ def get_tech_recommendations(day_data, service_name: Optional[str] = None,
         }
         
         if not skip_skill_check and service_name:
-            has_skill = TechSkill.objects.filter(
-                tech_alias=row.tech_alias,
-                service_name=service_name
-            ).exists()
+            has_skill = catalog.has_skill(row.tech_alias, service_name)
             
             skill_check['passed'] = has_skill
             skill_check['has_skill'] = has_skill
@@ -0,0 +1,256 @@
+"""
+Propagate tech/service renames into the day files
+
+Renames only touch index.db; day files keep the old tech_alias / service
+strings. A RenameJob rewrites them: open and ended days synchronously when
+the rename happens (they are still being edited), then the remaining day
+files that existed at that point in a background thread that fans the
+file rewrites out to a process pool. Live days and days created after the
+rename are left alone, since a new tech may already be using the old alias.
+Each file is rewritten under its per-day lock and only when it changed;
+the materialized tables for that day are then rebuilt from the new file.
+
+Each gunicorn worker may start a runner, so a job is claimed with a
+conditional UPDATE before it runs and only the oldest unfinished job is
+ever claimable. A running job whose progress has not been saved for
+STALE_AFTER is treated as interrupted and may be claimed again.
+"""
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+import django
+from django.db import connections
+from django.utils import timezone
+
+from . import durations, history, presence
+from .models import DayMetadata, RenameJob
+from .persistence import day_file_lock, day_persistence
+
+RENAME_WORKERS = 4
+# Days handed to a worker process at a time
+RENAME_CHUNK_SIZE = 16
+# Save job progress every this many days
+PROGRESS_EVERY = 25
+# A running job with no saved progress for this long was interrupted
+STALE_AFTER = timedelta(minutes=10)
+
+_runner_lock = threading.Lock()
+_runner = None
+
+
+def rename_in_data(data, kind, old_name, new_name, new_tech_name=''):
+    """Apply a rename to a day's JSON dict in place; returns True if anything changed"""
+    changed = False
+    for row in data.get('day_rows', []):
+        if kind == 'tech':
+            if row.get('tech_alias') == old_name:
+                row['tech_alias'] = new_name
+                if new_tech_name:
+                    row['tech_name'] = new_tech_name
+                changed = True
+        else:
+            for seating in row.get('seatings', []):
+                if seating.get('service') == old_name:
+                    seating['service'] = new_name
+                    changed = True
+    return changed
+
+
+def rewrite_day_file(file_path, kind, old_name, new_name, new_tech_name=''):
+    """
+    Rewrite one day file under its lock. Runs in worker processes, so it only
+    touches the file. Returns (date, changed, error).
+    """
+    file_path = Path(file_path)
+    try:
+        with day_file_lock(file_path):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not rename_in_data(data, kind, old_name, new_name, new_tech_name):
+                return file_path.stem, False, None
+            # Write beside the file then swap, so readers never see half a day
+            tmp_path = file_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, file_path)
+        return file_path.stem, True, None
+    except Exception as e:
+        return file_path.stem, False, str(e)
+
+
+def _refresh_derived(day_date):
+    """Rebuild the index.db rows derived from one rewritten day file"""
+    day_data = day_persistence.load(day_date)
+    presence.sync_presence(day_data)
+    history.sync_day(day_data)
+
+
+def rename_live_days(job):
+    """Rewrite open and ended days now; they may be edited before the job reaches them"""
+    live = DayMetadata.objects.filter(status__in=['open', 'ended']).values_list('date', flat=True)
+    handled = []
+    for day in live:
+        day_date = day.isoformat()
+        if not day_persistence.exists(day_date):
+            continue
+        _, changed, error = rewrite_day_file(
+            day_persistence.get_file_path(day_date),
+            job.kind, job.old_name, job.new_name, job.new_tech_name,
+        )
+        if error:
+            print(f"Warning: Could not apply rename to {day_date}: {error}")
+            continue
+        handled.append(day_date)
+        if changed:
+            _refresh_derived(day_date)
+    job.live_days = handled
+    job.save(update_fields=['live_days', 'updated_at'])
+
+
+def _background_dates(job):
+    """Day files the background pass rewrites, in date order"""
+    skip = set(job.live_days)
+    # Days opened after the rename only ever saw the new name
+    created_later = DayMetadata.objects.filter(created_at__gt=job.created_at).values_list('date', flat=True)
+    skip.update(day.isoformat() for day in created_later)
+    return sorted(d for d in day_persistence.list_days() if d not in skip)
+
+
+def run_job(job, workers=RENAME_WORKERS):
+    """Process (or resume) one claimed job; progress is saved as it goes"""
+    job.status = 'running'
+    job.error = ''
+    dates = _background_dates(job)
+    job.total_days = len(dates)
+    pending = [d for d in dates if d > job.cursor] if job.cursor else dates
+    job.processed_days = len(dates) - len(pending)
+    job.save()
+
+    errors = []
+    paths = [str(day_persistence.get_file_path(d)) for d in pending]
+    # The runner is a thread inside a gunicorn worker; forking a threaded
+    # process can copy held locks into the children, so workers are spawned
+    # fresh and set Django up before their first task
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup,
+    )
+    with pool:
+        results = pool.map(
+            rewrite_day_file, paths,
+            [job.kind] * len(paths), [job.old_name] * len(paths),
+            [job.new_name] * len(paths), [job.new_tech_name] * len(paths),
+            chunksize=RENAME_CHUNK_SIZE,
+        )
+        # map() yields in date order, so the cursor only ever covers finished days
+        for day_date, changed, error in results:
+            if error:
+                errors.append(f'{day_date}: {error}')
+            elif changed:
+                job.changed_days += 1
+                try:
+                    _refresh_derived(day_date)
+                except Exception as e:
+                    errors.append(f'{day_date}: {e}')
+            job.processed_days += 1
+            job.cursor = day_date
+            if job.processed_days % PROGRESS_EVERY == 0:
+                job.save(update_fields=['processed_days', 'changed_days', 'cursor', 'updated_at'])
+
+    durations.rename(job.kind, job.old_name, job.new_name)
+    job.status = 'failed' if errors else 'done'
+    job.error = '\n'.join(errors)
+    job.finished_at = timezone.now()
+    job.save()
+    return job
+
+
+def _next_job():
+    """The oldest unfinished job; later renames may build on it"""
+    return RenameJob.objects.filter(status__in=['pending', 'running']).order_by('id').first()
+
+
+def _is_claimable(job):
+    return job.status == 'pending' or job.updated_at < timezone.now() - STALE_AFTER
+
+
+def claim_next_job():
+    """
+    Atomically take the oldest unfinished job for this process. Returns
+    None when there is none, or when it is running elsewhere (that runner
+    moves on to the later jobs itself).
+    """
+    job = _next_job()
+    if job is None or not _is_claimable(job):
+        return None
+    now = timezone.now()
+    if job.status == 'pending':
+        claimed = RenameJob.objects.filter(pk=job.pk, status='pending').update(status='running', updated_at=now)
+    else:
+        claimed = RenameJob.objects.filter(
+            pk=job.pk, status='running', updated_at__lt=now - STALE_AFTER,
+        ).update(updated_at=now)
+    if not claimed:
+        # Another worker got there first
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def run_pending_jobs(workers=RENAME_WORKERS):
+    """Run unfinished jobs oldest first (renames must apply in order)"""
+    processed = []
+    while True:
+        job = claim_next_job()
+        if job is None:
+            return processed
+        processed.append(run_job(job, workers=workers))
+
+
+def _has_claimable_job():
+    job = _next_job()
+    return job is not None and _is_claimable(job)
+
+
+def _run_in_background():
+    global _runner
+    try:
+        while True:
+            run_pending_jobs()
+            # Checked under the lock so a job enqueued right now is not stranded
+            with _runner_lock:
+                if not _has_claimable_job():
+                    _runner = None
+                    return
+    except Exception as e:
+        print(f"Warning: Rename job runner stopped: {e}")
+        with _runner_lock:
+            _runner = None
+    finally:
+        connections.close_all()
+
+
+def enqueue(kind, old_name, new_name, new_tech_name=''):
+    """
+    Record a rename, apply it to live days immediately and start the
+    background runner for the rest. Returns the RenameJob.
+    """
+    job = RenameJob.objects.create(
+        kind=kind, old_name=old_name, new_name=new_name, new_tech_name=new_tech_name or '',
+    )
+    rename_live_days(job)
+    start_runner()
+    return job
+
+
+def start_runner():
+    """Start the background runner thread unless one is already going"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = threading.Thread(target=_run_in_background, name='rename-jobs', daemon=True)
+            _runner.start()
@@ -0,0 +1,198 @@
+"""
+Multi-day reports (payroll / summary over a date range)
+Day files are loaded in parallel; totals are built from DayRow aggregates.
+"""
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+from .persistence import day_persistence
+
+# Day loading is file I/O + JSON parsing; a small pool keeps the disk busy
+REPORT_LOAD_WORKERS = 4
+
+
+def parse_date_range(date_from, date_to):
+    """Validate ?from=&to= query params; returns (from_str, to_str) or raises ValueError"""
+    if not date_from or not date_to:
+        raise ValueError('from and to are required (YYYY-MM-DD)')
+    try:
+        start = datetime.strptime(date_from, '%Y-%m-%d').date()
+        end = datetime.strptime(date_to, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError('Invalid date format. Expected YYYY-MM-DD')
+    if start > end:
+        raise ValueError('from must be on or before to')
+    return start.isoformat(), end.isoformat()
+
+
+def dates_in_range(date_from, date_to, persistence=day_persistence):
+    """Dates with a day file between date_from and date_to (inclusive), oldest first"""
+    return sorted(d for d in persistence.list_days() if date_from <= d <= date_to)
+
+
+def iter_days(dates, persistence=day_persistence, workers=REPORT_LOAD_WORKERS):
+    """
+    Load days in parallel, yielding (date, DayData or None, error or None)
+    in the order of `dates`. A broken file does not abort the whole report.
+    At most `workers * 2` days are loaded ahead of the consumer, so memory
+    stays bounded however long the range is.
+    """
+    if not dates:
+        return
+
+    def load(day_date):
+        try:
+            return day_date, persistence.load(day_date), None
+        except Exception as e:
+            return day_date, None, str(e)
+
+    dates = iter(dates)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque(pool.submit(load, d) for d in islice(dates, workers * 2))
+        while pending:
+            result = pending.popleft().result()
+            next_date = next(dates, None)
+            if next_date is not None:
+                pending.append(pool.submit(load, next_date))
+            yield result
+
+
+def empty_tech_totals(tech_alias, tech_name=''):
+    return {
+        'tech_alias': tech_alias,
+        'tech_name': tech_name,
+        'total_value_without_penalty': 0,
+        'total_value_with_penalty': 0,
+        'penalty_count': 0,
+        'regular_turns': 0,
+        'bonus_turns': 0,
+        'seating_count': 0,
+        'days_worked': 0,
+    }
+
+
+def day_tech_totals(day_data):
+    """
+    Per-tech totals for one day. Clocked-out rows are included because their
+    seatings were still worked that day.
+    """
+    totals = {}
+    for row in day_data.day_rows:
+        entry = totals.get(row.tech_alias)
+        if entry is None:
+            entry = totals[row.tech_alias] = empty_tech_totals(row.tech_alias, row.tech_name)
+            entry['days_worked'] = 1
+        entry['total_value_without_penalty'] += row.total_value
+        entry['total_value_with_penalty'] += row.total_with_penalty
+        entry['penalty_count'] += row.penalty_count
+        entry['regular_turns'] += row.regular_turns
+        entry['bonus_turns'] += row.bonus_turns
+        entry['seating_count'] += len(row.seatings)
+    return totals
+
+
+def add_totals(into, totals):
+    for key in ('total_value_without_penalty', 'total_value_with_penalty', 'penalty_count',
+                'regular_turns', 'bonus_turns', 'seating_count', 'days_worked'):
+        into[key] += totals[key]
+    if totals['tech_name'] and not into['tech_name']:
+        into['tech_name'] = totals['tech_name']
+
+
+def _materialized_days(date_from, date_to):
+    """Yield (date, {alias: totals}) from day_tech_stats, oldest first"""
+    from .models import DayTechStats
+
+    rows = DayTechStats.objects.filter(date__range=(date_from, date_to)).order_by(
+        'date', 'tech_alias'
+    ).values_list(
+        'date', 'tech_alias', 'tech_name', 'total_value', 'total_value_with_penalty',
+        'penalty_count', 'regular_turns', 'bonus_turns', 'seating_count',
+    )
+    current_date, totals = None, {}
+    for (day, alias, name, value, with_penalty, penalties,
+         regular, bonus, seatings) in rows.iterator():
+        day = day.isoformat()
+        if day != current_date:
+            if current_date is not None:
+                yield current_date, totals
+            current_date, totals = day, {}
+        totals[alias] = {
+            'tech_alias': alias,
+            'tech_name': name,
+            'total_value_without_penalty': value,
+            'total_value_with_penalty': with_penalty,
+            'penalty_count': penalties,
+            'regular_turns': regular,
+            'bonus_turns': bonus,
+            'seating_count': seatings,
+            'days_worked': 1,
+        }
+    if current_date is not None:
+        yield current_date, totals
+
+
+def stream_range_summary(date_from, date_to, catalog=None):
+    """
+    Return an iterator over a JSON document in chunks:
+    {"from", "to", "days": [{"date", "status", "tech_stats"}...], "tech_stats": [...]}
+
+    Closed days come from the day_tech_stats table, read in one query before
+    anything is sent, so the per-day entries and the range totals (summed
+    from those same entries) agree and a database error still becomes a
+    normal error response. Other days, and closed days not yet backfilled,
+    are loaded from their files while streaming, in date order. If streaming
+    fails part way the document is closed with an "error" key instead of
+    "tech_stats", so clients never get a truncated body.
+    """
+    techs = catalog.techs if catalog is not None else {}
+    stored_days = dict(_materialized_days(date_from, date_to))
+    file_dates = [d for d in dates_in_range(date_from, date_to) if d not in stored_days]
+    all_dates = sorted(stored_days.keys() | set(file_dates))
+
+    def named(totals):
+        for alias, entry in totals.items():
+            tech = techs.get(alias)
+            if tech is not None and tech.name:
+                entry['tech_name'] = tech.name
+        return sorted(totals.values(), key=lambda t: t['tech_alias'])
+
+    def add_day(grand_totals, totals):
+        for alias, entry in totals.items():
+            if alias not in grand_totals:
+                grand_totals[alias] = empty_tech_totals(alias)
+            add_totals(grand_totals[alias], entry)
+
+    def chunks():
+        grand_totals = {}
+        file_days = iter_days(file_dates)
+        yield '{"from": %s, "to": %s, "days": [' % (json.dumps(date_from), json.dumps(date_to))
+        try:
+            for index, day_date in enumerate(all_dates):
+                separator = ', ' if index else ''
+                if day_date in stored_days:
+                    totals = stored_days.pop(day_date)
+                    add_day(grand_totals, totals)
+                    day_entry = {'date': day_date, 'status': 'closed', 'tech_stats': named(totals)}
+                    yield separator + json.dumps(day_entry)
+                    continue
+
+                _, day_data, error = next(file_days)
+                if error is not None:
+                    yield separator + json.dumps({'date': day_date, 'error': error})
+                    continue
+                totals = day_tech_totals(day_data)
+                add_day(grand_totals, totals)
+                day_entry = {'date': day_data.date, 'status': day_data.status, 'tech_stats': named(totals)}
+                yield separator + json.dumps(day_entry)
+        except Exception as e:
+            print(f"Warning: Range summary {date_from}..{date_to} stopped: {e}")
+            yield '], "error": %s}' % json.dumps(str(e))
+            return
+
+        yield '], "tech_stats": %s}' % json.dumps(named(grand_totals))
+
+    return chunks()
@@ -0,0 +1,191 @@
+"""
+Weekly / monthly rollups of closed days (period_rollup table in index.db)
+
+Each closed day contributes its per-tech and per-service totals to one week
+bucket and one month bucket. history.py subtracts a day's previous
+contribution (read back from day_tech_stats / seating_index) before adding
+the new one, so buckets stay exact when a day is re-closed or unfrozen.
+"""
+from datetime import date as date_cls, timedelta
+
+from django.db.models import F
+
+from backend.db import write_atomic
+
+PERIODS = ('week', 'month')
+DIMENSIONS = ('tech', 'service')
+FIELDS = (
+    'total_value', 'total_value_with_penalty', 'penalty_count',
+    'regular_turns', 'bonus_turns', 'seating_count', 'day_count',
+)
+
+
+def period_start(day, period):
+    """First day of the week (Monday) or month containing `day`"""
+    if isinstance(day, str):
+        day = date_cls.fromisoformat(day)
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def _empty():
+    return dict.fromkeys(FIELDS, 0)
+
+
+def tech_contributions(tech_rows):
+    """
+    {('tech', alias): totals} from (alias, total_value, total_value_with_penalty,
+    penalty_count, regular_turns, bonus_turns, seating_count) tuples of one day
+    """
+    contributions = {}
+    for alias, value, with_penalty, penalties, regular, bonus, seatings in tech_rows:
+        totals = contributions.setdefault(('tech', alias), _empty())
+        totals['total_value'] += value
+        totals['total_value_with_penalty'] += with_penalty
+        totals['penalty_count'] += penalties
+        totals['regular_turns'] += regular
+        totals['bonus_turns'] += bonus
+        totals['seating_count'] += seatings
+        totals['day_count'] = 1
+    return contributions
+
+
+def service_contributions(seatings):
+    """{('service', name): totals} from (service, value, has_value_penalty, is_bonus) tuples of one day"""
+    contributions = {}
+    for service, value, has_penalty, is_bonus in seatings:
+        if not service:
+            continue
+        totals = contributions.setdefault(('service', service), _empty())
+        totals['total_value'] += value
+        # Same rule as Seating.value_with_penalty
+        totals['total_value_with_penalty'] += max(0, value - 3) if has_penalty else value
+        totals['penalty_count'] += 1 if has_penalty else 0
+        totals['bonus_turns' if is_bonus else 'regular_turns'] += 1
+        totals['seating_count'] += 1
+        totals['day_count'] = 1
+    return contributions
+
+
+def day_contributions(day_data):
+    """Contributions of a DayData to its buckets"""
+    from .reports import day_tech_totals
+
+    tech_rows = (
+        (alias, t['total_value_without_penalty'], t['total_value_with_penalty'], t['penalty_count'],
+         t['regular_turns'], t['bonus_turns'], t['seating_count'])
+        for alias, t in day_tech_totals(day_data).items()
+    )
+    contributions = tech_contributions(tech_rows)
+    contributions.update(service_contributions(
+        (seating.service, seating.value, seating.has_value_penalty, seating.is_bonus)
+        for row in day_data.day_rows for seating in row.seatings
+    ))
+    return contributions
+
+
+def stored_contributions(day_date):
+    """Contributions of a day as currently recorded in day_tech_stats / seating_index"""
+    from .models import DayTechStats, SeatingIndexEntry
+
+    contributions = tech_contributions(
+        DayTechStats.objects.filter(date=day_date).values_list(
+            'tech_alias', 'total_value', 'total_value_with_penalty', 'penalty_count',
+            'regular_turns', 'bonus_turns', 'seating_count',
+        )
+    )
+    contributions.update(service_contributions(
+        SeatingIndexEntry.objects.filter(date=day_date).values_list(
+            'service_name', 'value', 'has_value_penalty', 'is_bonus'
+        )
+    ))
+    return contributions
+
+
+def apply(day_date, contributions, sign=1):
+    """Add (sign=1) or subtract (sign=-1) one day's contributions to its buckets"""
+    from .models import PeriodRollup
+
+    with write_atomic('index'):
+        for period in PERIODS:
+            start = period_start(day_date, period)
+            for (dimension, key), totals in contributions.items():
+                bucket = PeriodRollup.objects.filter(
+                    period=period, period_start=start, dimension=dimension, key=key
+                )
+                updated = bucket.update(**{
+                    field: F(field) + sign * totals[field] for field in FIELDS
+                })
+                if not updated and sign > 0:
+                    PeriodRollup.objects.create(
+                        period=period, period_start=start, dimension=dimension, key=key, **totals
+                    )
+                elif sign < 0:
+                    # A bucket with no days left would only clutter trend results
+                    bucket.filter(day_count__lte=0).delete()
+
+
+def bucket_totals(days):
+    """
+    Expected bucket contents from an iterable of (date, contributions):
+    {(period, period_start, dimension, key): totals}
+    """
+    buckets = {}
+    for day_date, contributions in days:
+        for period in PERIODS:
+            start = period_start(day_date, period)
+            for (dimension, key), totals in contributions.items():
+                bucket = buckets.setdefault((period, start, dimension, key), _empty())
+                for field in FIELDS:
+                    bucket[field] += totals[field]
+    return buckets
+
+
+def stored_buckets():
+    """Current contents of period_rollup in the shape returned by bucket_totals"""
+    from .models import PeriodRollup
+
+    return {
+        (row['period'], row['period_start'], row['dimension'], row['key']):
+            {field: row[field] for field in FIELDS}
+        for row in PeriodRollup.objects.values('period', 'period_start', 'dimension', 'key', *FIELDS)
+    }
+
+
+def replace_all(buckets):
+    """Replace the whole rollup table with `buckets` (see bucket_totals)"""
+    from .models import PeriodRollup
+
+    with write_atomic('index'):
+        PeriodRollup.objects.all().delete()
+        PeriodRollup.objects.bulk_create([
+            PeriodRollup(period=period, period_start=start, dimension=dimension, key=key, **totals)
+            for (period, start, dimension, key), totals in buckets.items()
+        ], batch_size=500)
+
+
+def trend(dimension, key, period, date_from, date_to):
+    """
+    Buckets for one tech or service whose period starts within the range,
+    oldest first, each with the change in total_value_with_penalty from the
+    bucket before (None for the first).
+    """
+    from .models import PeriodRollup
+
+    rows = PeriodRollup.objects.filter(
+        dimension=dimension, key=key, period=period,
+        period_start__range=(period_start(date_from, period), date_to),
+    ).order_by('period_start').values('period_start', *FIELDS)
+
+    buckets = []
+    previous = None
+    for row in rows:
+        row['period_start'] = row['period_start'].isoformat()
+        row['total_value_with_penalty_change'] = (
+            None if previous is None
+            else row['total_value_with_penalty'] - previous['total_value_with_penalty']
+        )
+        buckets.append(row)
+        previous = row
+    return buckets
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import DayMetadata, Seating, DayRow, DayData
+from .models import DayMetadata, RenameJob, Seating, DayRow, DayData
 
 
 class DayMetadataSerializer(serializers.ModelSerializer):
@@ -77,11 +77,13 @@ class DayDataSerializer(serializers.Serializer):
         """Create a DayData instance"""
         day_rows_data = validated_data.pop('day_rows', [])
         day = DayData(**validated_data)
-        day.day_rows = []
+        day_rows = []
         for row_data in day_rows_data:
             serializer = DayRowSerializer(data=row_data)
             if serializer.is_valid():
-                day.day_rows.append(serializer.save())
+                day_rows.append(serializer.save())
+        # Assign the full list so DayData resets its lookup indexes
+        day.day_rows = day_rows
         return day
 
     def update(self, instance, validated_data):
@@ -90,9 +92,20 @@ class DayDataSerializer(serializers.Serializer):
         for key, value in validated_data.items():
             setattr(instance, key, value)
         if day_rows_data is not None:
-            instance.day_rows = []
+            day_rows = []
             for row_data in day_rows_data:
                 serializer = DayRowSerializer(data=row_data)
                 if serializer.is_valid():
-                    instance.day_rows.append(serializer.save())
+                    day_rows.append(serializer.save())
+            instance.day_rows = day_rows
         return instance
+
+
+class RenameJobSerializer(serializers.ModelSerializer):
+    """Serializer for RenameJob progress"""
+    class Meta:
+        model = RenameJob
+        fields = [
+            'id', 'kind', 'old_name', 'new_name', 'status', 'total_days', 'processed_days',
+            'changed_days', 'cursor', 'error', 'created_at', 'updated_at', 'finished_at',
+        ]
@@ -0,0 +1,175 @@
+"""
+Day-end summary (GET /api/days/{date}/summary/) with a per-worker cache
+Entries are keyed by the day file's version (mtime + size) and the catalog
+generation, so any write to the day or the catalog makes them stale. Seating
+edits patch the cached entry in place instead of dropping it.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+# Days whose summary is kept; only today and a few recent days are edited
+SUMMARY_CACHE_SIZE = 16
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+class _Entry:
+    """Cached summary plus what is needed to patch it"""
+    __slots__ = ('version', 'generation', 'payload', 'positions', 'open_techs')
+
+    def __init__(self, version, generation, payload, positions, open_techs):
+        self.version = version
+        self.generation = generation
+        self.payload = payload
+        # tech_alias -> index into payload['tech_stats'] for clocked-in techs
+        self.positions = positions
+        self.open_techs = open_techs
+
+
+def day_version(file_path):
+    """Cheap version stamp of a day file; raises FileNotFoundError if missing"""
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _tech_stats(row):
+    # Totals are kept on the row (penalty = -3 value per flagged seating)
+    return {
+        'tech_alias': row.tech_alias,
+        'tech_name': row.tech_name,
+        'row_number': row.row_number,
+        'total_value_without_penalty': row.total_value,
+        'total_value_with_penalty': row.total_with_penalty,
+        'penalty_count': row.penalty_count,
+        'regular_turns': row.regular_turns,
+        'bonus_turns': row.bonus_turns,
+        'is_absent': False,
+    }
+
+
+def _build(day_data, catalog, version):
+    # Build a map of clocked-in techs from day_rows, skipping clocked-out techs
+    clocked_in_techs = {}
+    for row in day_data.day_rows:
+        if not getattr(row, 'is_active', True):
+            continue
+        clocked_in_techs[row.tech_alias] = row
+
+    tech_stats = []
+    positions = {}
+    open_techs = set()
+    # Includes all technicians (absent ones with zeros for easier data entry)
+    for tech in catalog.techs.values():
+        row = clocked_in_techs.get(tech.alias)
+        if row is not None:
+            if row.open_count:
+                open_techs.add(tech.alias)
+            positions[tech.alias] = len(tech_stats)
+            tech_stats.append(_tech_stats(row))
+        else:
+            tech_stats.append({
+                'tech_alias': tech.alias,
+                'tech_name': tech.name,
+                'row_number': None,
+                'total_value_without_penalty': 0,
+                'total_value_with_penalty': 0,
+                'penalty_count': 0,
+                'regular_turns': 0,
+                'bonus_turns': 0,
+                'is_absent': True,
+            })
+
+    payload = {
+        'tech_stats': tech_stats,
+        'all_seatings_closed': not open_techs,
+        'new_day_checklist_complete': all(
+            item.get('completed', False) for item in day_data.new_day_checklist
+        ),
+        'end_day_checklist_complete': all(
+            item.get('completed', False) for item in day_data.end_day_checklist
+        ),
+    }
+    return _Entry(version, catalog.generation, payload, positions, open_techs)
+
+
+def _store(day_date, entry):
+    with _lock:
+        _cache[day_date] = entry
+        _cache.move_to_end(day_date)
+        while len(_cache) > SUMMARY_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def get_summary(day_date, persistence, catalog):
+    """
+    Return the summary payload for a day, loading and computing it only when
+    the day file or the catalog changed since it was last cached.
+    Raises FileNotFoundError if the day does not exist.
+    """
+    version = day_version(persistence.get_file_path(day_date))
+    entry = _cache.get(day_date)
+    if entry is not None and entry.version == version and entry.generation == catalog.generation:
+        return entry.payload
+
+    day_data = persistence.load(day_date)
+    entry = _build(day_data, catalog, version)
+    _store(day_date, entry)
+    return entry.payload
+
+
+def seating_updated(day_data, row, file_path, previous_version, catalog):
+    """
+    Patch the cached summary after a seating in `row` changed and the day was
+    saved to `file_path`. Only that tech's totals can have moved, so the entry
+    is updated in place and re-stamped with the new file version. If the entry
+    was already stale it is rebuilt from the in-memory day instead.
+    `previous_version` must be the version of the file `day_data` was loaded
+    from, read while holding the day lock.
+    """
+    try:
+        version = day_version(file_path)
+    except OSError:
+        invalidate(day_data.date)
+        return
+
+    with _lock:
+        entry = _cache.get(day_data.date)
+        if (
+            entry is not None
+            and entry.version == previous_version
+            and entry.generation == catalog.generation
+        ):
+            position = entry.positions.get(row.tech_alias)
+            stats = entry.payload['tech_stats']
+            if position is not None and stats[position]['row_number'] == row.row_number:
+                # Replace rather than mutate: responses may still hold the old dicts
+                tech_stats = list(stats)
+                tech_stats[position] = _tech_stats(row)
+                if row.open_count:
+                    entry.open_techs.add(row.tech_alias)
+                else:
+                    entry.open_techs.discard(row.tech_alias)
+                entry.payload = dict(
+                    entry.payload,
+                    tech_stats=tech_stats,
+                    all_seatings_closed=not entry.open_techs,
+                )
+                entry.version = version
+                return
+            if not getattr(row, 'is_active', True):
+                # Clocked-out rows are not part of the summary
+                entry.version = version
+                return
+
+    _store(day_data.date, _build(day_data, catalog, version))
+
+
+def invalidate(day_date=None):
+    """Drop the cached summary for one day, or for all days"""
+    with _lock:
+        if day_date is None:
+            _cache.clear()
+        else:
+            _cache.pop(day_date, None)
@@ -1,3 +1,479 @@
-from django.test import TestCase
+import json
+import os
+import random
+import tempfile
+from io import StringIO
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from services import catalog
+from services.models import Service
+from technicians.models import Technician
+
+from . import renames, summary as day_summary
+from .config import ConfigError, ConfigStore
+from .demand import day_histograms, seating_hour
+from .models import DayData, DayRow, RenameJob, Seating
+from .persistence import day_persistence
+
+
+class DayFilesMixin:
+    """Point day_persistence at a scratch directory for each test"""
+    databases = {'default', 'index'}
+
+    def setUp(self):
+        super().setUp()
+        data_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(data_dir.cleanup)
+        patcher = mock.patch.object(day_persistence, 'data_dir', Path(data_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def save_day(self, day_date, status='closed', rows=()):
+        """rows: (tech_alias, [(service, value), ...]) pairs"""
+        day = DayData(date=day_date, status=status, day_rows=[
+            DayRow(row_number=number, tech_alias=alias, tech_name=alias.title(), seatings=[
+                Seating(service=service, time=f'{day_date}T10:00:00-05:00', value=value)
+                for service, value in seatings
+            ])
+            for number, (alias, seatings) in enumerate(rows, start=1)
+        ])
+        if status == 'closed':
+            day.closed_at = timezone.now().isoformat()
+        day_persistence.save(day)
+        return day
+
+
+class SeatingHourTests(SimpleTestCase):
+    """Demand buckets use the hour the tablet recorded, not the server's zone"""
+
+    @override_settings(TIME_ZONE='UTC')
+    def test_offset_time_keeps_its_wall_clock_hour(self):
+        seating = Seating(service='Manicure', time='2026-03-02T09:15:00-05:00')
+        self.assertEqual(seating_hour(seating), 9)
+
+    def test_naive_time(self):
+        self.assertEqual(seating_hour(Seating(service='Manicure', time='2026-03-02T17:40:00')), 17)
+
+    def test_unreadable_time(self):
+        self.assertIsNone(seating_hour(Seating(service='Manicure', time='not a time')))
+
+    def test_day_histogram_buckets(self):
+        row = DayRow(tech_alias='amy', seatings=[
+            Seating(service='Manicure', time='2026-03-02T09:15:00-05:00'),
+            Seating(service='Manicure', time='2026-03-02T09:50:00-05:00'),
+            Seating(service='Pedicure', time='2026-03-02T23:30:00-05:00'),
+        ])
+        day = DayData(date='2026-03-02', day_rows=[row])
+        histograms = day_histograms(day)
+        self.assertEqual(histograms['Manicure'][9], 2)
+        self.assertEqual(sum(histograms['Manicure']), 2)
+        self.assertEqual(histograms['Pedicure'][23], 1)
+
+
+@override_settings(DAY_AGGREGATE_CHECKS=True)
+class DayRowAggregateTests(SimpleTestCase):
+    """Running row aggregates match a full recompute after any sequence of edits"""
+
+    AGGREGATES = ('open_count', 'earliest_open_start', 'total_value', 'total_with_penalty', 'penalty_count')
+
+    def assert_matches_recompute(self, row):
+        actual = {key: getattr(row, key) for key in self.AGGREGATES}
+        self.assertEqual(actual, row.compute_aggregates())
+        # A row rebuilt from its saved form starts from a full recompute too
+        reloaded = DayRow.from_dict(row.to_dict())
+        self.assertEqual(actual, {key: getattr(reloaded, key) for key in self.AGGREGATES})
+
+    def test_random_edits(self):
+        rng = random.Random(28)
+        row = DayRow(tech_alias='amy')
+        for step in range(500):
+            action = rng.choice(['add', 'add', 'value', 'penalty', 'time', 'delete'])
+            seatings = row.seatings
+            if action == 'add' or not seatings:
+                row.add_seating(Seating(
+                    service='Gel',
+                    time=f'2026-03-02T{rng.randrange(8, 20):02d}:{rng.randrange(60):02d}:00-05:00',
+                    value=rng.choice([0, 0, 5, 40]),
+                    has_value_penalty=rng.random() < 0.2,
+                ))
+            else:
+                seating = rng.choice(seatings)
+                if action == 'value':
+                    # 0 reopens the seating
+                    seating.value = rng.choice([0, 2, 25, 60])
+                elif action == 'penalty':
+                    seating.has_value_penalty = not seating.has_value_penalty
+                elif action == 'time':
+                    seating.time = f'2026-03-02T{rng.randrange(6, 22):02d}:{rng.randrange(60):02d}:00-05:00'
+                else:
+                    row.remove_seating(seating.id)
+            with self.subTest(step=step, action=action):
+                self.assert_matches_recompute(row)
+
+
+
+class ReclassifyTurnsTests(SimpleTestCase):
+    """Incremental turn classification matches classifying the whole row again"""
+    BONUS_SERVICES = {'Nail art', 'Gems'}
+    SERVICES = ['Gel', 'Wax', 'Nail art', 'Gems']
+
+    def is_bonus(self, service):
+        return service in self.BONUS_SERVICES
+
+    def full_classification(self, row):
+        """Requested seatings alternate regular/bonus; walk-ins follow their service"""
+        flags = []
+        next_requested_bonus = False
+        for seating in row.seatings:
+            if seating.is_requested:
+                flags.append(next_requested_bonus)
+                next_requested_bonus = not next_requested_bonus
+            else:
+                flags.append(self.is_bonus(seating.service))
+        return flags
+
+    def assert_classified(self, row):
+        expected = self.full_classification(row)
+        self.assertEqual([s.is_bonus for s in row.seatings], expected)
+        self.assertEqual((row.regular_turns, row.bonus_turns), (expected.count(False), expected.count(True)))
+
+    def new_seating(self, rng):
+        return Seating(service=rng.choice(self.SERVICES), is_requested=rng.random() < 0.5, value=10)
+
+    def test_random_edits(self):
+        rng = random.Random(29)
+        for trial in range(200):
+            row = DayRow(tech_alias='amy')
+            for _ in range(rng.randrange(1, 8)):
+                # Appending, as create_seating does
+                row.add_seating(self.new_seating(rng))
+                row.reclassify_turns(len(row.seatings) - 1, self.is_bonus)
+            for step in range(10):
+                seatings = row.seatings
+                position = rng.randrange(len(seatings)) if seatings else 0
+                action = rng.choice(['insert', 'delete', 'service', 'requested']) if seatings else 'insert'
+                if action == 'insert':
+                    # A seating landing mid-row, counted as regular until classified
+                    seating = self.new_seating(rng)
+                    row.add_seating(seating)
+                    seatings.remove(seating)
+                    seatings.insert(position, seating)
+                    row.reclassify_turns(position, self.is_bonus)
+                elif action == 'delete':
+                    row.remove_seating(seatings[position].id)
+                    row.reclassify_turns(position)
+                elif action == 'service':
+                    seatings[position].service = rng.choice(self.SERVICES)
+                    row.reclassify_turns(position, self.is_bonus)
+                else:
+                    seatings[position].is_requested = not seatings[position].is_requested
+                    row.reclassify_turns(position, self.is_bonus)
+                with self.subTest(trial=trial, step=step, action=action, position=position):
+                    self.assert_classified(row)
+
+
+class RenameInDataTests(SimpleTestCase):
+
+    def day(self):
+        return {'day_rows': [
+            {'tech_alias': 'amy', 'tech_name': 'Amy', 'seatings': [{'service': 'Gel'}, {'service': 'Wax'}]},
+            {'tech_alias': 'bo', 'tech_name': 'Bo', 'seatings': [{'service': 'Gel'}]},
+        ]}
+
+    def test_tech_rename_sets_alias_and_name(self):
+        data = self.day()
+        self.assertTrue(renames.rename_in_data(data, 'tech', 'amy', 'ann', 'Ann'))
+        self.assertEqual([(r['tech_alias'], r['tech_name']) for r in data['day_rows']],
+                         [('ann', 'Ann'), ('bo', 'Bo')])
+
+    def test_tech_rename_without_name_keeps_it(self):
+        data = self.day()
+        renames.rename_in_data(data, 'tech', 'amy', 'ann')
+        self.assertEqual(data['day_rows'][0]['tech_name'], 'Amy')
+
+    def test_service_rename(self):
+        data = self.day()
+        self.assertTrue(renames.rename_in_data(data, 'service', 'Gel', 'Gel polish'))
+        services = [s['service'] for row in data['day_rows'] for s in row['seatings']]
+        self.assertEqual(services, ['Gel polish', 'Wax', 'Gel polish'])
+
+    def test_no_match(self):
+        data = self.day()
+        self.assertFalse(renames.rename_in_data(data, 'tech', 'cy', 'cyd'))
+        self.assertEqual(data, self.day())
+
+
+class ClaimJobTests(TestCase):
+    """Only one runner gets a job, and only the oldest unfinished one"""
+    databases = {'default', 'index'}
+
+    def job(self, **fields):
+        return RenameJob.objects.create(kind='tech', old_name='amy', new_name='ann', **fields)
+
+    def test_claims_pending_job_once(self):
+        job = self.job()
+        claimed = renames.claim_next_job()
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.status, 'running')
+        self.assertIsNone(renames.claim_next_job())
+
+    def test_lost_race_is_not_claimed(self):
+        job = self.job()
+        seen = RenameJob.objects.get(pk=job.pk)
+        # Another worker claims it between our read and our UPDATE
+        RenameJob.objects.filter(pk=job.pk).update(status='running')
+        with mock.patch.object(renames, '_next_job', return_value=seen):
+            self.assertIsNone(renames.claim_next_job())
+
+    def test_does_not_skip_ahead_of_running_job(self):
+        self.job(status='running')
+        self.job()
+        self.assertIsNone(renames.claim_next_job())
+
+    def test_stale_running_job_is_reclaimed(self):
+        job = self.job(status='running', cursor='2026-01-05')
+        RenameJob.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - renames.STALE_AFTER - timedelta(minutes=1)
+        )
+        claimed = renames.claim_next_job()
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.cursor, '2026-01-05')
+        self.assertGreater(claimed.updated_at, timezone.now() - timedelta(minutes=1))
+        self.assertIsNone(renames.claim_next_job())
+
+
+@mock.patch.object(renames, 'start_runner')
+class ResumeJobTests(TestCase):
+    databases = {'default', 'index'}
+
+    def test_failed_job_starts_over(self, start_runner):
+        job = RenameJob.objects.create(
+            kind='tech', old_name='amy', new_name='ann', status='failed', cursor='2026-01-05', changed_days=3,
+        )
+        response = self.client.post(f'/api/rename-jobs/{job.pk}/resume/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['status'], response.json()['cursor']), ('pending', ''))
+        start_runner.assert_called_once()
+
+    def test_finished_job_is_refused(self, start_runner):
+        job = RenameJob.objects.create(kind='tech', old_name='amy', new_name='ann', status='done')
+        self.assertEqual(self.client.post(f'/api/rename-jobs/{job.pk}/resume/').status_code, 400)
+        start_runner.assert_not_called()
+
+    def test_resume_all(self, start_runner):
+        RenameJob.objects.create(kind='tech', old_name='amy', new_name='ann', status='running')
+        RenameJob.objects.create(kind='tech', old_name='bo', new_name='bob', status='done')
+        response = self.client.post('/api/rename-jobs/resume/')
+        self.assertEqual([job['old_name'] for job in response.json()], ['amy'])
+        start_runner.assert_called_once()
+
+
+@mock.patch.object(renames, 'start_runner')
+class RenameLiveDaysTests(DayFilesMixin, TestCase):
+    """Live days are renamed at once and left alone by the background pass"""
+
+    def aliases(self, day_date):
+        return [row.tech_alias for row in day_persistence.load(day_date).day_rows]
+
+    def test_background_pass_skips_live_and_later_days(self, start_runner):
+        self.save_day('2026-03-01', rows=[('amy', [('Gel', 20)])])
+        self.save_day('2026-03-02', status='open', rows=[('amy', [('Gel', 0)])])
+
+        job = renames.enqueue('tech', 'amy', 'ann', 'Ann')
+        self.assertEqual(self.aliases('2026-03-02'), ['ann'])
+        self.assertEqual(self.aliases('2026-03-01'), ['amy'])
+        self.assertEqual(job.live_days, ['2026-03-02'])
+
+        # A new tech takes the old alias before the background pass runs
+        live = day_persistence.load('2026-03-02')
+        live.day_rows.append(DayRow(row_number=2, tech_alias='amy', tech_name='New Amy'))
+        day_persistence.save(live)
+        self.save_day('2026-03-03', status='open', rows=[('amy', [('Wax', 0)])])
+
+        job = renames.run_job(renames.claim_next_job(), workers=1)
+        self.assertEqual(job.status, 'done', job.error)
+        self.assertEqual(self.aliases('2026-03-01'), ['ann'])
+        self.assertEqual(self.aliases('2026-03-02'), ['ann', 'amy'])
+        self.assertEqual(self.aliases('2026-03-03'), ['amy'])
+        self.assertEqual((job.total_days, job.changed_days), (1, 1))
+
+
+class SummaryPatchTests(DayFilesMixin, TestCase):
+    """Seating edits patch the cached day summary to what a rebuild would give"""
+    day = '2026-03-02'
+
+    def setUp(self):
+        super().setUp()
+        catalog.invalidate()
+        day_summary.invalidate()
+        self.addCleanup(day_summary.invalidate)
+        for alias in ('amy', 'bo', 'cy'):
+            Technician.objects.create(alias=alias, name=alias.title())
+        self.save_day(self.day, status='open', rows=[
+            ('amy', [('Gel', 0), ('Gel', 25)]),
+            ('bo', [('Wax', 0)]),
+        ])
+        self.seating_id = day_persistence.load(self.day).day_rows[0].seatings[0].id
+
+    def get_summary(self):
+        response = self.client.get(f'/api/days/{self.day}/summary/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def edit_value(self, value):
+        response = self.client.put(
+            f'/api/days/{self.day}/seatings/{self.seating_id}/update/',
+            {'value': value, 'has_value_penalty': True}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_patched_summary_matches_rebuild(self):
+        self.get_summary()
+        self.edit_value(40)
+        with mock.patch.object(day_persistence, 'load', wraps=day_persistence.load) as load:
+            patched = self.get_summary()
+        # Served from the patched entry, not rebuilt
+        load.assert_not_called()
+        day_summary.invalidate()
+        self.assertEqual(patched, self.get_summary())
+        self.assertEqual(patched['tech_stats'][0]['total_value_with_penalty'], 62)
+        self.assertFalse(patched['all_seatings_closed'])
+
+    def test_failed_patch_keeps_the_edit_and_drops_the_entry(self):
+        self.get_summary()
+        with mock.patch.object(day_summary, 'seating_updated', side_effect=RuntimeError('boom')):
+            self.edit_value(40)
+        self.assertEqual(day_persistence.load(self.day).day_rows[0].seatings[0].value, 40)
+        self.assertNotIn(self.day, day_summary._cache)
+        self.assertEqual(self.get_summary()['tech_stats'][0]['total_value_with_penalty'], 62)
+
+
+@mock.patch.object(renames, 'start_runner')
+class RollupMaintenanceTests(DayFilesMixin, TestCase):
+    """Closing, renaming and deleting days keeps period_rollup equal to the day files"""
+
+    def setUp(self):
+        super().setUp()
+        catalog.invalidate()
+        for alias in ('amy', 'bo'):
+            Technician.objects.create(alias=alias, name=alias.title())
+        for name in ('Gel', 'Wax'):
+            Service.objects.create(name=name, time_needed=30)
+        # Two days in the week of Monday 2026-03-02, one in the next week
+        days = {
+            '2026-03-02': [('amy', [('Gel', 20), ('Wax', 30)]), ('bo', [('Gel', 15)])],
+            '2026-03-04': [('amy', [('Gel', 40)])],
+            '2026-03-09': [('amy', [('Wax', 10)]), ('bo', [('Wax', 25)])],
+        }
+        for day_date, rows in days.items():
+            self.save_day(day_date, status='open', rows=rows)
+            response = self.client.post(f'/api/days/{day_date}/close-day/')
+            self.assertEqual(response.status_code, 200)
+
+    def trend(self, period='week', **key):
+        params = {'period': period, 'from': '2026-03-01', 'to': '2026-03-31', **key}
+        response = self.client.get('/api/reports/trends/', params)
+        self.assertEqual(response.status_code, 200)
+        return [
+            (b['period_start'], b['total_value'], b['day_count'], b['total_value_with_penalty_change'])
+            for b in response.json()['buckets']
+        ]
+
+    def assert_rollups_match_files(self):
+        out = StringIO()
+        call_command('check_rollups', workers=1, stdout=out)
+        self.assertIn('match the day files', out.getvalue())
+
+    def test_close_rename_delete(self, start_runner):
+        self.assertEqual(self.trend(tech_alias='amy'), [
+            ('2026-03-02', 90, 2, None),
+            ('2026-03-09', 10, 1, -80),
+        ])
+        self.assertEqual(self.trend(period='month', service='Gel'), [('2026-03-01', 75, 2, None)])
+        self.assert_rollups_match_files()
+
+        response = self.client.post('/api/techs/amy/rename/', {'new_alias': 'ann'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        jobs = renames.run_pending_jobs(workers=1)
+        self.assertEqual([job.status for job in jobs], ['done'])
+        self.assertEqual(self.trend(tech_alias='amy'), [])
+        self.assertEqual(self.trend(tech_alias='ann'), [
+            ('2026-03-02', 90, 2, None),
+            ('2026-03-09', 10, 1, -80),
+        ])
+        self.assert_rollups_match_files()
+
+        response = self.client.post('/api/days/2026-03-04/secure-delete/', {'confirmation': 'DELETE'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.trend(tech_alias='ann'), [
+            ('2026-03-02', 50, 1, None),
+            ('2026-03-09', 10, 1, -40),
+        ])
+        self.assertEqual(self.trend(period='month', service='Gel'), [('2026-03-01', 35, 1, None)])
+        self.assert_rollups_match_files()
+
+
+class ConfigStoreTests(SimpleTestCase):
+    """config.json is validated, re-read when it changes and never half-written"""
+
+    def setUp(self):
+        data_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(data_dir.cleanup)
+        self.path = Path(data_dir.name) / 'config.json'
+        self.write_file({'new_day_checklist': ['Open till'], 'theme': 'dark'})
+        self.store = ConfigStore(self.path)
+
+    def write_file(self, config):
+        self.path.write_text(json.dumps(config), encoding='utf-8')
+
+    def read_file(self):
+        return json.loads(self.path.read_text(encoding='utf-8'))
+
+    def test_update_merges_and_writes(self):
+        self.store.update({'day_table': {'display_turns': True}})
+        self.assertEqual(self.read_file()['day_table'], {'display_turns': True})
+        self.assertEqual(self.store.get('day_table'), {'display_turns': True})
+        self.store.update({'day_table': {'display_name': False}})
+        self.assertEqual(self.store.get('day_table'), {'display_turns': True, 'display_name': False})
+        self.assertEqual(self.store.get('theme'), 'dark')
+
+    def test_invalid_update_is_rejected(self):
+        before = self.path.read_bytes()
+        for changes in ({'new_day_checklist': 'Open till'},
+                        {'end_day_checklist': ['Cash up', 3]},
+                        {'day_table': {'display_name': 'no'}}):
+            with self.subTest(changes=changes), self.assertRaises(ConfigError):
+                self.store.update(changes)
+        self.assertEqual(self.path.read_bytes(), before)
+        self.assertEqual(self.store.get('new_day_checklist'), ['Open till'])
+
+    def test_reloads_after_external_change(self):
+        self.assertEqual(self.store.get('new_day_checklist'), ['Open till'])
+        self.write_file({'new_day_checklist': ['Open till', 'Count float']})
+        self.assertEqual(self.store.get('new_day_checklist'), ['Open till', 'Count float'])
+
+    def test_invalid_hand_edit_reads_as_default(self):
+        self.write_file({'new_day_checklist': 'Open till', 'recommendation_widgets': ['queue']})
+        with mock.patch('builtins.print'):
+            self.assertEqual(self.store.get('new_day_checklist'), [])
+        self.assertEqual(self.store.get('recommendation_widgets'), ['queue'])
+
+    def test_failed_write_keeps_old_file(self):
+        before = self.path.read_bytes()
+        with mock.patch.object(os, 'replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                self.store.update({'new_day_checklist': ['Open till', 'Count float']})
+        self.assertEqual(self.path.read_bytes(), before)
+        self.assertFalse(self.path.with_suffix('.json.tmp').exists())
+        self.assertEqual(self.store.get('new_day_checklist'), ['Open till'])
+
+    def test_returned_values_are_copies(self):
+        self.store.get('new_day_checklist').append('Changed')
+        self.assertEqual(self.store.get('new_day_checklist'), ['Open till'])
@@ -1,14 +1,35 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from datetime import datetime, date
-import json
-from pathlib import Path
-
-from .models import DayMetadata, DayData
-from .serializers import DayMetadataSerializer, DayDataSerializer
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from datetime import datetime, date, timedelta
+from functools import wraps
+
+from .models import DayMetadata, DayData, RenameJob, SeatingIndexEntry, ServiceDurationStats
+from .serializers import DayMetadataSerializer, DayDataSerializer, RenameJobSerializer
+from .pagination import DayCursorPagination
 from .persistence import day_persistence
 from .recommendation import get_tech_recommendations
+from . import demand, durations, exports, history, presence, reports, rollups
+from . import summary as day_summary
+
+
+def locks_day(view):
+    """
+    Hold the day's file lock for the whole action, so its load -> modify ->
+    save cannot overwrite a change another worker or a rename job made in
+    between. Invalid dates are left for the view to report.
+    """
+    @wraps(view)
+    def wrapper(self, request, pk=None, **kwargs):
+        try:
+            lock = day_persistence.lock(pk)
+        except ValueError:
+            return view(self, request, pk=pk, **kwargs)
+        with lock:
+            return view(self, request, pk=pk, **kwargs)
+    return wrapper
 
 
 class DayViewSet(viewsets.ViewSet):
@@ -20,11 +41,67 @@ class DayViewSet(viewsets.ViewSet):
     def list(self, request):
         """
         GET /api/days/
-        List all days (from metadata)
+        List days (from metadata), newest first, one page at a time
+        Query params (all optional):
+        - status: open | ended | closed | deleted
+        - year, month: restrict to a year, or a month of that year
+        - from, to: YYYY-MM-DD date range (inclusive)
+        - cursor, page_size (default 50, max 500)
+        Returns: { "next": url|null, "previous": url|null, "results": [...] }
         """
+        params = request.query_params
         days = DayMetadata.objects.all()
-        serializer = DayMetadataSerializer(days, many=True)
-        return Response(serializer.data)
+        try:
+            if params.get('status'):
+                days = days.filter(status=params['status'])
+            if params.get('year'):
+                days = days.filter(date__range=self._month_range(params['year'], params.get('month')))
+            if params.get('from'):
+                days = days.filter(date__gte=datetime.strptime(params['from'], '%Y-%m-%d').date())
+            if params.get('to'):
+                days = days.filter(date__lte=datetime.strptime(params['to'], '%Y-%m-%d').date())
+        except ValueError as e:
+            return Response({'error': f'Invalid filter: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = DayCursorPagination()
+        page = paginator.paginate_queryset(days, request, view=self)
+        serializer = DayMetadataSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @staticmethod
+    def _month_range(year, month=None):
+        """(first, last) date of a year, or of one month of it; raises ValueError"""
+        year = int(year)
+        if not month:
+            return date(year, 1, 1), date(year, 12, 31)
+        month = int(month)
+        first = date(year, month, 1)
+        last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+        return first, last
+
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        GET /api/days/calendar/?year=2026&month=3
+        Dates and statuses of every day in a month (one indexed query)
+        Returns: { "year": 2026, "month": 3, "days": [{"date": "2026-03-02", "status": "closed"}] }
+        """
+        try:
+            year = int(request.query_params.get('year', ''))
+            month = int(request.query_params.get('month', ''))
+            first, last = self._month_range(year, month)
+        except ValueError:
+            return Response(
+                {'error': 'year and month are required (e.g. ?year=2026&month=3)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        days = DayMetadata.objects.filter(date__range=(first, last)).order_by('date').values_list('date', 'status')
+        return Response({
+            'year': year,
+            'month': month,
+            'days': [{'date': day.isoformat(), 'status': day_status} for day, day_status in days],
+        })
 
     def retrieve(self, request, pk=None):
         """
@@ -70,53 +147,51 @@ class DayViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Check if day already exists
-        if day_persistence.exists(date_str):
-            return Response(
-                {
-                    'error': f'Day {date_str} already exists',
-                    'warning': 'A file for this date already exists. Please open it instead or choose a different date.'
-                },
-                status=status.HTTP_409_CONFLICT
-            )
+        # Lock the date so two requests cannot both create it
+        with day_persistence.lock(date_str):
+            # Check if day already exists
+            if day_persistence.exists(date_str):
+                return Response(
+                    {
+                        'error': f'Day {date_str} already exists',
+                        'warning': 'A file for this date already exists. Please open it instead or choose a different date.'
+                    },
+                    status=status.HTTP_409_CONFLICT
+                )
         
-        try:
-            # Load checklist templates from config.json
-            # In Docker, backend is at /app, so data is at /app/data
-            config_path = Path('/app/data/config.json')
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            new_day_checklist = [
-                {'text': item, 'completed': False}
-                for item in config.get('new_day_checklist', [])
-            ]
-            end_day_checklist = [
-                {'text': item, 'completed': False}
-                for item in config.get('end_day_checklist', [])
-            ]
-            
-            # Create new DayData
-            day_data = DayData(
-                date=date_str,
-                status='open',
-                day_rows=[],
-                new_day_checklist=new_day_checklist,
-                end_day_checklist=end_day_checklist,
-            )
+            try:
+                # Checklist templates come from config.json (cached, see config.py)
+                from .config import config_store
+                new_day_checklist = [
+                    {'text': item, 'completed': False}
+                    for item in config_store.get('new_day_checklist')
+                ]
+                end_day_checklist = [
+                    {'text': item, 'completed': False}
+                    for item in config_store.get('end_day_checklist')
+                ]
+            
+                # Create new DayData
+                day_data = DayData(
+                    date=date_str,
+                    status='open',
+                    day_rows=[],
+                    new_day_checklist=new_day_checklist,
+                    end_day_checklist=end_day_checklist,
+                )
             
-            # Save to file
-            day_persistence.save(day_data, update_metadata=True)
+                # Save to file
+                day_persistence.save(day_data, update_metadata=True)
             
-            # Return the created day
-            serializer = DayDataSerializer(day_data)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+                # Return the created day
+                serializer = DayDataSerializer(day_data)
+                return Response(serializer.data, status=status.HTTP_201_CREATED)
             
-        except Exception as e:
-            return Response(
-                {'error': f'Failed to create day: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+            except Exception as e:
+                return Response(
+                    {'error': f'Failed to create day: {str(e)}'},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
 
     @action(detail=False, methods=['get'])
     def available_dates(self, request):
@@ -134,6 +209,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['post'], url_path='secure-delete')
+    @locks_day
     def secure_delete(self, request, pk=None):
         """
         POST /api/days/{date}/secure-delete/
@@ -163,6 +239,8 @@ class DayViewSet(viewsets.ViewSet):
             success = day_persistence.delete(pk, secure=True)
             
             if success:
+                day_data.status = 'deleted'
+                self._sync_history(day_data)
                 return Response({
                     'message': f'Day {pk} has been securely deleted',
                     'date': pk
@@ -185,6 +263,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['post'], url_path='rows/clock-in')
+    @locks_day
     def clock_in(self, request, pk=None):
         """
         POST /api/days/{date}/rows/clock-in/
@@ -234,6 +313,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['post'], url_path='rows/clock-out')
+    @locks_day
     def clock_out(self, request, pk=None):
         """
         POST /api/days/{date}/rows/clock-out/
@@ -261,10 +341,9 @@ class DayViewSet(viewsets.ViewSet):
                 )
 
             # Check if tech has open seatings
-            open_seatings = [s for s in row.seatings if s.value == 0]
-            if open_seatings:
+            if row.open_count:
                 return Response(
-                    {'error': f'Cannot clock out: Tech {tech_alias} has {len(open_seatings)} open seating(s)'},
+                    {'error': f'Cannot clock out: Tech {tech_alias} has {row.open_count} open seating(s)'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
@@ -291,6 +370,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['post'], url_path='rows/(?P<row_number>[0-9]+)/toggle-break')
+    @locks_day
     def toggle_break(self, request, pk=None, row_number=None):
         """
         POST /api/days/{date}/rows/{row_number}/toggle-break/
@@ -309,11 +389,7 @@ class DayViewSet(viewsets.ViewSet):
             day_data = day_persistence.load(pk)
             
             # Find the row by number
-            row = None
-            for r in day_data.day_rows:
-                if r.row_number == row_num:
-                    row = r
-                    break
+            row = day_data.get_row_by_number(row_num)
             
             if not row:
                 return Response(
@@ -348,6 +424,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['delete'], url_path='rows/(?P<row_number>[0-9]+)')
+    @locks_day
     def delete_row(self, request, pk=None, row_number=None):
         """
         DELETE /api/days/{date}/rows/{row_number}/
@@ -370,11 +447,7 @@ class DayViewSet(viewsets.ViewSet):
             day_data = day_persistence.load(pk)
             
             # Find the row by number
-            row_to_delete = None
-            for r in day_data.day_rows:
-                if r.row_number == row_num:
-                    row_to_delete = r
-                    break
+            row_to_delete = day_data.get_row_by_number(row_num)
             
             if not row_to_delete:
                 return Response(
@@ -383,19 +456,14 @@ class DayViewSet(viewsets.ViewSet):
                 )
             
             # Validate no open seatings
-            open_seatings = [s for s in row_to_delete.seatings if s.value == 0]
-            if open_seatings:
+            if row_to_delete.open_count:
                 return Response(
-                    {'error': f'Cannot delete row: Tech has {len(open_seatings)} open seating(s)'},
+                    {'error': f'Cannot delete row: Tech has {row_to_delete.open_count} open seating(s)'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Remove the row
-            day_data.day_rows.remove(row_to_delete)
-            
-            # Resequence all row numbers (no gaps)
-            for idx, row in enumerate(day_data.day_rows, start=1):
-                row.row_number = idx
+            # Remove the row and resequence all row numbers (no gaps)
+            day_data.remove_row(row_to_delete)
             
             # Save the updated day
             day_persistence.save(day_data)
@@ -421,6 +489,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['put'], url_path='rows/reorder')
+    @locks_day
     def reorder_rows(self, request, pk=None):
         """
         PUT /api/days/{date}/rows/reorder/
@@ -450,11 +519,7 @@ class DayViewSet(viewsets.ViewSet):
             day_data = day_persistence.load(pk)
             
             # Find the row to move
-            row_to_move = None
-            for r in day_data.day_rows:
-                if r.tech_alias == tech_alias:
-                    row_to_move = r
-                    break
+            row_to_move = day_data.get_row_by_tech(tech_alias)
             
             if not row_to_move:
                 return Response(
@@ -477,15 +542,8 @@ class DayViewSet(viewsets.ViewSet):
                 serializer = DayDataSerializer(day_data)
                 return Response(serializer.data, status=status.HTTP_200_OK)
             
-            # Remove from current position
-            day_data.day_rows.remove(row_to_move)
-            
-            # Insert at new position (convert to 0-based index)
-            day_data.day_rows.insert(new_row_number - 1, row_to_move)
-            
-            # Resequence all row numbers
-            for idx, row in enumerate(day_data.day_rows, start=1):
-                row.row_number = idx
+            # Move to the new position and resequence all row numbers
+            day_data.move_row(row_to_move, new_row_number)
             
             # Save the updated day
             day_persistence.save(day_data)
@@ -511,6 +569,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['post'], url_path='seatings')
+    @locks_day
     def create_seating(self, request, pk=None):
         """
         POST /api/days/{date}/seatings/
@@ -521,8 +580,7 @@ class DayViewSet(viewsets.ViewSet):
             "service": "service_name" 
         }
         """
-        from technicians.models import Technician
-        from services.models import Service, TechSkill
+        from services.catalog import get_catalog
         
         tech_alias = request.data.get('tech_alias')
         is_requested = request.data.get('is_requested', False)
@@ -554,16 +612,16 @@ class DayViewSet(viewsets.ViewSet):
                 )
             
             # Validate service exists
-            try:
-                service = Service.objects.get(name=service_name)
-            except Service.DoesNotExist:
+            catalog = get_catalog()
+            service = catalog.get(service_name)
+            if service is None:
                 return Response(
                     {'error': f'Service {service_name} not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
             
             # Validate tech has skill for service
-            if not TechSkill.objects.filter(tech_alias=tech_alias, service_name=service_name).exists():
+            if not catalog.has_skill(tech_alias, service_name):
                 return Response(
                     {'error': f'Tech {tech_alias} does not have skill for service {service_name}'},
                     status=status.HTTP_400_BAD_REQUEST
@@ -578,12 +636,16 @@ class DayViewSet(viewsets.ViewSet):
                 short_name=service.short_name
             )
 
-            # Add seating to row then recompute turn types for entire row
+            # Add seating to row then classify its turn type (only the new seating can change)
             row.add_seating(new_seating)
-            self._recompute_row_turns(row)
+            row.reclassify_turns(len(row.seatings) - 1, catalog.is_bonus)
 
             # Save the updated day
             day_persistence.save(day_data)
+            try:
+                demand.seating_added(day_data.date, new_seating)
+            except Exception as e:
+                print(f"Warning: Could not update demand histogram: {e}")
             
             # Return the updated day
             serializer = DayDataSerializer(day_data)
@@ -600,60 +662,8 @@ class DayViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def _determine_bonus_turn(self, row, is_requested, service_is_bonus):
-        """
-        Determine if a seating should count as a bonus turn
-        Logic:
-        - If requested: alternates - 1st=regular, 2nd=bonus, 3rd=regular, 4th=bonus, etc.
-        - If not requested: based on service.is_bonus
-        """
-        if is_requested:
-            # Count how many requested seatings this tech already has
-            requested_count = sum(1 for s in row.seatings if s.is_requested)
-            # Alternate: even indices (0,2,4...) = regular, odd indices (1,3,5...) = bonus
-            return requested_count % 2 == 1
-        else:
-            # For walk-ins, use the service's is_bonus flag
-            return service_is_bonus
-
-    def _recompute_row_turns(self, row):
-        """
-        Recompute `is_bonus` flags for all seatings in `row.seatings` and
-        update `regular_turns` / `bonus_turns` accordingly.
-
-        Rules:
-        - Requested seatings alternate: 1st requested = regular, 2nd = bonus, etc.
-        - Walk-ins use their service.is_bonus flag.
-        """
-        from services.models import Service
-
-        requested_seen = 0
-        regular_count = 0
-        bonus_count = 0
-
-        for idx, seating in enumerate(row.seatings):
-            if seating.is_requested:
-                # Alternate requested seatings: first = regular (False), second = bonus (True)
-                is_bonus = (requested_seen % 2 == 1)
-                seating.is_bonus = bool(is_bonus)
-                requested_seen += 1
-            else:
-                # Walk-ins follow service.is_bonus
-                try:
-                    svc = Service.objects.get(name=seating.service)
-                    seating.is_bonus = bool(svc.is_bonus)
-                except Service.DoesNotExist:
-                    seating.is_bonus = False
-
-            if seating.is_bonus:
-                bonus_count += 1
-            else:
-                regular_count += 1
-
-        row.regular_turns = regular_count
-        row.bonus_turns = bonus_count
-
     @action(detail=True, methods=['put'], url_path='seatings/(?P<seating_id>[^/.]+)/update')
+    @locks_day
     def update_seating(self, request, pk=None, seating_id=None):
         """
         PUT /api/days/{date}/seatings/{seating_id}/
@@ -669,19 +679,14 @@ class DayViewSet(viewsets.ViewSet):
         try:
             # Load day data
             day_data = day_persistence.load(pk)
+
+            # Version of the file just loaded, so the cached summary can be
+            # patched; read under the day lock, so no other save lands between
+            file_path = day_persistence.get_file_path(pk)
+            previous_version = day_summary.day_version(file_path)
             
             # Find the seating
-            target_row = None
-            target_seating = None
-            
-            for row in day_data.day_rows:
-                for seating in row.seatings:
-                    if seating.id == seating_id:
-                        target_row = row
-                        target_seating = seating
-                        break
-                if target_seating:
-                    break
+            target_row, target_seating = day_data.find_seating(seating_id)
             
             if not target_seating:
                 return Response(
@@ -689,6 +694,10 @@ class DayViewSet(viewsets.ViewSet):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
+            from services.catalog import get_catalog
+            catalog = get_catalog()
+            was_open = target_seating.is_open
+
             # Update seating fields
             if 'value' in request.data:
                 target_seating.value = int(request.data['value'])
@@ -700,20 +709,18 @@ class DayViewSet(viewsets.ViewSet):
                 target_seating.is_requested = bool(request.data['is_requested'])
             
             if 'service' in request.data:
-                from services.models import Service, TechSkill
                 new_service_name = request.data['service']
                 
                 # Validate service exists
-                try:
-                    service = Service.objects.get(name=new_service_name)
-                except Service.DoesNotExist:
+                service = catalog.get(new_service_name)
+                if service is None:
                     return Response(
                         {'error': f'Service {new_service_name} not found'},
                         status=status.HTTP_404_NOT_FOUND
                     )
                 
                 # Validate tech has skill
-                if not TechSkill.objects.filter(tech_alias=target_row.tech_alias, service_name=new_service_name).exists():
+                if not catalog.has_skill(target_row.tech_alias, new_service_name):
                     return Response(
                         {'error': f'Tech {target_row.tech_alias} does not have skill for service {new_service_name}'},
                         status=status.HTTP_400_BAD_REQUEST
@@ -730,11 +737,27 @@ class DayViewSet(viewsets.ViewSet):
                     target_seating.time_needed = int(request.data.get('time_needed'))
                 except Exception:
                     target_seating.time_needed = None
-            # After any seating edit that might affect turn types, recompute the whole row
-            self._recompute_row_turns(target_row)
+            # Requested/service edits can change turn types from this seating onward
+            if 'is_requested' in request.data or 'service' in request.data:
+                target_row.reclassify_turns(
+                    target_row.seatings.index(target_seating), catalog.is_bonus
+                )
 
             # Save the updated day
-            day_persistence.save(day_data)
+            file_path = day_persistence.save(day_data)
+            try:
+                day_summary.seating_updated(day_data, target_row, file_path, previous_version, catalog)
+            except Exception as e:
+                # The edit is saved; rebuild the summary on its next read instead
+                print(f"Warning: Could not patch cached summary: {e}")
+                day_summary.invalidate(day_data.date)
+
+            # First value entered: learn how long this seating actually took
+            if was_open and not target_seating.is_open:
+                try:
+                    durations.seating_closed(target_row, target_seating)
+                except Exception as e:
+                    print(f"Warning: Could not record seating duration: {e}")
             
             # Return the updated day
             serializer = DayDataSerializer(day_data)
@@ -757,6 +780,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['delete'], url_path='seatings/(?P<seating_id>[^/.]+)')
+    @locks_day
     def delete_seating(self, request, pk=None, seating_id=None):
         """
         DELETE /api/days/{date}/seatings/{seating_id}/
@@ -773,21 +797,19 @@ class DayViewSet(viewsets.ViewSet):
             day_data = day_persistence.load(pk)
             
             # Find and remove the seating
-            found = False
-            for row in day_data.day_rows:
-                removed = row.remove_seating(seating_id)
-                if removed:
-                    found = True
-
-                    # After removing a seating, recompute is_bonus for the whole row
-                    self._recompute_row_turns(row)
-                    break
+            row, seating = day_data.find_seating(seating_id)
             
-            if not found:
+            if not seating:
                 return Response(
                     {'error': f'Seating {seating_id} not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
+
+            position = row.seatings.index(seating)
+            day_data.remove_seating(seating_id)
+
+            # Later requested seatings shift in the alternation; walk-ins keep their flags
+            row.reclassify_turns(position)
             
             # Save the updated day
             day_persistence.save(day_data)
@@ -808,6 +830,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['get', 'post'], url_path='checklist')
+    @locks_day
     def checklist(self, request, pk=None):
         """
         GET /api/days/{date}/checklist/
@@ -914,90 +937,9 @@ class DayViewSet(viewsets.ViewSet):
         }
         """
         try:
-            # Load day data
-            day_data = day_persistence.load(pk)
-            
-            tech_stats = []
-            all_seatings_closed = True
-            
-            # Build a map of clocked-in techs from day_rows
-            clocked_in_techs = {}
-            for row in day_data.day_rows:
-                # Skip inactive (clocked-out) techs
-                if not getattr(row, 'is_active', True):
-                    continue
-                
-                clocked_in_techs[row.tech_alias] = row
-            
-            # Get all technicians from the system
-            from technicians.models import Technician
-            all_techs = Technician.objects.all()
-            
-            for tech in all_techs:
-                if tech.alias in clocked_in_techs:
-                    # Tech was clocked in - calculate their stats
-                    row = clocked_in_techs[tech.alias]
-                    
-                    total_without_penalty = 0
-                    total_with_penalty = 0
-                    penalty_count = 0
-                    
-                    for seating in row.seatings:
-                        # Check if any seatings are still open
-                        if seating.value == 0:
-                            all_seatings_closed = False
-                        
-                        # Calculate totals
-                        total_without_penalty += seating.value
-                        
-                        # Apply penalty if flagged (-3 value)
-                        if seating.has_value_penalty:
-                            penalty_count += 1
-                            total_with_penalty += max(0, seating.value - 3)
-                        else:
-                            total_with_penalty += seating.value
-                    
-                    tech_stats.append({
-                        'tech_alias': row.tech_alias,
-                        'tech_name': row.tech_name,
-                        'row_number': row.row_number,
-                        'total_value_without_penalty': total_without_penalty,
-                        'total_value_with_penalty': total_with_penalty,
-                        'penalty_count': penalty_count,
-                        'regular_turns': row.regular_turns,
-                        'bonus_turns': row.bonus_turns,
-                        'is_absent': False,
-                    })
-                else:
-                    # Tech was absent - add with zeros
-                    tech_stats.append({
-                        'tech_alias': tech.alias,
-                        'tech_name': tech.name,
-                        'row_number': None,
-                        'total_value_without_penalty': 0,
-                        'total_value_with_penalty': 0,
-                        'penalty_count': 0,
-                        'regular_turns': 0,
-                        'bonus_turns': 0,
-                        'is_absent': True,
-                    })
-            
-            # Check if checklists are complete
-            new_day_checklist_complete = all(
-                item.get('completed', False) 
-                for item in day_data.new_day_checklist
-            )
-            end_day_checklist_complete = all(
-                item.get('completed', False) 
-                for item in day_data.end_day_checklist
-            )
-            
-            return Response({
-                'tech_stats': tech_stats,
-                'all_seatings_closed': all_seatings_closed,
-                'new_day_checklist_complete': new_day_checklist_complete,
-                'end_day_checklist_complete': end_day_checklist_complete,
-            })
+            # Cached per day version and catalog generation; see days/summary.py
+            from services.catalog import get_catalog
+            return Response(day_summary.get_summary(pk, day_persistence, get_catalog()))
         
         except FileNotFoundError:
             return Response(
@@ -1011,6 +953,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['post'], url_path='end-day')
+    @locks_day
     def end_day(self, request, pk=None):
         """
         POST /api/days/{date}/end-day/
@@ -1049,6 +992,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['post'], url_path='close-day')
+    @locks_day
     def close_day(self, request, pk=None):
         """
         POST /api/days/{date}/close-day/
@@ -1069,14 +1013,7 @@ class DayViewSet(viewsets.ViewSet):
                 )
             
             # Validate all seatings are closed
-            all_seatings_closed = True
-            for row in day_data.day_rows:
-                for seating in row.seatings:
-                    if seating.value == 0:
-                        all_seatings_closed = False
-                        break
-                if not all_seatings_closed:
-                    break
+            all_seatings_closed = not any(row.open_count for row in day_data.day_rows)
             
             if not all_seatings_closed:
                 return Response(
@@ -1102,6 +1039,9 @@ class DayViewSet(viewsets.ViewSet):
             
             # Save the updated day
             day_persistence.save(day_data, update_metadata=True)
+
+            # Materialize per-tech totals for history reports
+            self._sync_history(day_data)
             
             # Return the updated day
             serializer = DayDataSerializer(day_data)
@@ -1118,6 +1058,14 @@ class DayViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def _sync_history(self, day_data):
+        """Update materialized history; the day file stays the source of truth"""
+        try:
+            history.sync_day(day_data)
+        except Exception as e:
+            # Log error but don't fail the request; backfill_history can repair it
+            print(f"Warning: Could not update history for {day_data.date}: {e}")
+
     @action(detail=True, methods=['get'], url_path='recommend')
     def recommend(self, request, pk=None):
         """
@@ -1127,6 +1075,7 @@ class DayViewSet(viewsets.ViewSet):
         - service: Optional service name (for service-specific recommendations)
         - turn_type: 'regular' or 'bonus' (default: 'regular')
         - skip_skill_check: 'true' or 'false' (default: 'false')
+        - learned: 'true' to use learned seating durations (default: 'false')
         
         Returns sorted list of recommended techs with reasoning
         """
@@ -1138,6 +1087,7 @@ class DayViewSet(viewsets.ViewSet):
             service_name = request.query_params.get('service', None)
             turn_type = request.query_params.get('turn_type', 'regular')
             skip_skill_check = request.query_params.get('skip_skill_check', 'false').lower() == 'true'
+            use_learned = request.query_params.get('learned', 'false').lower() == 'true'
             
             # Validate turn_type
             if turn_type not in ['regular', 'bonus']:
@@ -1151,7 +1101,8 @@ class DayViewSet(viewsets.ViewSet):
                 day_data=day_data,
                 service_name=service_name,
                 turn_type=turn_type,
-                skip_skill_check=skip_skill_check
+                skip_skill_check=skip_skill_check,
+                use_learned_durations=use_learned,
             )
             
             # Convert to dict format
@@ -1162,6 +1113,7 @@ class DayViewSet(viewsets.ViewSet):
                 'service': service_name,
                 'turn_type': turn_type,
                 'skip_skill_check': skip_skill_check,
+                'learned': use_learned,
             })
         
         except FileNotFoundError:
@@ -1176,6 +1128,7 @@ class DayViewSet(viewsets.ViewSet):
             )
 
     @action(detail=True, methods=['post'], url_path='unfreeze')
+    @locks_day
     def unfreeze(self, request, pk=None):
         """
         POST /api/days/{date}/unfreeze/
@@ -1198,6 +1151,9 @@ class DayViewSet(viewsets.ViewSet):
 
             day_persistence.save(day_data, update_metadata=True)
 
+            # The day can change again; history rows are rebuilt when it closes
+            self._sync_history(day_data)
+
             serializer = DayDataSerializer(day_data)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -1213,10 +1169,320 @@ class DayViewSet(viewsets.ViewSet):
             )
 
 
+class ReportViewSet(viewsets.ViewSet):
+    """
+    ViewSet for multi-day reports
+    Aggregates day data over date ranges (payroll, summaries)
+    """
+
+    @action(detail=False, methods=['get'], url_path='summary')
+    def summary(self, request):
+        """
+        GET /api/reports/summary/?from=YYYY-MM-DD&to=YYYY-MM-DD
+        Per-tech totals over a date range, streamed as JSON
+        If streaming fails part way, the body ends with "error" instead of "tech_stats"
+        Returns: {
+            "from": "2026-01-01",
+            "to": "2026-01-14",
+            "days": [
+                {"date": "2026-01-01", "status": "closed", "tech_stats": [...]}
+            ],
+            "tech_stats": [
+                {
+                    "tech_alias": "alias",
+                    "tech_name": "name",
+                    "total_value_without_penalty": 1500,
+                    "total_value_with_penalty": 1491,
+                    "penalty_count": 3,
+                    "regular_turns": 30,
+                    "bonus_turns": 12,
+                    "seating_count": 42,
+                    "days_worked": 10
+                }
+            ]
+        }
+        """
+        try:
+            date_from, date_to = reports.parse_date_range(
+                request.query_params.get('from'),
+                request.query_params.get('to'),
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            from services.catalog import get_catalog
+            catalog = get_catalog()
+            return StreamingHttpResponse(
+                reports.stream_range_summary(date_from, date_to, catalog=catalog),
+                content_type='application/json',
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=['get'], url_path='seatings')
+    def seatings(self, request):
+        """
+        GET /api/reports/seatings/
+        Search seatings of closed days via the seating index (no day files are read)
+        Query params (all optional):
+        - from, to: YYYY-MM-DD date range (inclusive)
+        - tech_alias, service: exact matches
+        - min_value, max_value: inclusive value range
+        - penalty, bonus, requested: 'true' or 'false'
+        - limit (default 100, max 1000), offset (default 0)
+        Returns: { "results": [...], "has_more": false }
+        Newest days first; within a day, by seating time
+        """
+        params = request.query_params
+        queryset = SeatingIndexEntry.objects.all()
+        try:
+            if params.get('from') or params.get('to'):
+                date_from, date_to = reports.parse_date_range(
+                    params.get('from') or '0001-01-01',
+                    params.get('to') or '9999-12-31',
+                )
+                queryset = queryset.filter(date__range=(date_from, date_to))
+            if params.get('min_value') not in (None, ''):
+                queryset = queryset.filter(value__gte=int(params['min_value']))
+            if params.get('max_value') not in (None, ''):
+                queryset = queryset.filter(value__lte=int(params['max_value']))
+            limit = min(int(params.get('limit', 100)), 1000)
+            offset = int(params.get('offset', 0))
+            if limit < 1 or offset < 0:
+                raise ValueError('limit must be positive and offset non-negative')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if params.get('tech_alias'):
+            queryset = queryset.filter(tech_alias=params['tech_alias'])
+        if params.get('service'):
+            queryset = queryset.filter(service_name=params['service'])
+        for param, field in (('penalty', 'has_value_penalty'), ('bonus', 'is_bonus'), ('requested', 'is_requested')):
+            if params.get(param) in ('true', 'false'):
+                queryset = queryset.filter(**{field: params[param] == 'true'})
+
+        try:
+            # One extra row tells whether another page exists without a COUNT(*)
+            entries = list(queryset[offset:offset + limit + 1])
+            return Response({
+                'results': [entry.to_dict() for entry in entries[:limit]],
+                'has_more': len(entries) > limit,
+            })
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=['get'], url_path='attendance')
+    def attendance(self, request):
+        """
+        GET /api/reports/attendance/?from=YYYY-MM-DD&to=YYYY-MM-DD&tech_alias=alias
+        Days worked per tech over a date range, from tech_day_presence (tech_alias optional)
+        Returns: {
+            "from": "2026-01-01", "to": "2026-01-31",
+            "techs": [
+                {"tech_alias": "alias", "days_worked": 20, "seating_count": 160, "last_worked": "2026-01-30"}
+            ]
+        }
+        """
+        try:
+            date_from, date_to = reports.parse_date_range(
+                request.query_params.get('from'),
+                request.query_params.get('to'),
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            return Response({
+                'from': date_from,
+                'to': date_to,
+                'techs': presence.attendance(date_from, date_to, request.query_params.get('tech_alias')),
+            })
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=['get'], url_path='heatmap')
+    def heatmap(self, request):
+        """
+        GET /api/reports/heatmap/?from=YYYY-MM-DD&to=YYYY-MM-DD&service=Name
+        Seatings started per hour of day (and per weekday) for each service (service optional)
+        Returns: {
+            "from": "2026-01-01", "to": "2026-03-31",
+            "services": {
+                "Gel": {"total": 420, "by_hour": [24 counts], "by_weekday_hour": [[24 counts] x 7, Monday first]}
+            }
+        }
+        """
+        try:
+            date_from, date_to = reports.parse_date_range(
+                request.query_params.get('from'),
+                request.query_params.get('to'),
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            return Response({
+                'from': date_from,
+                'to': date_to,
+                'services': demand.heatmap(date_from, date_to, request.query_params.get('service')),
+            })
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=['get'], url_path='trends')
+    def trends(self, request):
+        """
+        GET /api/reports/trends/?tech_alias=alias|service=Name&period=week|month&from=YYYY-MM-DD&to=YYYY-MM-DD
+        Weekly or monthly totals of closed days for one tech or service, read from rollups
+        Returns: {
+            "dimension": "tech", "key": "alias", "period": "week",
+            "buckets": [
+                {
+                    "period_start": "2026-01-05",
+                    "total_value": 1500,
+                    "total_value_with_penalty": 1491,
+                    "penalty_count": 3,
+                    "regular_turns": 30,
+                    "bonus_turns": 12,
+                    "seating_count": 42,
+                    "day_count": 6,
+                    "total_value_with_penalty_change": -120
+                }
+            ]
+        }
+        """
+        params = request.query_params
+        if bool(params.get('tech_alias')) == bool(params.get('service')):
+            return Response(
+                {'error': 'Provide exactly one of tech_alias or service'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        dimension, key = ('tech', params['tech_alias']) if params.get('tech_alias') else ('service', params['service'])
+
+        period = params.get('period', 'week')
+        if period not in rollups.PERIODS:
+            return Response(
+                {'error': 'period must be "week" or "month"'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            date_from, date_to = reports.parse_date_range(params.get('from'), params.get('to'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            return Response({
+                'dimension': dimension,
+                'key': key,
+                'period': period,
+                'buckets': rollups.trend(dimension, key, period, date_from, date_to),
+            })
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=['get'], url_path='durations')
+    def duration_stats(self, request):
+        """
+        GET /api/reports/durations/?service=Name&tech_alias=alias
+        Learned seating durations (both filters optional)
+        An empty tech_alias in the results means all techs for that service
+        """
+        try:
+            queryset = ServiceDurationStats.objects.all()
+            if request.query_params.get('service'):
+                queryset = queryset.filter(service_name=request.query_params['service'])
+            if 'tech_alias' in request.query_params:
+                queryset = queryset.filter(tech_alias=request.query_params['tech_alias'])
+            return Response([stats.to_dict() for stats in queryset])
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+@require_GET
+def export_seatings(request):
+    """
+    GET /api/exports/seatings/?from=YYYY-MM-DD&to=YYYY-MM-DD&format=csv|ndjson
+    Stream every seating in the range, one row per seating
+    Plain Django view: DRF would treat ?format= as a renderer override.
+    """
+    try:
+        date_from, date_to = reports.parse_date_range(request.GET.get('from'), request.GET.get('to'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in exports.EXPORT_FORMATS:
+        return JsonResponse(
+            {'error': 'format must be "csv" or "ndjson"'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    stream, content_type = exports.EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(
+        stream(exports.iter_seating_records(date_from, date_to)),
+        content_type=content_type,
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="seatings_{date_from}_{date_to}.{export_format}"'
+    )
+    return response
+
+
+class RenameJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Progress of tech/service rename propagation across day files
+    GET /api/rename-jobs/ and /api/rename-jobs/{id}/
+    POST /api/rename-jobs/resume/ restarts unfinished jobs
+    POST /api/rename-jobs/{id}/resume/ restarts one job (failed jobs start over)
+    """
+    queryset = RenameJob.objects.all()
+    serializer_class = RenameJobSerializer
+
+    @action(detail=False, methods=['post'])
+    def resume(self, request):
+        from .renames import start_runner
+        start_runner()
+        pending = RenameJob.objects.filter(status__in=['pending', 'running'])
+        return Response(RenameJobSerializer(pending, many=True).data)
+
+    @action(detail=True, methods=['post'], url_path='resume')
+    def resume_job(self, request, pk=None):
+        from .renames import start_runner
+        job = self.get_object()
+        if job.status == 'done':
+            return Response({'error': 'Rename job already finished'}, status=status.HTTP_400_BAD_REQUEST)
+        if job.status == 'failed':
+            # Days that failed may lie before the cursor, so start over
+            RenameJob.objects.filter(pk=job.pk, status='failed').update(status='pending', cursor='', changed_days=0)
+        start_runner()
+        job.refresh_from_db()
+        return Response(RenameJobSerializer(job).data)
+
+
 class SettingsViewSet(viewsets.ViewSet):
     """
     ViewSet for Settings management
     Handles checklist configuration
+    Reads and writes config.json through config_store (see config.py)
     """
 
     def retrieve(self, request, pk=None):
@@ -1224,31 +1490,23 @@ class SettingsViewSet(viewsets.ViewSet):
         GET /api/settings/{checklists|day-table}/
         Retrieve settings configuration
         """
+        from .config import config_store
         try:
-            config_path = Path('/app/data/config.json')
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
             # Support different setting collections by pk
             if pk == 'checklists':
                 return Response({
-                    'new_day_checklist': config.get('new_day_checklist', []),
-                    'end_day_checklist': config.get('end_day_checklist', []),
+                    'new_day_checklist': config_store.get('new_day_checklist'),
+                    'end_day_checklist': config_store.get('end_day_checklist'),
                 })
 
             if pk == 'day-table' or pk == 'day_table' or pk is None:
                 # default day table settings
-                day_table = config.get('day_table', {
-                    'display_name': True,
-                    'display_turns': False,
-                })
-                return Response(day_table)
+                return Response(config_store.get('day_table'))
 
             if pk == 'recommendations':
                 # Recommendation widget settings
-                recommendation_widgets = config.get('recommendation_widgets', [])
                 return Response({
-                    'recommendation_widgets': recommendation_widgets
+                    'recommendation_widgets': config_store.get('recommendation_widgets')
                 })
 
             return Response({'error': 'Unknown settings key'}, status=status.HTTP_404_NOT_FOUND)
@@ -1268,56 +1526,18 @@ class SettingsViewSet(viewsets.ViewSet):
         """
         PUT /api/settings/{checklists|day-table}/
         Update settings configuration
+        Only the fields present in the body change; values are checked
+        against config.SCHEMA before config.json is rewritten
         """
+        from .config import ConfigError, config_store
         try:
-            # Load existing config
-            config_path = Path('/app/data/config.json')
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
             if pk == 'checklists':
-                new_day_checklist = request.data.get('new_day_checklist')
-                end_day_checklist = request.data.get('end_day_checklist')
-
-                # Validation
-                if new_day_checklist is not None and not isinstance(new_day_checklist, list):
-                    return Response(
-                        {'error': 'new_day_checklist must be a list'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-                if end_day_checklist is not None and not isinstance(end_day_checklist, list):
-                    return Response(
-                        {'error': 'end_day_checklist must be a list'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-                # Validate all items are strings
-                if new_day_checklist is not None:
-                    if not all(isinstance(item, str) for item in new_day_checklist):
-                        return Response(
-                            {'error': 'All checklist items must be strings'},
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-
-                if end_day_checklist is not None:
-                    if not all(isinstance(item, str) for item in end_day_checklist):
-                        return Response(
-                            {'error': 'All checklist items must be strings'},
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-
-                # Update checklists
-                if new_day_checklist is not None:
-                    config['new_day_checklist'] = new_day_checklist
-
-                if end_day_checklist is not None:
-                    config['end_day_checklist'] = end_day_checklist
-
-                # Save config
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    json.dump(config, f, indent=2, ensure_ascii=False)
-
+                changes = {
+                    key: request.data[key]
+                    for key in ('new_day_checklist', 'end_day_checklist')
+                    if request.data.get(key) is not None
+                }
+                config = config_store.update(changes)
                 return Response({
                     'new_day_checklist': config.get('new_day_checklist', []),
                     'end_day_checklist': config.get('end_day_checklist', []),
@@ -1325,67 +1545,40 @@ class SettingsViewSet(viewsets.ViewSet):
 
             if pk == 'day-table' or pk == 'day_table':
                 # Expect body: { display_name: bool, display_turns: bool }
-                display_name = request.data.get('display_name')
-                display_turns = request.data.get('display_turns')
-
-                if display_name is not None and not isinstance(display_name, bool):
-                    return Response({'error': 'display_name must be boolean'}, status=status.HTTP_400_BAD_REQUEST)
-                if display_turns is not None and not isinstance(display_turns, bool):
-                    return Response({'error': 'display_turns must be boolean'}, status=status.HTTP_400_BAD_REQUEST)
-
-                day_table = config.get('day_table', {})
-                if display_name is not None:
-                    day_table['display_name'] = display_name
-                if display_turns is not None:
-                    day_table['display_turns'] = display_turns
-
-                config['day_table'] = day_table
-
-                # Save config
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    json.dump(config, f, indent=2, ensure_ascii=False)
-
+                day_table = {
+                    key: request.data[key]
+                    for key in ('display_name', 'display_turns')
+                    if request.data.get(key) is not None
+                }
+                config = config_store.update({'day_table': day_table})
                 return Response(config['day_table'])
 
             if pk == 'recommendations':
                 # Expect body: { recommendation_widgets: [service_name, ...] }
                 recommendation_widgets = request.data.get('recommendation_widgets')
-
+                changes = {}
                 if recommendation_widgets is not None:
-                    if not isinstance(recommendation_widgets, list):
-                        return Response(
-                            {'error': 'recommendation_widgets must be a list'},
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-                    
-                    # Validate all items are strings
-                    if not all(isinstance(item, str) for item in recommendation_widgets):
-                        return Response(
-                            {'error': 'All recommendation widget items must be service names (strings)'},
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-                    
-                    # Validate services exist
-                    from services.models import Service
-                    for service_name in recommendation_widgets:
-                        if not Service.objects.filter(name=service_name).exists():
-                            return Response(
-                                {'error': f'Service {service_name} not found'},
-                                status=status.HTTP_404_NOT_FOUND
-                            )
-                    
-                    config['recommendation_widgets'] = recommendation_widgets
-
-                # Save config
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    json.dump(config, f, indent=2, ensure_ascii=False)
-
+                    if isinstance(recommendation_widgets, list):
+                        # Validate services exist
+                        from services.catalog import get_catalog
+                        catalog = get_catalog()
+                        for service_name in recommendation_widgets:
+                            if isinstance(service_name, str) and catalog.get(service_name) is None:
+                                return Response(
+                                    {'error': f'Service {service_name} not found'},
+                                    status=status.HTTP_404_NOT_FOUND
+                                )
+                    changes['recommendation_widgets'] = recommendation_widgets
+
+                config = config_store.update(changes)
                 return Response({
                     'recommendation_widgets': config.get('recommendation_widgets', [])
                 })
 
             return Response({'error': 'Unknown settings key'}, status=status.HTTP_404_NOT_FOUND)
 
+        except ConfigError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except FileNotFoundError:
             return Response(
                 {'error': 'Configuration file not found'},
@@ -0,0 +1,214 @@
+"""
+Process-wide, read-only snapshot of services, technicians and skills.
+
+The catalog changes a few times a month but is read on nearly every request,
+so each worker keeps one immutable snapshot in memory. Writes bump a
+generation counter stored in index.db (see CatalogGeneration); every worker
+compares its snapshot against that counter at most once per request and
+reloads when another worker (or this one) has changed the catalog.
+"""
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+from django.db.models import F
+
+from .models import CatalogGeneration, Service, TechSkill
+
+
+class ServiceInfo(NamedTuple):
+    """Immutable copy of the Service fields used outside the Services pages"""
+    name: str
+    short_name: str
+    time_needed: int
+    is_bonus: bool
+    is_default: bool
+
+
+class TechInfo(NamedTuple):
+    """Immutable copy of the Technician fields used outside the Techs pages"""
+    alias: str
+    name: str
+
+
+class Catalog:
+    """Immutable snapshot of all services, technicians and tech skills"""
+
+    def __init__(self, services, techs, skills, generation=0):
+        self.generation = generation
+        self.services = MappingProxyType({service.name: service for service in services})
+        self.techs = MappingProxyType({tech.alias: tech for tech in techs})
+        skills = list(skills)
+        self.skills = frozenset(skills)
+
+        skills_by_tech = {}
+        techs_by_service = {}
+        # `skills` arrives ordered by (tech_alias, service_name), like TechSkill's default ordering
+        for tech_alias, service_name in skills:
+            skills_by_tech.setdefault(tech_alias, []).append(service_name)
+            techs_by_service.setdefault(service_name, []).append(tech_alias)
+        # Grouped once here so list endpoints never query tech_skills per item
+        self.skills_by_tech = MappingProxyType(
+            {alias: tuple(names) for alias, names in skills_by_tech.items()}
+        )
+        self.techs_by_service = MappingProxyType(
+            {name: tuple(aliases) for name, aliases in techs_by_service.items()}
+        )
+        # Serialized list payloads built from this snapshot (see cached_payload)
+        self._payloads = {}
+
+    @classmethod
+    def load(cls, generation=0):
+        from technicians.models import Technician
+
+        services = [
+            ServiceInfo(*row) for row in
+            Service.objects.values_list('name', 'short_name', 'time_needed', 'is_bonus', 'is_default')
+        ]
+        techs = [TechInfo(*row) for row in Technician.objects.values_list('alias', 'name')]
+        skills = TechSkill.objects.order_by('tech_alias', 'service_name').values_list(
+            'tech_alias', 'service_name'
+        )
+        return cls(services, techs, skills, generation=generation)
+
+    @property
+    def etag(self):
+        """HTTP validator for anything derived only from the catalog"""
+        return f'"catalog-{self.generation}"'
+
+    def cached_payload(self, key, build):
+        """
+        Return the payload stored under `key`, calling build() the first time.
+        A new generation means a new snapshot, so entries never go stale.
+        """
+        payload = self._payloads.get(key)
+        if payload is None:
+            payload = self._payloads[key] = build()
+        return payload
+
+    def get(self, name) -> Optional[ServiceInfo]:
+        return self.services.get(name)
+
+    def is_bonus(self, name) -> bool:
+        """Whether a walk-in seating for this service counts as a bonus turn"""
+        service = self.services.get(name)
+        return bool(service.is_bonus) if service else False
+
+    def get_tech(self, alias) -> Optional[TechInfo]:
+        return self.techs.get(alias)
+
+    def has_skill(self, tech_alias, service_name) -> bool:
+        return (tech_alias, service_name) in self.skills
+
+    def skills_for(self, tech_alias):
+        """Service names a tech can perform, sorted by name"""
+        return list(self.skills_by_tech.get(tech_alias, ()))
+
+    def techs_for(self, service_name):
+        """Aliases of techs qualified for a service, sorted by alias"""
+        return list(self.techs_by_service.get(service_name, ()))
+
+    def default_services(self):
+        return [service.name for service in self.services.values() if service.is_default]
+
+
+_lock = threading.Lock()
+_snapshot = None
+# Per-thread flag set once the generation has been checked for the current request
+_request_state = threading.local()
+# Per-thread nesting depth / pending flag for batched_changes()
+_batch_state = threading.local()
+
+
+def current_generation():
+    """Read the catalog generation stored in index.db"""
+    row = CatalogGeneration.objects.filter(pk=CatalogGeneration.SINGLETON_ID).values_list(
+        'generation', flat=True
+    ).first()
+    return row or 0
+
+
+def bump_generation():
+    """
+    Record a catalog change so every worker reloads its snapshot.
+    Call after writes that bypass model signals (QuerySet.update, bulk_create).
+    """
+    updated = CatalogGeneration.objects.filter(pk=CatalogGeneration.SINGLETON_ID).update(
+        generation=F('generation') + 1
+    )
+    if not updated:
+        CatalogGeneration.objects.get_or_create(
+            pk=CatalogGeneration.SINGLETON_ID, defaults={'generation': 1}
+        )
+    invalidate()
+
+
+def catalog_changed():
+    """Record one catalog change, deferred while inside batched_changes()"""
+    if getattr(_batch_state, 'depth', 0):
+        _batch_state.pending = True
+    else:
+        bump_generation()
+
+
+@contextmanager
+def batched_changes():
+    """
+    Collapse the catalog changes made inside the block (e.g. one signal per
+    deleted TechSkill row) into a single generation bump at the end.
+    Nothing is bumped if the block raises.
+    """
+    depth = getattr(_batch_state, 'depth', 0)
+    _batch_state.depth = depth + 1
+    try:
+        yield
+    except BaseException:
+        if depth == 0:
+            _batch_state.pending = False
+        raise
+    finally:
+        _batch_state.depth = depth
+    if depth == 0 and getattr(_batch_state, 'pending', False):
+        _batch_state.pending = False
+        bump_generation()
+
+
+def invalidate():
+    """Drop this worker's snapshot; the next get_catalog() reloads it"""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+    _request_state.checked = False
+
+
+def begin_request():
+    """Allow one generation check during the request that is starting"""
+    _request_state.checked = False
+    _request_state.in_request = True
+
+
+def end_request():
+    _request_state.checked = False
+    _request_state.in_request = False
+
+
+def get_catalog() -> Catalog:
+    """Return the current catalog snapshot, reloading it if it is stale"""
+    global _snapshot
+    snapshot = _snapshot
+    in_request = getattr(_request_state, 'in_request', False)
+    if snapshot is not None and in_request and getattr(_request_state, 'checked', False):
+        return snapshot
+
+    # Read the generation before the data so a concurrent write is caught next time
+    generation = current_generation()
+    _request_state.checked = in_request
+    if snapshot is not None and snapshot.generation == generation:
+        return snapshot
+
+    with _lock:
+        if _snapshot is not None and _snapshot.generation == generation:
+            return _snapshot
+        _snapshot = Catalog.load(generation=generation)
+        return _snapshot
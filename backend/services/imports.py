@@ -0,0 +1,204 @@
+"""
+Bulk import of technicians, services and skills from CSV
+
+Three optional CSVs, all with a header row:
+    techs:    alias, name
+    services: name, time_needed, short_name, is_bonus, is_default
+    skills:   tech_alias, <service name>, <service name>, ...
+              (one row per tech; a cell of 1 / x / yes / true grants the skill,
+              other cells leave existing skills alone)
+
+Everything is parsed and validated before anything is written, then all rows
+are inserted with bulk_create in one index.db transaction. Default services
+are assigned the same way the create endpoints do it (new techs get every
+default service, new default services get every tech), but as one set of
+rows instead of a set_skills() call per item.
+"""
+import csv
+import io
+
+from backend.db import write_atomic
+
+from .catalog import batched_changes, catalog_changed, get_catalog
+from .models import Service, TechSkill
+
+TRUE_VALUES = {'1', 'x', 'y', 'yes', 'true'}
+FALSE_VALUES = {'', '0', 'n', 'no', 'false'}
+TECH_COLUMNS = ['alias', 'name']
+SERVICE_COLUMNS = ['name', 'time_needed', 'short_name', 'is_bonus', 'is_default']
+
+
+class ImportReport:
+    """Outcome of an import (or a dry run)"""
+
+    def __init__(self, dry_run, skip_existing):
+        self.dry_run = dry_run
+        self.skip_existing = skip_existing
+        self.errors = []
+        self.conflicts = []
+        self.techs = []
+        self.services = []
+        self.skills = []
+        self.written = False
+
+    @property
+    def ok(self):
+        return not self.errors and (self.skip_existing or not self.conflicts)
+
+    def to_dict(self):
+        return {
+            'dry_run': self.dry_run,
+            'skip_existing': self.skip_existing,
+            'written': self.written,
+            'techs': len(self.techs),
+            'services': len(self.services),
+            'skills': len(self.skills),
+            'conflicts': self.conflicts,
+            'errors': self.errors,
+        }
+
+
+def _rows(text, label, columns, required, report):
+    """
+    Yield (line number, row dict) for a CSV text. Headers matching `columns`
+    (case-insensitively) are normalized to them; others are kept as written.
+    """
+    if not text:
+        return
+    reader = csv.DictReader(io.StringIO(text.lstrip('\ufeff')))
+    if reader.fieldnames is None:
+        return
+    known = {name.lower(): name for name in columns}
+    reader.fieldnames = [
+        known.get((name or '').strip().lower(), (name or '').strip()) for name in reader.fieldnames
+    ]
+    missing = [name for name in required if name not in reader.fieldnames]
+    if missing:
+        report.errors.append(f"{label}: missing column(s) {', '.join(missing)}")
+        return
+    for row in reader:
+        yield reader.line_num, {key: (value or '').strip() for key, value in row.items() if key}
+
+
+def _parse_bool(value, label, report):
+    value = value.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value not in FALSE_VALUES:
+        report.errors.append(f"{label}: '{value}' is not a yes/no value")
+    return False
+
+
+def _parse_techs(text, catalog, report):
+    techs = {}
+    for line, row in _rows(text, 'techs', TECH_COLUMNS, ['alias'], report):
+        alias = row['alias']
+        if not alias:
+            report.errors.append(f'techs line {line}: alias is required')
+        elif len(alias) > 50:
+            report.errors.append(f'techs line {line}: alias {alias} is longer than 50 characters')
+        elif alias in techs:
+            report.errors.append(f'techs line {line}: duplicate alias {alias}')
+        elif catalog.get_tech(alias) is not None:
+            report.conflicts.append(f'techs line {line}: Technician {alias} already exists')
+        else:
+            techs[alias] = row.get('name', '')[:200]
+    return techs
+
+
+def _parse_services(text, catalog, report):
+    services = {}
+    for line, row in _rows(text, 'services', SERVICE_COLUMNS, ['name', 'time_needed'], report):
+        name = row['name']
+        label = f'services line {line}'
+        if not name:
+            report.errors.append(f'{label}: name is required')
+            continue
+        if name in services:
+            report.errors.append(f'{label}: duplicate service {name}')
+            continue
+        if catalog.get(name) is not None:
+            report.conflicts.append(f'{label}: Service {name} already exists')
+            continue
+        try:
+            time_needed = int(row['time_needed'])
+        except ValueError:
+            report.errors.append(f"{label}: time_needed '{row['time_needed']}' is not a whole number")
+            continue
+        if time_needed < 1:
+            report.errors.append(f'{label}: time_needed must be at least 1')
+            continue
+        services[name] = Service(
+            name=name,
+            time_needed=time_needed,
+            short_name=row.get('short_name', '')[:50],
+            is_bonus=_parse_bool(row.get('is_bonus', ''), label, report),
+            is_default=_parse_bool(row.get('is_default', ''), label, report),
+        )
+    return services
+
+
+def _parse_skills(text, known_techs, known_services, report):
+    skills = set()
+    for line, row in _rows(text, 'skills', ['tech_alias'], ['tech_alias'], report):
+        alias = row.pop('tech_alias')
+        if alias not in known_techs:
+            report.errors.append(f'skills line {line}: Technician {alias} not found')
+            continue
+        for service_name, cell in row.items():
+            if _parse_bool(cell, f'skills line {line}', report):
+                if service_name in known_services:
+                    skills.add((alias, service_name))
+                else:
+                    report.errors.append(f'skills line {line}: Service {service_name} not found')
+    return skills
+
+
+def import_catalog(techs_csv='', services_csv='', skills_csv='', dry_run=False, skip_existing=False):
+    """
+    Validate and import the given CSV texts; returns an ImportReport.
+    Nothing is written on a dry run or when any row is invalid. Existing
+    techs/services are reported as conflicts and block the import unless
+    skip_existing is set, in which case they are left as they are (skill rows
+    may still refer to them).
+    """
+    catalog = get_catalog()
+    report = ImportReport(dry_run, skip_existing)
+
+    techs = _parse_techs(techs_csv, catalog, report)
+    services = _parse_services(services_csv, catalog, report)
+
+    all_techs = set(catalog.techs) | set(techs)
+    all_services = set(catalog.services) | set(services)
+    skills = _parse_skills(skills_csv, all_techs, all_services, report)
+
+    # Default services follow the create endpoints: both ways, existing and new
+    default_services = set(catalog.default_services())
+    default_services.update(name for name, service in services.items() if service.is_default)
+    for alias in techs:
+        skills.update((alias, name) for name in default_services)
+    for name, service in services.items():
+        if service.is_default:
+            skills.update((alias, name) for alias in all_techs)
+    skills -= catalog.skills
+
+    report.techs = sorted(techs)
+    report.services = sorted(services)
+    report.skills = sorted(skills)
+    if dry_run or not report.ok:
+        return report
+
+    from technicians.models import Technician
+    with write_atomic('index'), batched_changes():
+        Technician.objects.bulk_create(
+            [Technician(alias=alias, name=name) for alias, name in sorted(techs.items())]
+        )
+        Service.objects.bulk_create([services[name] for name in sorted(services)])
+        TechSkill.objects.bulk_create(
+            [TechSkill(tech_alias=alias, service_name=name) for alias, name in report.skills],
+            ignore_conflicts=True,
+        )
+        # bulk_create sends no post_save, so record the change explicitly
+        catalog_changed()
+    report.written = True
+    return report
@@ -0,0 +1,60 @@
+"""
+Import techs, services and a skill matrix from CSV files (see services/imports.py).
+"""
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.imports import import_catalog
+
+
+class Command(BaseCommand):
+    help = 'Bulk import technicians, services and skills from CSV files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--techs', help='CSV with alias,name columns')
+        parser.add_argument('--services', help='CSV with name,time_needed[,short_name,is_bonus,is_default] columns')
+        parser.add_argument('--skills', help='Skill matrix CSV: tech_alias then one column per service')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report conflicts without writing')
+        parser.add_argument('--skip-existing', action='store_true', help='Leave existing techs/services as they are')
+
+    def handle(self, *args, **options):
+        texts = {}
+        for field in ('techs', 'services', 'skills'):
+            path = options[field]
+            if not path:
+                texts[field] = ''
+                continue
+            try:
+                texts[field] = Path(path).read_text(encoding='utf-8-sig')
+            except (OSError, UnicodeDecodeError) as e:
+                raise CommandError(f'Could not read {path}: {e}')
+        if not any(texts.values()):
+            raise CommandError('Give at least one of --techs, --services, --skills')
+
+        started = time.perf_counter()
+        report = import_catalog(
+            techs_csv=texts['techs'],
+            services_csv=texts['services'],
+            skills_csv=texts['skills'],
+            dry_run=options['dry_run'],
+            skip_existing=options['skip_existing'],
+        )
+        elapsed = time.perf_counter() - started
+
+        for conflict in report.conflicts:
+            self.stdout.write(f'Conflict: {conflict}')
+        for error in report.errors:
+            self.stderr.write(error)
+
+        summary = f'{len(report.techs)} techs, {len(report.services)} services, {len(report.skills)} skills'
+        if not report.ok:
+            raise CommandError(
+                f'Nothing imported: {len(report.errors)} errors, {len(report.conflicts)} conflicts '
+                f'({summary} were valid)'
+            )
+        if report.dry_run:
+            self.stdout.write(self.style.SUCCESS(f'Dry run OK: would import {summary}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Imported {summary} in {elapsed:.2f}s'))
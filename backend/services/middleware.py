@@ -0,0 +1,16 @@
+"""
+Middleware scoping catalog generation checks to one per request
+"""
+from . import catalog
+
+
+class CatalogMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        catalog.begin_request()
+        try:
+            return self.get_response(request)
+        finally:
+            catalog.end_request()
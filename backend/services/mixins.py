@@ -0,0 +1,42 @@
+"""
+View helpers for endpoints whose responses depend only on the catalog
+"""
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .catalog import get_catalog
+
+
+class CatalogListMixin:
+    """
+    Conditional, cached list() for catalog-backed ViewSets.
+
+    The catalog generation is the ETag: a matching If-None-Match gets a 304
+    after only the generation lookup, and otherwise the serialized list is
+    built once per generation and reused. Cache-Control: no-cache makes
+    browsers revalidate on every fetch instead of trusting a stale copy.
+    """
+    catalog_list_key = None
+
+    def list(self, request, *args, **kwargs):
+        catalog = get_catalog()
+        etag = catalog.etag
+        # Query parameters could filter the list, so only the plain list is cached
+        cacheable = not request.query_params
+        if cacheable:
+            if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+            if etag in if_none_match or '*' in if_none_match:
+                return self._with_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+            data = catalog.cached_payload(
+                self.catalog_list_key,
+                lambda: self.get_serializer(self.filter_queryset(self.get_queryset()), many=True).data,
+            )
+            return self._with_validators(Response(data), etag)
+        return super().list(request, *args, **kwargs)
+
+    @staticmethod
+    def _with_validators(response, etag):
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        return response
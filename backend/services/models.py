@@ -1,5 +1,7 @@
 from django.db import models
 
+from backend.db import write_atomic
+
 
 class Service(models.Model):
     """Service model stored in index.db"""
@@ -24,14 +26,24 @@ class Service(models.Model):
         return list(TechSkill.objects.filter(service_name=self.name).values_list('tech_alias', flat=True))
 
     def set_qualified_techs(self, tech_aliases):
-        """Set the qualified techs for this service"""
+        """
+        Set the qualified techs for this service (unknown aliases are ignored)
+        Only the difference from the current rows is written, in one transaction
+        """
         from technicians.models import Technician
-        # Remove existing associations
-        TechSkill.objects.filter(service_name=self.name).delete()
-        # Add new associations
-        for tech_alias in tech_aliases:
-            if Technician.objects.filter(alias=tech_alias).exists():
-                TechSkill.objects.create(tech_alias=tech_alias, service_name=self.name)
+        from .catalog import batched_changes, catalog_changed
+        wanted = set(tech_aliases)
+        with write_atomic('index'), batched_changes():
+            wanted = set(Technician.objects.filter(alias__in=wanted).values_list('alias', flat=True))
+            current = set(TechSkill.objects.filter(service_name=self.name).values_list('tech_alias', flat=True))
+            if current - wanted:
+                TechSkill.objects.filter(service_name=self.name, tech_alias__in=current - wanted).delete()
+            if wanted - current:
+                TechSkill.objects.bulk_create([
+                    TechSkill(tech_alias=alias, service_name=self.name) for alias in sorted(wanted - current)
+                ])
+                # bulk_create sends no post_save, so record the change explicitly
+                catalog_changed()
 
 
 class TechSkill(models.Model):
@@ -47,3 +59,19 @@ class TechSkill(models.Model):
 
     def __str__(self):
         return f"{self.tech_alias} - {self.service_name}"
+
+
+class CatalogGeneration(models.Model):
+    """
+    Single-row counter bumped on every service/technician/skill change.
+    Workers compare it with their in-memory catalog snapshot (see catalog.py).
+    """
+    SINGLETON_ID = 1
+
+    generation = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'catalog_generation'
+
+    def __str__(self):
+        return f"Catalog generation {self.generation}"
@@ -9,11 +9,8 @@ class ServiceSerializer(serializers.Serializer):
     time_needed = serializers.IntegerField(required=True, min_value=1)
     is_bonus = serializers.BooleanField(required=False, default=False)
     is_default = serializers.BooleanField(required=False, default=False)
-    qualified_techs = serializers.ListField(
-        child=serializers.CharField(),
-        required=False,
-        read_only=True
-    )
+    # Read from the in-memory catalog; writes go through initial_data['qualified_techs']
+    qualified_techs = serializers.SerializerMethodField()
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
 
@@ -26,7 +23,7 @@ class ServiceSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         """Create a new service"""
-        from technicians.models import Technician
+        from .catalog import get_catalog
         qualified_techs_data = self.initial_data.get('qualified_techs', [])
         name = validated_data['name']
         time_needed = validated_data['time_needed']
@@ -43,7 +40,7 @@ class ServiceSerializer(serializers.Serializer):
         
         # If is_default, auto-assign to all existing techs
         if is_default:
-            all_tech_aliases = Technician.objects.values_list('alias', flat=True)
+            all_tech_aliases = get_catalog().techs.keys()
             all_techs = list(set(list(qualified_techs_data) + list(all_tech_aliases)))
             service.set_qualified_techs(all_techs)
         elif qualified_techs_data:
@@ -53,7 +50,7 @@ class ServiceSerializer(serializers.Serializer):
 
     def update(self, instance, validated_data):
         """Update an existing service"""
-        from technicians.models import Technician
+        from .catalog import get_catalog
         instance.time_needed = validated_data.get('time_needed', instance.time_needed)
         instance.is_bonus = validated_data.get('is_bonus', instance.is_bonus)
         instance.is_default = validated_data.get('is_default', instance.is_default)
@@ -65,7 +62,7 @@ class ServiceSerializer(serializers.Serializer):
         if qualified_techs_data is not None:
             # If is_default is being set to True, auto-assign to all techs
             if instance.is_default:
-                all_tech_aliases = Technician.objects.values_list('alias', flat=True)
+                all_tech_aliases = get_catalog().techs.keys()
                 all_techs = list(set(list(qualified_techs_data) + list(all_tech_aliases)))
                 instance.set_qualified_techs(all_techs)
             else:
@@ -73,12 +70,19 @@ class ServiceSerializer(serializers.Serializer):
         
         return instance
 
+    def get_qualified_techs(self, instance):
+        """Aliases of techs who can perform this service"""
+        techs_by_service = self.context.get('techs_by_service')
+        if techs_by_service is not None:
+            return list(techs_by_service.get(instance.name, ()))
+        from .catalog import get_catalog
+        return get_catalog().techs_for(instance.name)
+
     def to_representation(self, instance):
-        """Custom representation to include qualified_techs"""
+        """Custom representation to include short_name and is_default"""
         ret = super().to_representation(instance)
         ret['short_name'] = instance.short_name
         ret['is_default'] = instance.is_default
-        ret['qualified_techs'] = instance.qualified_techs
         return ret
 
 
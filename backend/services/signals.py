@@ -0,0 +1,17 @@
+"""
+Signal handlers that keep the in-memory catalog (catalog.py) in sync
+"""
+from django.db.models.signals import post_delete, post_save
+
+from technicians.models import Technician
+from . import catalog
+from .models import Service, TechSkill
+
+
+def catalog_changed(sender, **kwargs):
+    catalog.catalog_changed()
+
+
+for model in (Service, Technician, TechSkill):
+    post_save.connect(catalog_changed, sender=model, dispatch_uid=f'catalog_save_{model.__name__}')
+    post_delete.connect(catalog_changed, sender=model, dispatch_uid=f'catalog_delete_{model.__name__}')
@@ -0,0 +1,103 @@
+"""
+Shared test cases for the catalog list endpoints (/api/techs/, /api/services/)
+"""
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from technicians.models import Technician
+
+from . import catalog
+from .models import Service, TechSkill
+
+
+class CatalogListTestMixin:
+    """
+    Mixed into a TestCase per endpoint. Subclasses set `url`, the list field
+    holding grouped skills (`skills_field`) and `set_skills()`, which changes
+    the skills of tech "amy" / service "Gel" through the model API.
+    """
+    databases = {'default', 'index'}
+    url = None
+    skills_field = None
+    # skills_field of the first item after add_catalog(0, 3)
+    grouped_skills = None
+    # What "amy" having "Gel" looks like in skills_field
+    grouped_name = None
+
+    def set_skills(self, enabled):
+        raise NotImplementedError
+
+    def setUp(self):
+        # Each test rolls index.db back, so generation numbers repeat between tests
+        catalog.invalidate()
+
+    def add_catalog(self, start, count):
+        for i in range(start, start + count):
+            Technician.objects.create(alias=f'tech{i}', name=f'Tech {i}')
+            Service.objects.create(name=f'Service {i}', time_needed=30)
+        for i in range(start, start + count):
+            for j in range(start, start + count):
+                TechSkill.objects.create(tech_alias=f'tech{i}', service_name=f'Service {j}')
+
+    def add_pair(self):
+        Technician.objects.create(alias='amy', name='Amy')
+        Service.objects.create(name='Gel', time_needed=30)
+
+    def count_list_queries(self):
+        catalog.invalidate()
+        with CaptureQueriesContext(connections['index']) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def assert_refetched(self, etag, skills):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()[0][self.skills_field], skills)
+        return response['ETag']
+
+    # Skills are grouped in one query, not one per item
+
+    def test_constant_queries(self):
+        self.add_catalog(0, 2)
+        small, _ = self.count_list_queries()
+        self.add_catalog(2, 10)
+        large, data = self.count_list_queries()
+        self.assertEqual(len(data), 12)
+        self.assertEqual(small, large)
+
+    def test_list_includes_grouped_skills(self):
+        self.add_catalog(0, 3)
+        _, data = self.count_list_queries()
+        self.assertEqual(data[0][self.skills_field], self.grouped_skills)
+
+    # The catalog generation is the ETag; unchanged lists answer 304
+
+    def test_not_modified_only_reads_generation(self):
+        self.add_pair()
+        first = self.client.get(self.url)
+        etag = first['ETag']
+        self.assertEqual(first['Cache-Control'], 'no-cache')
+        with CaptureQueriesContext(connections['index']) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(queries), 1)
+
+    def test_tech_skill_write_changes_etag(self):
+        self.add_pair()
+        etag = self.client.get(self.url)['ETag']
+        skill = TechSkill.objects.create(tech_alias='amy', service_name='Gel')
+        etag = self.assert_refetched(etag, [self.grouped_name])
+        skill.delete()
+        self.assert_refetched(etag, [])
+
+    def test_set_skills_changes_etag(self):
+        self.add_pair()
+        etag = self.client.get(self.url)['ETag']
+        self.set_skills(True)
+        etag = self.assert_refetched(etag, [self.grouped_name])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.set_skills(False)
+        self.assert_refetched(etag, [])
@@ -1,3 +1,32 @@
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Service
+from .testing import CatalogListTestMixin
+
+
+class ServiceListTests(CatalogListTestMixin, TestCase):
+    """The Services list groups qualified techs per service and answers 304 while unchanged"""
+    url = '/api/services/'
+    skills_field = 'qualified_techs'
+    grouped_skills = ['tech0', 'tech1', 'tech2']
+    grouped_name = 'amy'
+
+    def set_skills(self, enabled):
+        Service.objects.get(name='Gel').set_qualified_techs(['amy'] if enabled else [])
+
+
+class RenameTests(TestCase):
+    databases = {'default', 'index'}
+
+    def test_rename_job_gets_the_stored_name(self):
+        Service.objects.create(name='Gel/Tips', time_needed=30)
+        with mock.patch('days.renames.enqueue') as enqueue:
+            enqueue.return_value.id = 1
+            # Names with a slash reach the view still percent-encoded
+            response = self.client.post(
+                '/api/services/Gel%252FTips/rename/', {'new_name': 'Gel tips'}, content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+        enqueue.assert_called_once_with('service', 'Gel/Tips', 'Gel tips')
@@ -1,18 +1,33 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.db.models import Q
+from backend.db import write_atomic
+from .catalog import batched_changes, bump_generation, catalog_changed, get_catalog
+from .mixins import CatalogListMixin
 from .models import Service, TechSkill
 from .serializers import ServiceSerializer, ServiceTechsSerializer, TechSkillSerializer
 
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(CatalogListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Service CRUD operations
     Provides: list, create, retrieve, update, partial_update, destroy
+    list is conditional on the catalog generation (ETag / 304)
     """
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
     lookup_field = 'name'
+    catalog_list_key = 'services'
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == 'list':
+            # Every service's techs, grouped once instead of looked up per service
+            context['techs_by_service'] = get_catalog().techs_by_service
+        return context
 
     def get_object(self):
         """Override to handle URL-encoded names"""
@@ -76,29 +91,41 @@ class ServiceViewSet(viewsets.ModelViewSet):
         if not new_name:
             return Response({'error': 'new_name is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if new_name == name:
-            return Response({'error': 'new_name is the same as current name'}, status=status.HTTP_400_BAD_REQUEST)
-
-        if Service.objects.filter(name=new_name).exists():
-            return Response({'error': f'Service {new_name} already exists'}, status=status.HTTP_409_CONFLICT)
-
         try:
             old = self.get_object()
         except Service.DoesNotExist:
             return Response({'error': 'Service not found'}, status=status.HTTP_404_NOT_FOUND)
+        # The stored name; the URL kwarg may still be percent-encoded
+        old_name = old.name
+
+        if new_name == old_name:
+            return Response({'error': 'new_name is the same as current name'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if Service.objects.filter(name=new_name).exists():
+            return Response({'error': f'Service {new_name} already exists'}, status=status.HTTP_409_CONFLICT)
 
         # Create new service
         new_time = request.data.get('time_needed', old.time_needed)
         new_is_bonus = request.data.get('is_bonus', old.is_bonus)
         new_service = Service.objects.create(name=new_name, time_needed=new_time, is_bonus=new_is_bonus)
 
-        # Move TechSkill entries
-        TechSkill.objects.filter(service_name=old.name).update(service_name=new_name)
+        # Move TechSkill entries (QuerySet.update skips signals, so bump the catalog)
+        TechSkill.objects.filter(service_name=old_name).update(service_name=new_name)
+        bump_generation()
 
         # Delete old service
         old.delete()
 
-        return Response({'name': new_service.name, 'time_needed': new_service.time_needed, 'is_bonus': new_service.is_bonus})
+        # Day files still say the old name; open days now, the rest in the background
+        from days.renames import enqueue
+        job = enqueue('service', old_name, new_name)
+
+        return Response({
+            'name': new_service.name,
+            'time_needed': new_service.time_needed,
+            'is_bonus': new_service.is_bonus,
+            'rename_job': job.id,
+        })
 
 
 class TechSkillViewSet(viewsets.ReadOnlyModelViewSet):
@@ -108,3 +135,146 @@ class TechSkillViewSet(viewsets.ReadOnlyModelViewSet):
     """
     queryset = TechSkill.objects.all()
     serializer_class = TechSkillSerializer
+
+
+class SkillMatrixView(APIView):
+    """
+    Techs x services skill matrix
+    GET returns the whole matrix; PATCH applies many toggles in one transaction
+    """
+    DELETE_CHUNK = 200
+
+    def get(self, request):
+        """
+        GET /api/skill-matrix/
+        Returns: {
+            "techs": ["alias1", "alias2"],
+            "services": ["Gel", "Pedi"],
+            "skills": [[0, 1], []]   (per tech, indexes into "services")
+        }
+        """
+        return Response(self._matrix(get_catalog()))
+
+    def patch(self, request):
+        """
+        PATCH /api/skill-matrix/
+        Body: { "toggles": [{"tech_alias": "alias", "service": "Gel", "enabled": true}, ...] }
+        All toggles are validated first; nothing is written if any is invalid
+        Returns the updated matrix plus "added" and "removed" counts
+        """
+        toggles = request.data.get('toggles')
+        if not isinstance(toggles, list):
+            return Response({'error': 'toggles must be a list'}, status=status.HTTP_400_BAD_REQUEST)
+
+        catalog = get_catalog()
+        wanted = {}
+        errors = []
+        for position, toggle in enumerate(toggles):
+            if not isinstance(toggle, dict):
+                errors.append(f'toggles[{position}]: expected an object')
+                continue
+            tech_alias = toggle.get('tech_alias')
+            service_name = toggle.get('service')
+            enabled = toggle.get('enabled', True)
+            if not isinstance(enabled, bool):
+                # bool("false") is True, so strings are refused rather than coerced
+                errors.append(f'toggles[{position}]: enabled must be true or false')
+            elif catalog.get_tech(tech_alias) is None:
+                errors.append(f'toggles[{position}]: Technician {tech_alias} not found')
+            elif catalog.get(service_name) is None:
+                errors.append(f'toggles[{position}]: Service {service_name} not found')
+            else:
+                # Later toggles for the same pair win
+                wanted[(tech_alias, service_name)] = enabled
+        if errors:
+            return Response({'error': 'Invalid toggles', 'details': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        to_add = [pair for pair, enabled in wanted.items() if enabled and pair not in catalog.skills]
+        to_remove = [pair for pair, enabled in wanted.items() if not enabled and pair in catalog.skills]
+
+        try:
+            with write_atomic('index'), batched_changes():
+                # Chunked: SQLite caps the depth of one WHERE expression
+                for start in range(0, len(to_remove), self.DELETE_CHUNK):
+                    condition = Q()
+                    for tech_alias, service_name in to_remove[start:start + self.DELETE_CHUNK]:
+                        condition |= Q(tech_alias=tech_alias, service_name=service_name)
+                    TechSkill.objects.filter(condition).delete()
+                if to_add:
+                    TechSkill.objects.bulk_create(
+                        [TechSkill(tech_alias=alias, service_name=name) for alias, name in to_add],
+                        ignore_conflicts=True,
+                    )
+                    # bulk_create sends no post_save, so record the change explicitly
+                    catalog_changed()
+        except Exception as e:
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        matrix = self._matrix(get_catalog())
+        matrix.update(added=len(to_add), removed=len(to_remove))
+        return Response(matrix)
+
+    @staticmethod
+    def _matrix(catalog):
+        techs = sorted(catalog.techs)
+        services = sorted(catalog.services)
+        service_index = {name: position for position, name in enumerate(services)}
+        return {
+            'techs': techs,
+            'services': services,
+            'skills': [
+                sorted(service_index[name] for name in catalog.skills_by_tech.get(alias, ()) if name in service_index)
+                for alias in techs
+            ],
+        }
+
+
+class CatalogImportView(APIView):
+    """Bulk import of techs, services and skills from CSV (see services/imports.py)"""
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def post(self, request):
+        """
+        POST /api/imports/catalog/
+        Body (multipart files or JSON strings): techs, services, skills CSVs,
+        plus optional "dry_run" and "skip_existing" flags
+        Returns the import report: counts, conflicts and errors.
+        Nothing is written on a dry run or if any row is invalid.
+        """
+        from .imports import import_catalog
+
+        texts = {}
+        for field in ('techs', 'services', 'skills'):
+            value = request.FILES.get(field) or request.data.get(field) or ''
+            if hasattr(value, 'read'):
+                try:
+                    value = value.read().decode('utf-8-sig')
+                except UnicodeDecodeError:
+                    return Response({'error': f'{field}: file is not UTF-8 text'}, status=status.HTTP_400_BAD_REQUEST)
+            texts[field] = value
+        if not any(texts.values()):
+            return Response({'error': 'Provide at least one of techs, services, skills'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            report = import_catalog(
+                techs_csv=texts['techs'],
+                services_csv=texts['services'],
+                skills_csv=texts['skills'],
+                dry_run=_flag(request.data.get('dry_run')),
+                skip_existing=_flag(request.data.get('skip_existing')),
+            )
+        except Exception as e:
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        if not report.ok:
+            return Response(report.to_dict(), status=status.HTTP_400_BAD_REQUEST)
+        if report.written:
+            return Response(report.to_dict(), status=status.HTTP_201_CREATED)
+        return Response(report.to_dict())
+
+
+def _flag(value):
+    """Multipart forms send booleans as strings"""
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
@@ -1,5 +1,7 @@
 from django.db import models
 
+from backend.db import write_atomic
+
 
 class Technician(models.Model):
     """Technician model stored in index.db"""
@@ -22,14 +24,24 @@ class Technician(models.Model):
         return list(TechSkill.objects.filter(tech_alias=self.alias).values_list('service_name', flat=True))
 
     def set_skills(self, service_names):
-        """Set the skills for this technician"""
+        """
+        Set the skills for this technician (unknown services are ignored)
+        Only the difference from the current rows is written, in one transaction
+        """
+        from services.catalog import batched_changes, catalog_changed
         from services.models import TechSkill, Service
-        # Remove existing skills
-        TechSkill.objects.filter(tech_alias=self.alias).delete()
-        # Add new skills
-        for service_name in service_names:
-            if Service.objects.filter(name=service_name).exists():
-                TechSkill.objects.create(tech_alias=self.alias, service_name=service_name)
+        wanted = set(service_names)
+        with write_atomic('index'), batched_changes():
+            wanted = set(Service.objects.filter(name__in=wanted).values_list('name', flat=True))
+            current = set(TechSkill.objects.filter(tech_alias=self.alias).values_list('service_name', flat=True))
+            if current - wanted:
+                TechSkill.objects.filter(tech_alias=self.alias, service_name__in=current - wanted).delete()
+            if wanted - current:
+                TechSkill.objects.bulk_create([
+                    TechSkill(tech_alias=self.alias, service_name=name) for name in sorted(wanted - current)
+                ])
+                # bulk_create sends no post_save, so record the change explicitly
+                catalog_changed()
 
     def has_skill(self, service_name):
         """Check if technician has a specific skill"""
@@ -6,11 +6,8 @@ class TechnicianSerializer(serializers.Serializer):
     """Serializer for Technician model"""
     alias = serializers.CharField(max_length=50, required=True)
     name = serializers.CharField(max_length=200, required=False, allow_blank=True)
-    skills = serializers.ListField(
-        child=serializers.CharField(),
-        required=False,
-        read_only=True
-    )
+    # Read from the in-memory catalog; writes go through initial_data['skills']
+    skills = serializers.SerializerMethodField()
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
 
@@ -23,7 +20,7 @@ class TechnicianSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         """Create a new technician"""
-        from services.models import Service
+        from services.catalog import get_catalog
         skills_data = self.initial_data.get('skills', [])
         alias = validated_data['alias']
         name = validated_data.get('name', '')
@@ -31,7 +28,7 @@ class TechnicianSerializer(serializers.Serializer):
         technician = Technician.objects.create(alias=alias, name=name)
         
         # Auto-assign default services
-        default_services = Service.objects.filter(is_default=True).values_list('name', flat=True)
+        default_services = get_catalog().default_services()
         all_skills = list(set(list(skills_data) + list(default_services)))
         
         if all_skills:
@@ -50,11 +47,13 @@ class TechnicianSerializer(serializers.Serializer):
         
         return instance
 
-    def to_representation(self, instance):
-        """Custom representation to include skills"""
-        ret = super().to_representation(instance)
-        ret['skills'] = instance.skills
-        return ret
+    def get_skills(self, instance):
+        """Service names this tech can perform"""
+        skills_by_tech = self.context.get('skills_by_tech')
+        if skills_by_tech is not None:
+            return list(skills_by_tech.get(instance.alias, ()))
+        from services.catalog import get_catalog
+        return get_catalog().skills_for(instance.alias)
 
 
 class TechnicianSkillsSerializer(serializers.Serializer):
@@ -1,3 +1,16 @@
 from django.test import TestCase
 
-# Create your tests here.
+from services.testing import CatalogListTestMixin
+
+from .models import Technician
+
+
+class TechnicianListTests(CatalogListTestMixin, TestCase):
+    """The Technicians list groups skills per tech and answers 304 while unchanged"""
+    url = '/api/techs/'
+    skills_field = 'skills'
+    grouped_skills = ['Service 0', 'Service 1', 'Service 2']
+    grouped_name = 'Gel'
+
+    def set_skills(self, enabled):
+        Technician.objects.get(alias='amy').set_skills(['Gel'] if enabled else [])
@@ -1,18 +1,29 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from services.mixins import CatalogListMixin
 from .models import Technician
 from .serializers import TechnicianSerializer, TechnicianSkillsSerializer
 
 
-class TechnicianViewSet(viewsets.ModelViewSet):
+class TechnicianViewSet(CatalogListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Technician CRUD operations
     Provides: list, create, retrieve, update, partial_update, destroy
+    list is conditional on the catalog generation (ETag / 304)
     """
     queryset = Technician.objects.all()
     serializer_class = TechnicianSerializer
     lookup_field = 'alias'
+    catalog_list_key = 'techs'
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == 'list':
+            # Every tech's skills, grouped once instead of looked up per tech
+            from services.catalog import get_catalog
+            context['skills_by_tech'] = get_catalog().skills_by_tech
+        return context
 
     @action(detail=True, methods=['get', 'put'], url_path='skills')
     def skills(self, request, alias=None):
@@ -45,6 +56,20 @@ class TechnicianViewSet(viewsets.ModelViewSet):
                 })
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=True, methods=['get'], url_path='attendance')
+    def attendance(self, request, alias=None):
+        """
+        GET /api/techs/{alias}/attendance/
+        Last day worked, number of days worked and the 10 most recent dates
+        """
+        if not Technician.objects.filter(alias=alias).exists():
+            return Response(
+                {'error': 'Technician not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        from days.presence import tech_history
+        return Response(tech_history(alias))
+
     def destroy(self, request, *args, **kwargs):
         """Delete a technician and associated skills"""
         try:
@@ -87,10 +112,16 @@ class TechnicianViewSet(viewsets.ModelViewSet):
         new_tech = Technician.objects.create(alias=new_alias, name=new_name)
 
         # Move TechSkill entries
+        from services.catalog import bump_generation
         from services.models import TechSkill
         TechSkill.objects.filter(tech_alias=old.alias).update(tech_alias=new_alias)
+        bump_generation()
 
         # Delete old technician
         old.delete()
 
-        return Response({'alias': new_tech.alias, 'name': new_tech.name})
+        # Day files still say the old alias; open days now, the rest in the background
+        from days.renames import enqueue
+        job = enqueue('tech', alias, new_alias, request.data.get('name', ''))
+
+        return Response({'alias': new_tech.alias, 'name': new_tech.name, 'rename_job': job.id})
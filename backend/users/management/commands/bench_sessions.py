@@ -0,0 +1,123 @@
+"""
+Benchmark session handling under concurrent tablet polling.
+
+Compares the old setup (DB sessions saved on every request) with the current
+one (cached_db sessions refreshed once per SESSION_REFRESH_INTERVAL). Each
+client thread holds a logged-in session and polls GET /api/auth/me/.
+Uses the configured default database; the sessions and the user it creates
+are removed afterwards.
+"""
+import threading
+import time
+import uuid
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+from django.test import Client, override_settings
+
+from users.middleware import REFRESHED_AT_KEY
+from users.models import AppUser
+
+POLL_URL = '/api/auth/me/'
+
+
+def _legacy_settings():
+    return override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.db',
+        SESSION_SAVE_EVERY_REQUEST=True,
+        MIDDLEWARE=[m for m in settings.MIDDLEWARE if m != 'users.middleware.SessionRefreshMiddleware'],
+    )
+
+
+def _current_settings():
+    return override_settings()
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request session saves with cached, interval-refreshed sessions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=8, help='Concurrent polling tablets')
+        parser.add_argument('--requests', type=int, default=200, help='Polls per client')
+
+    def handle(self, *args, **options):
+        user = AppUser.objects.create(name='Session benchmark', pin_hash=f'!bench-{uuid.uuid4().hex}')
+        try:
+            for label, mode in (('save every request (db)', _legacy_settings),
+                                ('refresh interval (cached_db)', _current_settings)):
+                with mode():
+                    result = self._run(user, options['clients'], options['requests'])
+                self.stdout.write(
+                    f"{label:30} {result['rate']:8.0f} req/s  p95 {result['p95'] * 1000:6.1f} ms  "
+                    f"session writes {result['writes']:6}  errors {result['errors']}"
+                )
+        finally:
+            user.delete()
+
+    def _run(self, user, clients, requests):
+        engine = import_module(settings.SESSION_ENGINE)
+        stores = []
+        for _ in range(clients):
+            store = engine.SessionStore()
+            store['user_id'] = user.id
+            store['user_name'] = user.name
+            # Steady state: sessions were refreshed recently
+            store[REFRESHED_AT_KEY] = int(time.time())
+            store.create()
+            stores.append(store)
+
+        lock = threading.Lock()
+        latencies = []
+        totals = {'writes': 0, 'errors': 0}
+        start = threading.Barrier(clients + 1)
+
+        def count_writes(execute, sql, params, many, context):
+            if 'django_session' in sql and not sql.lstrip().upper().startswith('SELECT'):
+                with lock:
+                    totals['writes'] += 1
+            return execute(sql, params, many, context)
+
+        def poll(session_key):
+            client = Client(HTTP_HOST='localhost')
+            client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+            timings = []
+            errors = 0
+            try:
+                with connections['default'].execute_wrapper(count_writes):
+                    start.wait()
+                    for _ in range(requests):
+                        began = time.perf_counter()
+                        try:
+                            if client.get(POLL_URL).status_code != 200:
+                                errors += 1
+                        except OperationalError:
+                            # "database is locked" under write contention
+                            errors += 1
+                        timings.append(time.perf_counter() - began)
+            finally:
+                connections.close_all()
+            with lock:
+                latencies.extend(timings)
+                totals['errors'] += errors
+
+        threads = [threading.Thread(target=poll, args=(store.session_key,)) for store in stores]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+
+        for store in stores:
+            store.delete()
+
+        latencies.sort()
+        return {
+            'rate': len(latencies) / elapsed if elapsed else 0,
+            'p95': latencies[int(len(latencies) * 0.95)] if latencies else 0,
+            'writes': totals['writes'],
+            'errors': totals['errors'],
+        }
@@ -0,0 +1,49 @@
+"""
+Session expiry refresh for PIN logins
+"""
+import time
+
+from django.conf import settings
+
+# Session key holding when the session was last saved (epoch seconds)
+REFRESHED_AT_KEY = '_refreshed_at'
+
+
+class SessionRefreshMiddleware:
+    """
+    Keep sessions alive without saving them on every request.
+
+    Tablets poll the API constantly; with SESSION_SAVE_EVERY_REQUEST each of
+    those calls rewrote the session row. This marks the session modified
+    only when it was last saved more than SESSION_REFRESH_INTERVAL seconds
+    ago, so SessionMiddleware saves it (and re-sends the cookie) at most
+    once per interval. Must be listed after SessionMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        session = getattr(request, 'session', None)
+        if session is None:
+            return response
+
+        now = int(time.time())
+        if session.modified:
+            # Being saved anyway; stamp it so the next request does not save again
+            if not session.is_empty():
+                session[REFRESHED_AT_KEY] = now
+            return response
+
+        # No cookie means nothing to refresh (and nothing to load)
+        if session.session_key is None:
+            return response
+
+        interval = getattr(settings, 'SESSION_REFRESH_INTERVAL', 60 * 60)
+        # Load before is_empty(): a cookie for a deleted session loads as empty
+        refreshed_at = session.get(REFRESHED_AT_KEY, 0)
+        if not session.is_empty() and now - refreshed_at >= interval:
+            session[REFRESHED_AT_KEY] = now
+        return response
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 06:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_appuser'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appuser',
+            name='pin_lookup',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.hashers import make_password, check_password
 from django.db import models
+from django.utils.crypto import salted_hmac
 from django.utils.translation import gettext_lazy as _
 
 from .managers import CustomUserManager
@@ -23,6 +24,15 @@ class CustomUser(AbstractUser):
         return self.email
 
 
+def pin_digest(raw_pin: str) -> str:
+    """
+    Keyed digest of a PIN (HMAC-SHA256 with SECRET_KEY) used to look users up.
+    Changing SECRET_KEY orphans every stored digest: reset pin_lookup to NULL
+    and users are re-indexed on their next login.
+    """
+    return salted_hmac('users.AppUser.pin_lookup', raw_pin, algorithm='sha256').hexdigest()
+
+
 class AppUser(models.Model):
     """
     Phase 10: Simple PIN-based user model for the Nail Salon app.
@@ -30,6 +40,8 @@ class AppUser(models.Model):
     """
     name = models.CharField(max_length=100)
     pin_hash = models.CharField(max_length=256, unique=True)
+    # pin_digest() of the PIN; NULL for users created before it existed
+    pin_lookup = models.CharField(max_length=64, null=True, blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
@@ -47,6 +59,7 @@ class AppUser(models.Model):
         Hash and store the PIN using Django's password hashing (pbkdf2_sha256).
         """
         self.pin_hash = make_password(raw_pin)
+        self.pin_lookup = pin_digest(raw_pin)
 
     def check_pin(self, raw_pin: str) -> bool:
         """
@@ -59,8 +72,31 @@ class AppUser(models.Model):
         """
         Find and return the user matching the given PIN.
         Returns None if no match found.
+        The digest index narrows it to one user, so only one PBKDF2 hash is
+        checked. Users without a digest yet are scanned as before and get
+        indexed when they match.
         """
-        for user in cls.objects.filter(is_active=True):
+        digest = pin_digest(raw_pin)
+        user = cls.objects.filter(is_active=True, pin_lookup=digest).first()
+        if user is not None:
+            return user if user.check_pin(raw_pin) else None
+
+        for user in cls.objects.filter(is_active=True, pin_lookup__isnull=True):
             if user.check_pin(raw_pin):
+                user.pin_lookup = digest
+                user.save(update_fields=['pin_lookup'])
                 return user
-        return None
\ No newline at end of file
+        return None
+
+    @classmethod
+    def pin_in_use(cls, raw_pin: str, exclude_id=None) -> bool:
+        """
+        Whether an active user (other than exclude_id) already has this PIN.
+        A digest match is enough; only users without a digest need hashing.
+        """
+        users = cls.objects.filter(is_active=True)
+        if exclude_id is not None:
+            users = users.exclude(id=exclude_id)
+        if users.filter(pin_lookup=pin_digest(raw_pin)).exists():
+            return True
+        return any(user.check_pin(raw_pin) for user in users.filter(pin_lookup__isnull=True))
\ No newline at end of file
@@ -52,15 +52,11 @@ class AppUserSerializer(serializers.ModelSerializer):
         if pin_confirm is not None and pin != pin_confirm:
             raise serializers.ValidationError({'pin_confirm': 'PINs do not match.'})
 
-        # Check PIN uniqueness by trying to authenticate with it
+        # Check PIN uniqueness (if updating, the user may keep their own PIN)
         if pin:
-            existing_user = AppUser.authenticate_by_pin(pin)
-            if existing_user:
-                # If updating, allow the same PIN if it's the same user
-                if self.instance and existing_user.id == self.instance.id:
-                    pass
-                else:
-                    raise serializers.ValidationError({'pin': 'This PIN is already in use.'})
+            exclude_id = self.instance.id if self.instance else None
+            if AppUser.pin_in_use(pin, exclude_id=exclude_id):
+                raise serializers.ValidationError({'pin': 'This PIN is already in use.'})
 
         return attrs
 
@@ -155,8 +151,7 @@ class AppUserUpdateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({'pin_confirm': 'PINs do not match.'})
             
             # Check PIN uniqueness
-            existing_user = AppUser.authenticate_by_pin(pin)
-            if existing_user and existing_user.id != self.instance.id:
+            if AppUser.pin_in_use(pin, exclude_id=self.instance.id):
                 raise serializers.ValidationError({'pin': 'This PIN is already in use.'})
 
         return attrs
@@ -1,3 +1,108 @@
-from django.test import TestCase
+from importlib import import_module
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import TestCase, override_settings
+
+from . import middleware, models
+from .middleware import REFRESHED_AT_KEY
+from .models import AppUser
+
+
+# The tests count hash checks, so a fast hasher keeps them quick
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class PinLookupTests(TestCase):
+    """PIN login checks one PBKDF2 hash via the pin_lookup digest"""
+
+    def setUp(self):
+        for i in range(5):
+            user = AppUser(name=f'User {i}')
+            user.set_pin(f'100{i}')
+            user.save()
+
+    def count_hashes(self, func, *args, **kwargs):
+        with mock.patch.object(models, 'check_password', wraps=check_password) as checked:
+            result = func(*args, **kwargs)
+        return result, checked.call_count
+
+    def test_login_checks_one_hash(self):
+        user, hashes = self.count_hashes(AppUser.authenticate_by_pin, '1003')
+        self.assertEqual(user.name, 'User 3')
+        self.assertEqual(hashes, 1)
+
+    def test_bad_pin_checks_no_hash(self):
+        user, hashes = self.count_hashes(AppUser.authenticate_by_pin, '9999')
+        self.assertIsNone(user)
+        self.assertEqual(hashes, 0)
+
+    def test_legacy_user_is_indexed_on_login(self):
+        AppUser.objects.create(name='Legacy', pin_hash=make_password('2000'))
+        user = AppUser.authenticate_by_pin('2000')
+        self.assertEqual(user.name, 'Legacy')
+        user.refresh_from_db()
+        self.assertEqual(user.pin_lookup, models.pin_digest('2000'))
+        _, hashes = self.count_hashes(AppUser.authenticate_by_pin, '2000')
+        self.assertEqual(hashes, 1)
+
+    def test_pin_in_use(self):
+        user = AppUser.objects.get(name='User 1')
+        self.assertTrue(AppUser.pin_in_use('1001'))
+        self.assertFalse(AppUser.pin_in_use('1001', exclude_id=user.id))
+        _, hashes = self.count_hashes(AppUser.pin_in_use, '1002')
+        self.assertEqual(hashes, 0)
+
+
+@override_settings(SESSION_REFRESH_INTERVAL=600)
+class SessionRefreshTests(TestCase):
+    """Polling saves a session at most once per SESSION_REFRESH_INTERVAL"""
+    databases = {'default', 'index'}
+    started = 1_800_000_000
+
+    def setUp(self):
+        self.engine = import_module(settings.SESSION_ENGINE)
+        user = AppUser.objects.create(name='Tablet', pin_hash='!unused')
+        store = self.engine.SessionStore()
+        store['user_id'] = user.id
+        store['user_name'] = user.name
+        store[REFRESHED_AT_KEY] = self.started
+        store.create()
+        self.session_key = store.session_key
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = self.session_key
+
+    def poll(self, at):
+        """GET /api/auth/me/ at epoch second `at`; returns (response, session saves)"""
+        clock = mock.Mock(time=mock.Mock(return_value=at))
+        save = self.engine.SessionStore.save
+        with mock.patch.object(middleware, 'time', clock), \
+                mock.patch.object(self.engine.SessionStore, 'save', autospec=True, side_effect=save) as saved:
+            response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, 200)
+        return response, saved.call_count
+
+    def stored_refresh(self):
+        return self.engine.SessionStore(self.session_key).get(REFRESHED_AT_KEY)
+
+    def test_saved_once_per_interval(self):
+        for offset in (1, 60, 599):
+            response, saves = self.poll(self.started + offset)
+            self.assertEqual(saves, 0)
+            self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+        response, saves = self.poll(self.started + 600)
+        self.assertEqual(saves, 1)
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertEqual(self.stored_refresh(), self.started + 600)
+
+        # The new stamp starts the next interval
+        _, saves = self.poll(self.started + 601)
+        self.assertEqual(saves, 0)
+        _, saves = self.poll(self.started + 1200)
+        self.assertEqual(saves, 1)
+
+    def test_no_session_is_created_without_a_cookie(self):
+        self.client.cookies.clear()
+        clock = mock.Mock(time=mock.Mock(return_value=self.started + 6000))
+        with mock.patch.object(middleware, 'time', clock):
+            response = self.client.get('/api/auth/me/')
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
@@ -19,8 +19,7 @@ function DeleteModal({ onClose, onSuccess }) {
 
     const loadClosedDays = async () => {
         try {
-            const response = await dayService.getAllDays();
-            const closed = response.filter(day => day.status === 'closed');
+            const closed = await dayService.getAllDays({ status: 'closed' });
             setClosedDays(closed);
         } catch (err) {
             setError('Failed to load closed days');
@@ -10,6 +10,7 @@ function TechProfile({ alias, tech: techProp, onClose, onSaved }) {
     const [renaming, setRenaming] = useState(false);
     const [deleting, setDeleting] = useState(false);
     const [newAlias, setNewAlias] = useState('');
+    const [attendance, setAttendance] = useState(null);
     const [error, setError] = useState('');
 
     useEffect(() => {
@@ -65,15 +66,17 @@ function TechProfile({ alias, tech: techProp, onClose, onSaved }) {
         setLoading(true);
         setError('');
         try {
-            const [techResp, servicesResp] = await Promise.all([
+            const [techResp, servicesResp, attendanceResp] = await Promise.all([
                 technicianService.getByAlias(alias),
-                fetch('/api/services/').then(r => r.json())
+                fetch('/api/services/').then(r => r.json()),
+                technicianService.getAttendance(alias).catch(() => null)
             ]);
 
             const techData = techResp.data || techResp;
             setTech({ alias: techData.alias, name: techData.name, skills: techData.skills || [] });
             setNewAlias(techData.alias);
             setServices(servicesResp || []);
+            setAttendance(attendanceResp);
         } catch (err) {
             setError('Failed to load profile: ' + (err.message || err));
         } finally {
@@ -199,6 +202,17 @@ function TechProfile({ alias, tech: techProp, onClose, onSaved }) {
                                 <input type="text" value={tech.name || ''} onChange={e => setTech({ ...tech, name: e.target.value })} />
                             </div>
 
+                            { alias && attendance && (
+                                <div className="field">
+                                    <label>Last worked</label>
+                                    <div className="readonly">
+                                        {attendance.last_worked
+                                            ? `${attendance.last_worked} (${attendance.days_worked} days worked)`
+                                            : 'Never'}
+                                    </div>
+                                </div>
+                            )}
+
                             { alias && (
                                 <div className="field">
                                     <label>Rename alias</label>
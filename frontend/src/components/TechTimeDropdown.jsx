@@ -29,9 +29,8 @@ function TechTimeDropdown({ onClose, onSuccess, initialTechRow = null, initialTe
 
     const findCurrentOpenDay = async () => {
         try {
-            // Get all days and find the most recent open one
-            const response = await dayService.getAllDays();
-            const openDays = response.filter(day => day.status === 'open');
+            // Get open days and find the most recent one
+            const openDays = await dayService.getAllDays({ status: 'open' });
             
             if (openDays.length > 0) {
                 // Sort by date descending and get the most recent
@@ -6,10 +6,37 @@ import api from './api';
 
 const dayService = {
     /**
-     * Get all days (metadata)
+     * Get one page of days (metadata), newest first
+     * Filters: { status, year, month, from, to, page_size, cursor }
+     * Returns { next, previous, results }
      */
-    getAllDays: async () => {
-        return await api.get('/days/');
+    getDays: async (filters = {}) => {
+        const qs = new URLSearchParams(
+            Object.entries(filters).filter(([, value]) => value !== undefined && value !== null && value !== '')
+        );
+        const query = qs.toString();
+        return await api.get(`/days/${query ? `?${query}` : ''}`);
+    },
+
+    /**
+     * Get all days (metadata) matching the filters, following every page
+     */
+    getAllDays: async (filters = {}) => {
+        const days = [];
+        let cursor = null;
+        do {
+            const page = await dayService.getDays({ ...filters, page_size: 500, cursor });
+            days.push(...page.results);
+            cursor = page.next ? new URL(page.next).searchParams.get('cursor') : null;
+        } while (cursor);
+        return days;
+    },
+
+    /**
+     * Get dates and statuses of the days in a month
+     */
+    getCalendar: async (year, month) => {
+        return await api.get(`/days/calendar/?year=${year}&month=${month}`);
     },
 
     /**
@@ -83,6 +83,32 @@ export const serviceService = {
         const encodedName = encodeURIComponent(name);
         return await api.post(`/services/${encodedName}/rename/`, { new_name: newName, time_needed, is_bonus });
     },
+
+    /**
+     * Get the whole techs x services skill matrix
+     * Returns { techs, services, skills } where skills[i] lists service indexes for techs[i]
+     */
+    async getSkillMatrix() {
+        return await api.get('/skill-matrix/');
+    },
+
+    /**
+     * Apply many skill toggles in one request
+     * toggles: [{ tech_alias, service, enabled }]
+     */
+    async updateSkillMatrix(toggles) {
+        return await api.patch('/skill-matrix/', { toggles });
+    },
+
+    /**
+     * Bulk import techs, services and a skill matrix from CSV text
+     * csv: { techs, services, skills } (any may be omitted)
+     * options: { dry_run, skip_existing }
+     * Returns the import report: counts, conflicts and errors
+     */
+    async importCatalog(csv, options = {}) {
+        return await api.post('/imports/catalog/', { ...csv, ...options });
+    },
 };
 
 export default serviceService;
@@ -60,6 +60,13 @@ export const technicianService = {
     async updateSkills(alias, skills) {
         return await api.put(`/techs/${alias}/skills/`, { skills });
     },
+    /**
+     * Get last day worked, days worked and recent dates
+     */
+    async getAttendance(alias) {
+        return await api.get(`/techs/${alias}/attendance/`);
+    },
+
     /**
      * Rename a technician
      */